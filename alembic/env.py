@@ -29,6 +29,22 @@ import os
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# tables owned by other libraries that may share the database, and the SQLite
+# search index (models.SEARCH_INDEX_DDL), which isn't declared as a model
+EXTERNAL_TABLES = {
+    "apscheduler_jobs",
+    "applications_fts",
+    "applications_fts_config",
+    "applications_fts_data",
+    "applications_fts_docsize",
+    "applications_fts_idx",
+}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (type_ == "table" and name in EXTERNAL_TABLES)
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -46,6 +62,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -68,7 +85,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
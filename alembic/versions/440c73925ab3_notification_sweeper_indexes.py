@@ -0,0 +1,30 @@
+"""notification sweeper indexes
+
+Revision ID: 440c73925ab3
+Revises: db8a267b7847
+Create Date: 2026-10-18 15:02:51.396014
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '440c73925ab3'
+down_revision: Union[str, Sequence[str], None] = 'db8a267b7847'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_notifications_is_sent_scheduled_date', 'notifications', ['is_sent', 'scheduled_date'], unique=False)
+    op.create_index('ix_notifications_application_id', 'notifications', ['application_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notifications_application_id', table_name='notifications')
+    op.drop_index('ix_notifications_is_sent_scheduled_date', table_name='notifications')
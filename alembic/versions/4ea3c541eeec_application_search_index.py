@@ -0,0 +1,66 @@
+"""application search index
+
+Revision ID: 4ea3c541eeec
+Revises: c92c48876171
+Create Date: 2026-10-18 09:12:41.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models import SEARCH_INDEX_DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4ea3c541eeec'
+down_revision: Union[str, Sequence[str], None] = 'c92c48876171'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The index DDL lives in app.models.SEARCH_INDEX_DDL, which metadata.create_all
+# also runs, so migrated and freshly created databases get the same index.
+# Postgres keeps the vector in a generated column, so existing rows are
+# indexed as the column is added; SQLite's FTS5 table needs a rebuild.
+PG_UPGRADE = SEARCH_INDEX_DDL["postgresql"]
+
+PG_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_applications_search_vector",
+    "ALTER TABLE applications DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_UPGRADE = SEARCH_INDEX_DDL["sqlite"] + [
+    "INSERT INTO applications_fts(applications_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS applications_fts_au",
+    "DROP TRIGGER IF EXISTS applications_fts_ad",
+    "DROP TRIGGER IF EXISTS applications_fts_ai",
+    "DROP TABLE IF EXISTS applications_fts",
+]
+
+
+def _run(statements) -> None:
+    for statement in statements:
+        op.execute(sa.text(statement))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        _run(PG_UPGRADE)
+    elif dialect == "sqlite":
+        _run(SQLITE_UPGRADE)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        _run(PG_DOWNGRADE)
+    elif dialect == "sqlite":
+        _run(SQLITE_DOWNGRADE)
@@ -0,0 +1,28 @@
+"""application interview date index
+
+Revision ID: 5128cce3ded1
+Revises: 440c73925ab3
+Create Date: 2026-10-18 15:41:07.218830
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5128cce3ded1'
+down_revision: Union[str, Sequence[str], None] = '440c73925ab3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_applications_interview_date_utc_id', 'applications', ['interview_date_utc', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_applications_interview_date_utc_id', table_name='applications')
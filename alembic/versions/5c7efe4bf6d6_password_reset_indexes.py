@@ -0,0 +1,30 @@
+"""password reset indexes
+
+Revision ID: 5c7efe4bf6d6
+Revises: 8e976509e21b
+Create Date: 2026-10-18 13:41:09.127561
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c7efe4bf6d6'
+down_revision: Union[str, Sequence[str], None] = '8e976509e21b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_password_resets_user_id_code', 'password_resets', ['user_id', 'code'], unique=False)
+    op.create_index(op.f('ix_password_resets_expires_at'), 'password_resets', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_password_resets_expires_at'), table_name='password_resets')
+    op.drop_index('ix_password_resets_user_id_code', table_name='password_resets')
@@ -0,0 +1,47 @@
+"""application status counts
+
+Revision ID: 9142eee5342a
+Revises: 4ea3c541eeec
+Create Date: 2026-10-18 10:03:17.551902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9142eee5342a'
+down_revision: Union[str, Sequence[str], None] = '4ea3c541eeec'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+STATUS_VALUES = ('not_applied', 'applied', 'interview', 'offer', 'rejected')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # reuse the applicationstatus type created by the init migration
+    status_type = sa.Enum(*STATUS_VALUES, name='applicationstatus').with_variant(
+        postgresql.ENUM(*STATUS_VALUES, name='applicationstatus', create_type=False), 'postgresql'
+    )
+    op.create_table('application_status_counts',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('status', status_type, nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'status')
+    )
+    # backfill from the source table
+    op.execute(
+        "INSERT INTO application_status_counts (user_id, status, count) "
+        "SELECT user_id, status, COUNT(id) FROM applications GROUP BY user_id, status"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('application_status_counts')
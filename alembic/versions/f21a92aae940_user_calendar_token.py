@@ -0,0 +1,30 @@
+"""user calendar token
+
+Revision ID: f21a92aae940
+Revises: 5128cce3ded1
+Create Date: 2026-10-18 16:20:33.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f21a92aae940'
+down_revision: Union[str, Sequence[str], None] = '5128cce3ded1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('calendar_token_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_users_calendar_token_hash'), 'users', ['calendar_token_hash'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_users_calendar_token_hash'), table_name='users')
+    op.drop_column('users', 'calendar_token_hash')
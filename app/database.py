@@ -14,9 +14,12 @@
 
 # Base = declarative_base()
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
+from contextvars import ContextVar
 import os
+import threading
+from typing import Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -35,3 +38,84 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
+
+
+def get_db():
+    """
+    The one request-scoped session. Every dependency (get_current_user,
+    get_current_identity, route handlers) depends on this same callable, so
+    FastAPI's dependency cache hands them all the same session per request.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+class CheckoutCounter:
+    def __init__(self):
+        self.count = 0
+
+
+class CheckoutStats:
+    """
+    Per-request pool checkout totals since startup. More than one checkout
+    means the request opened a second session, or went back to the pool
+    after a commit (e.g. commit followed by refresh).
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.checkouts = 0
+        self.max_per_request = 0
+        self.multi_checkout_requests = 0
+        self._lock = threading.Lock()
+
+    def record(self, checkouts: int):
+        with self._lock:
+            self.requests += 1
+            self.checkouts += checkouts
+            self.max_per_request = max(self.max_per_request, checkouts)
+            if checkouts > 1:
+                self.multi_checkout_requests += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "checkouts": self.checkouts,
+            "avg_per_request": round(self.checkouts / self.requests, 4) if self.requests else 0.0,
+            "max_per_request": self.max_per_request,
+            "multi_checkout_requests": self.multi_checkout_requests,
+        }
+
+
+checkout_stats = CheckoutStats()
+
+# holds a mutable counter so work in threadpool copies of the context still adds to it
+_request_checkouts: ContextVar[Optional[CheckoutCounter]] = ContextVar("request_checkouts", default=None)
+
+
+def start_checkout_count() -> CheckoutCounter:
+    counter = CheckoutCounter()
+    _request_checkouts.set(counter)
+    return counter
+
+
+@event.listens_for(engine, "checkout")
+def _count_checkout(dbapi_connection, connection_record, connection_proxy):
+    counter = _request_checkouts.get()
+    if counter is not None:
+        counter.count += 1
+
+
+def pool_status() -> dict:
+    pool = engine.pool
+    status = {"class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        if hasattr(pool, name):
+            status[name] = getattr(pool, name)()
+    return status
@@ -1,9 +1,28 @@
-from fastapi import FastAPI
-from app.routers import applications, auth, cloudinary, feedback, resume, users
-from app.database import SessionLocal
-from app.routers.auth import cleanup_expired_reset_codes
-from app.utils.scheduler import start_scheduler, scheduler
+from fastapi import FastAPI, Request
+from app.routers import applications, auth, calendar, cloudinary, feedback, metrics, resume, users
+from app.database import SessionLocal, checkout_stats, start_checkout_count
+from app.utils.reset_codes import cleanup_expired_reset_codes
+from app.utils.counters import reconcile_status_counters
+from app.utils.scheduler import scheduler, start_scheduler, stop_scheduler
+from app.utils.mail import close_mail_transport
+from app.utils.outbox import (
+    OUTBOX_DISPATCH_INTERVAL_SECONDS,
+    OUTBOX_DISPATCH_JOB_ID,
+    dispatch_outbox,
+    purge_outbox,
+)
+from app.utils.passwords import password_pool
+from app.utils.resume_extraction import extraction_pool
+from app.utils.reminders import (
+    REMINDER_REHYDRATE_JOB_ID,
+    REMINDER_SWEEP_INTERVAL_SECONDS,
+    REMINDER_SWEEP_JOB_ID,
+    rehydrate_reminders,
+    sweep_due_notifications,
+)
+from app.utils.process_pool import PoolSaturated
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 def scheduled_cleanup():
     db = SessionLocal()
@@ -11,6 +30,46 @@ def scheduled_cleanup():
     db.close()
 
 
+def scheduled_counter_reconcile():
+    db = SessionLocal()
+    try:
+        reconcile_status_counters(db)
+    finally:
+        db.close()
+
+
+def scheduled_outbox_dispatch():
+    db = SessionLocal()
+    try:
+        dispatch_outbox(db)
+    finally:
+        db.close()
+
+
+def scheduled_outbox_purge():
+    db = SessionLocal()
+    try:
+        purge_outbox(db)
+    finally:
+        db.close()
+
+
+def scheduled_reminder_sweep():
+    db = SessionLocal()
+    try:
+        sweep_due_notifications(db)
+    finally:
+        db.close()
+
+
+def scheduled_reminder_rehydrate():
+    db = SessionLocal()
+    try:
+        rehydrate_reminders(db)
+    finally:
+        db.close()
+
+
 app = FastAPI(title="Job Tracker API")
 app.include_router(feedback.router)
 app.include_router(applications.router)
@@ -18,6 +77,8 @@ app.include_router(resume.router)
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(cloudinary.router)
+app.include_router(metrics.router)
+app.include_router(calendar.router)
 
 
 
@@ -36,17 +97,56 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def count_db_checkouts(request: Request, call_next):
+    # how many pooled connections this request held; 1 is the target, 0 means it never hit the DB
+    counter = start_checkout_count()
+    response = await call_next(request)
+    response.headers["X-DB-Checkouts"] = str(counter.count)
+    checkout_stats.record(counter.count)
+    return response
+
+
+@app.exception_handler(PoolSaturated)
+async def pool_saturated_handler(request: Request, exc: PoolSaturated):
+    return JSONResponse(
+        status_code=503,
+        content={"status": "error", "message": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.get("/")
 def root():
     return {"message": "Welcome to Job Tracker API 🚀"}
 
+def register_scheduled_jobs():
+    # runs on the worker that wins the scheduler lease, each time it wins it
+    # overdue runs of the long-interval jobs happen once, however late, instead of being skipped as misfires
+    scheduler.add_job(scheduled_cleanup, "interval", minutes=20,  # Runs every 20 minutes
+                      id="cleanup_expired_reset_codes", replace_existing=True, misfire_grace_time=None, coalesce=True)
+    scheduler.add_job(scheduled_counter_reconcile, "interval", hours=6,
+                      id="reconcile_status_counters", replace_existing=True, misfire_grace_time=None, coalesce=True)
+    scheduler.add_job(scheduled_outbox_dispatch, "interval", seconds=OUTBOX_DISPATCH_INTERVAL_SECONDS,
+                      id=OUTBOX_DISPATCH_JOB_ID, replace_existing=True, max_instances=1, coalesce=True)
+    scheduler.add_job(scheduled_outbox_purge, "interval", hours=6,
+                      id="purge_email_outbox", replace_existing=True, misfire_grace_time=None, coalesce=True)
+    scheduler.add_job(scheduled_reminder_sweep, "interval", seconds=REMINDER_SWEEP_INTERVAL_SECONDS,
+                      id=REMINDER_SWEEP_JOB_ID, replace_existing=True, max_instances=1, coalesce=True)
+    # one-off reconcile whenever leadership changes hands, however late it gets to run
+    scheduler.add_job(scheduled_reminder_rehydrate, id=REMINDER_REHYDRATE_JOB_ID,
+                      replace_existing=True, misfire_grace_time=None)
+
+
 @app.on_event("startup")
 def _startup():
-    start_scheduler()
-    scheduler.add_job(scheduled_cleanup, "interval", minutes=20)  # Runs every 10 minutes
+    start_scheduler(register_jobs=register_scheduled_jobs)
 
 
 
 @app.on_event("shutdown")
 def _shutdown():
-    scheduler.shutdown(wait=False)
\ No newline at end of file
+    stop_scheduler()
+    password_pool.shutdown()
+    extraction_pool.shutdown()
+    close_mail_transport()
\ No newline at end of file
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Index, Integer, String, DateTime, ForeignKey, Boolean, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import DDL, Column, Index, Integer, String, DateTime, ForeignKey, Boolean, Enum, event
+from sqlalchemy.orm import deferred, relationship
 from app.database import Base
 import datetime
 from enum import Enum as PyEnum
@@ -20,6 +20,8 @@ class User(Base):
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
     profile_picture = Column(String, nullable=True)
+    # sha256 of the secret in the user's calendar feed URL; null while the feed is off
+    calendar_token_hash = Column(String(64), unique=True, index=True, nullable=True)
     
     applications = relationship("Application", back_populates="user", cascade="all, delete-orphan")
     notifications = relationship("Notification", back_populates="user", cascade="all, delete-orphan")
@@ -45,8 +47,9 @@ class Application(Base):
                                          default=ApplicationStatus.not_applied,
                                          nullable=False)
     applied_date = Column(DateTime, default=datetime.datetime.utcnow)
-    notes = Column(String, nullable=True)
-    job_description = Column(String, nullable=True)
+    # unbounded text: only loaded when accessed or explicitly selected
+    notes = deferred(Column(String, nullable=True))
+    job_description = deferred(Column(String, nullable=True))
     job_link = Column(String, nullable=True)
     interview_date_utc = Column(DateTime, nullable=True)
     interview_date = Column(DateTime, nullable=True)
@@ -63,8 +66,156 @@ class Application(Base):
 
     __table_args__ = (
         Index("ix_applications_user_id_id", "user_id", "id"),
+        # reminder rehydration walks upcoming interviews in (interview_date_utc, id) order
+        Index("ix_applications_interview_date_utc_id", "interview_date_utc", "id"),
+    )
+
+
+# Full-text search index read by app/utils/search.py. Migration 4ea3c541eeec
+# runs these statements on migrated databases, and the listeners below run them
+# when the schema comes from metadata.create_all (tests, scratch databases).
+SEARCH_INDEX_DDL = {
+    # a generated column, so Postgres keeps the vector in sync by itself
+    "postgresql": [
+        """
+        ALTER TABLE applications ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english'::regconfig, coalesce(job_title, '')), 'A') ||
+            setweight(to_tsvector('english'::regconfig, coalesce(company, '')), 'B') ||
+            setweight(to_tsvector('english'::regconfig, coalesce(notes, '')), 'C') ||
+            setweight(to_tsvector('english'::regconfig, coalesce(job_description, '')), 'D')
+        ) STORED
+        """,
+        "CREATE INDEX ix_applications_search_vector ON applications USING GIN (search_vector)",
+    ],
+    # an external-content FTS5 table kept in sync by triggers
+    "sqlite": [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS applications_fts USING fts5(
+            job_title, company, notes, job_description,
+            content='applications', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+        )
+        """,
+        """
+        CREATE TRIGGER applications_fts_ai AFTER INSERT ON applications BEGIN
+            INSERT INTO applications_fts(rowid, job_title, company, notes, job_description)
+            VALUES (new.id, new.job_title, new.company, new.notes, new.job_description);
+        END
+        """,
+        """
+        CREATE TRIGGER applications_fts_ad AFTER DELETE ON applications BEGIN
+            INSERT INTO applications_fts(applications_fts, rowid, job_title, company, notes, job_description)
+            VALUES ('delete', old.id, old.job_title, old.company, old.notes, old.job_description);
+        END
+        """,
+        """
+        CREATE TRIGGER applications_fts_au AFTER UPDATE OF job_title, company, notes, job_description ON applications BEGIN
+            INSERT INTO applications_fts(applications_fts, rowid, job_title, company, notes, job_description)
+            VALUES ('delete', old.id, old.job_title, old.company, old.notes, old.job_description);
+            INSERT INTO applications_fts(rowid, job_title, company, notes, job_description)
+            VALUES (new.id, new.job_title, new.company, new.notes, new.job_description);
+        END
+        """,
+    ],
+}
+
+for _dialect, _statements in SEARCH_INDEX_DDL.items():
+    for _statement in _statements:
+        event.listen(Application.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+# the triggers go with the table, the FTS5 table doesn't
+event.listen(
+    Application.__table__, "before_drop", DDL("DROP TABLE IF EXISTS applications_fts").execute_if(dialect="sqlite")
+)
+
+
+class ApplicationStatusCount(Base):
+    """
+    Running count of a user's applications per status. Maintained in the same
+    transaction as the write to applications; see app/utils/counters.py.
+    """
+    __tablename__ = "application_status_counts"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(Enum(ApplicationStatus, name="applicationstatus"), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    
+class CollectionVersion(Base):
+    """
+    Per-user version number for a collection ("applications", "resumes").
+    Bumped by every write to the collection and used to build list ETags.
+    """
+    __tablename__ = "collection_versions"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    collection = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class RefreshTokenFamily(Base):
+    """
+    One row per login session. Every refresh rotates current_jti; a refresh
+    token whose jti is not the current one has been replayed, and the whole
+    family is revoked.
+    """
+    __tablename__ = "refresh_token_families"
+
+    id = Column(String(32), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    current_jti = Column(String(32), nullable=False)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    last_used_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True, index=True)
+    revoked_reason = Column(String(50), nullable=True)
+
+
+class OutboxStatus(PyEnum):
+    pending = "pending"
+    sending = "sending"
+    sent = "sent"
+    dead = "dead"
+
+
+class EmailOutbox(Base):
+    """
+    Outgoing email, written in the same transaction as the change that
+    triggers it and delivered later by the dispatcher (app/utils/outbox.py).
+    """
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # same key, same email: a retried job or a second worker can't queue it twice
+    dedup_key = Column(String(255), nullable=True, unique=True)
+    to_email = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    body = Column(String, nullable=False)
+    html = Column(Boolean, nullable=False, default=False)
+    status = Column(Enum(OutboxStatus, name="outboxstatus"), nullable=False, default=OutboxStatus.pending)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.datetime.utcnow)
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # the dispatcher's claim query
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
     )
 
+
+class SchedulerLease(Base):
+    """
+    Leader lease for scheduled jobs: the process named in `holder` runs them
+    until `expires_at`, renewing as it goes. See app/utils/leader.py.
+    """
+    __tablename__ = "scheduler_leases"
+
+    name = Column(String(50), primary_key=True)
+    holder = Column(String(255), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
     
 class AiAnalysis(Base):
     __tablename__ = "ai_analyses"
@@ -124,6 +275,13 @@ class Notification(Base):
     # Many-to-oneJ
     user = relationship("User", back_populates="notifications")
     application = relationship("Application", back_populates="notifications")
+
+    __table_args__ = (
+        # the reminder sweeper reads due rows off this index
+        Index("ix_notifications_is_sent_scheduled_date", "is_sent", "scheduled_date"),
+        # rescheduling replaces an application's pending reminders
+        Index("ix_notifications_application_id", "application_id"),
+    )
     
    
 class InterviewPrep(Base):
@@ -143,4 +301,9 @@ class PasswordReset(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     code = Column(String(10), nullable=False)
-    expires_at = Column(DateTime, default=lambda: datetime.datetime.utcnow() + datetime.timedelta(minutes=10))    
\ No newline at end of file
+    expires_at = Column(DateTime, default=lambda: datetime.datetime.utcnow() + datetime.timedelta(minutes=10), index=True)
+
+    __table_args__ = (
+        # verification looks codes up by (user, code)
+        Index("ix_password_resets_user_id_code", "user_id", "code"),
+    )    
\ No newline at end of file
@@ -1,44 +1,212 @@
+import csv
+import io
+import json
 from datetime import datetime, timezone
+from typing import Literal, Optional
 from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from sqlalchemy import case, delete, func, insert, literal, select, union_all, update
+from sqlalchemy.orm import Session, undefer
 from app import models, database
-from app.schemas import AddApplicationRequest, InterviewDateRequest, RecentApplicationResponse, StatsResponse, UpdateApplicationRequest
+from app.database import get_db
+from app.schemas import (
+    AddApplicationRequest,
+    ApplicationFilter,
+    BulkDeleteRequest,
+    BulkStatusUpdateRequest,
+    InterviewDateRequest,
+    RecentApplicationResponse,
+    StatsResponse,
+    UpdateApplicationRequest,
+)
+from app.utils.counters import (
+    APPLICATIONS_COLLECTION,
+    INTERVIEWS_COLLECTION,
+    bump_collection_version,
+    bump_status_counts,
+    coerce_status,
+    get_collection_version,
+    get_status_counts,
+)
+from app.utils.cache import response_cache
+from app.utils.etag import etag_matches, not_modified, set_etag, weak_etag
+from app.utils.fieldsets import parse_fields
+from app.utils.importer import ImportFormatError, detect_format, iter_import_rows
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from app.utils.search import search_user_applications
 from app.utils.time_ago import time_ago
-from app.utils.interview import make_ics, parse_local_datetime, resolve_to_iana, schedule_reminders_for_application
-from app.utils.utils import get_current_user, send_mail
+from app.utils.interview import as_utc, get_zone, make_ics, parse_local_datetime, resolve_to_iana, schedule_reminders_for_application
+from app.utils.identity import UserSnapshot
+from app.utils.utils import get_current_identity, send_mail
 
 
 router = APIRouter(prefix="/applications", tags=["Applications"])
 
-def get_db():
+DEFAULT_SEARCH_PAGE_SIZE = 20
+# deep offsets re-rank everything before them; past this, refine the query instead
+MAX_SEARCH_OFFSET = 1000
+
+EXPORT_BATCH_SIZE = 500
+
+# sparse fieldsets: list views skip the unbounded text columns unless asked for
+APPLICATION_FIELDS = {
+    column.key: getattr(models.Application, column.key)
+    for column in models.Application.__table__.columns
+}
+HEAVY_FIELDS = ("notes", "job_description")
+LIST_FIELDS = tuple(name for name in APPLICATION_FIELDS if name not in HEAVY_FIELDS)
+DETAIL_FIELDS = (
+    "id", "user_id", "job_title", "company", "status", "applied_date", "notes",
+    "job_description", "job_link", "interview_date_utc", "interview_date",
+    "interview_timezone", "follow_up_date",
+)
+
+IMPORT_BATCH_SIZE = 500
+
+BULK_BATCH_SIZE = 500
+MAX_BULK_IDS = 10_000
+MAX_IMPORT_ROWS = 50_000
+MAX_IMPORT_ERRORS = 500
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+EXPORT_COLUMNS = (
+    models.Application.id,
+    models.Application.job_title,
+    models.Application.company,
+    models.Application.status,
+    models.Application.applied_date,
+    models.Application.notes,
+    models.Application.job_description,
+    models.Application.job_link,
+    models.Application.interview_date_utc,
+    models.Application.interview_date,
+    models.Application.interview_timezone,
+    models.Application.follow_up_date,
+    models.Application.created_at,
+    models.Application.updated_at,
+)
+
+
+
+def application_filters(
+    user_id: int,
+    status: Optional[models.ApplicationStatus] = None,
+    applied_from: Optional[datetime] = None,
+    applied_to: Optional[datetime] = None,
+):
+    """
+    WHERE clauses for a user's applications. user_id always leads so the
+    planner can walk ix_applications_user_id_id; the optional filters are
+    applied on top of that index range.
+    """
+    clauses = [models.Application.user_id == user_id]
+    if status is not None:
+        clauses.append(models.Application.status == status)
+    if applied_from is not None:
+        clauses.append(models.Application.applied_date >= applied_from)
+    if applied_to is not None:
+        clauses.append(models.Application.applied_date <= applied_to)
+    return clauses
+
+
+def _export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, models.ApplicationStatus):
+        return value.value
+    return value
+
+
+def _export_chunks(fmt: str, filters: list):
+    """
+    Yield the export body one batch at a time. Opens its own session because
+    the response is still streaming after the request dependencies have closed.
+    """
     db = database.SessionLocal()
     try:
-        yield db
+        stmt = (
+            select(*EXPORT_COLUMNS)
+            .where(*filters)
+            .order_by(models.Application.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)  # server-side cursor where supported
+        )
+        result = db.execute(stmt)
+        header = list(result.keys())
+
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(header)
+            yield buffer.getvalue()
+
+        for rows in result.partitions():
+            if fmt == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerows([_export_value(value) for value in row] for row in rows)
+                yield buffer.getvalue()
+            else:
+                yield "".join(
+                    json.dumps({key: _export_value(value) for key, value in zip(header, row)}) + "\n"
+                    for row in rows
+                )
     finally:
         db.close()
 
-@router.get("/")
-def list_applications(db: Session = Depends(get_db)):
-    return db.query(models.Application).all()
+
+@router.get("/export")
+def export_applications(
+    current_user: UserSnapshot = Depends(get_current_identity),
+    format: Literal["ndjson", "csv"] = "ndjson",
+    status: Optional[models.ApplicationStatus] = None,
+    applied_from: Optional[datetime] = None,
+    applied_to: Optional[datetime] = None,
+):
+    """
+    Stream every application the user owns as NDJSON or CSV.
+    Rows are fetched and written in batches, so memory stays flat for any size.
+    """
+    filters = application_filters(current_user.id, status, applied_from, applied_to)
+    return StreamingResponse(
+        _export_chunks(format, filters),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="applications.{format}"'},
+    )
 
 
     
     
+def _reload_with_text(db: Session, application_id: int) -> models.Application:
+    """
+    Re-read an application after commit with the deferred text columns
+    included, for responses that echo the whole row. One query, like db.refresh.
+    """
+    return (
+        db.query(models.Application)
+        .options(undefer(models.Application.notes), undefer(models.Application.job_description))
+        .populate_existing()
+        .filter(models.Application.id == application_id)
+        .one()
+    )
+
+
 @router.post("/add-new-application")
 def add_new_application(
   application_data: AddApplicationRequest,  
   db: Session = Depends(get_db),
-  current_user: models.User = Depends(get_current_user)
+  current_user: UserSnapshot = Depends(get_current_identity)
 ):
+    status = coerce_status(application_data.status)
+    if status is None:
+        raise HTTPException(status_code=400, detail=f"Invalid status: {application_data.status}")
+
     new_application = models.Application(
         job_title=application_data.job_title,
         company=application_data.company,
-        status=application_data.status,
+        status=status,
         applied_date=application_data.applied_date or datetime.utcnow(),
         notes=application_data.notes,
         job_description=application_data.job_description,
@@ -46,45 +214,190 @@ def add_new_application(
         user_id=current_user.id,
     )
     db.add(new_application)
+    bump_status_counts(db, current_user.id, {status: 1})
+    bump_collection_version(db, current_user.id, APPLICATIONS_COLLECTION)
     db.commit()
-    db.refresh(new_application)
+    new_application = _reload_with_text(db, new_application.id)
     return {
         "message": "Application added successfully",
         "application": new_application
     }
     
+@router.post("/import")
+def import_applications(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_identity),
+):
+    """
+    Bulk-create applications from a CSV, JSON array or NDJSON upload.
+    Each row is validated like /add-new-application; valid rows are inserted in
+    multi-row batches inside one transaction and invalid rows are reported back.
+    """
+    try:
+        fmt = detect_format(file.filename, file.content_type)
+    except ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    imported = 0
+    failed = 0
+    errors = []
+    status_deltas = {}
+    batch = []
+
+    def report(row_number, row_errors):
+        nonlocal failed
+        failed += 1
+        if len(errors) < MAX_IMPORT_ERRORS:
+            errors.append({"row": row_number, "errors": row_errors})
+
+    def flush():
+        nonlocal imported
+        if batch:
+            db.execute(insert(models.Application).values(batch))
+            imported += len(batch)
+            batch.clear()
+
+    try:
+        for row_number, raw in iter_import_rows(file.file, fmt):
+            if imported + len(batch) + failed >= MAX_IMPORT_ROWS:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Too many rows. Maximum allowed is {MAX_IMPORT_ROWS} per import.",
+                )
+            if not isinstance(raw, dict):
+                report(row_number, ["Row must be an object"])
+                continue
+            try:
+                row = AddApplicationRequest(**raw)
+            except ValidationError as e:
+                report(row_number, [f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()])
+                continue
+            status = coerce_status(row.status)
+            if status is None:
+                report(row_number, [f"status: invalid status {row.status}"])
+                continue
+
+            now = datetime.utcnow()
+            batch.append({
+                "user_id": current_user.id,
+                "job_title": row.job_title,
+                "company": row.company,
+                "status": status,
+                "applied_date": row.applied_date or now,
+                "notes": row.notes,
+                "job_description": row.job_description,
+                "job_link": row.job_link,
+                "created_at": now,
+                "updated_at": now,
+            })
+            status_deltas[status] = status_deltas.get(status, 0) + 1
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                flush()
+        flush()
+        bump_status_counts(db, current_user.id, status_deltas)
+        if imported:
+            bump_collection_version(db, current_user.id, APPLICATIONS_COLLECTION)
+        db.commit()
+    except ImportFormatError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception:
+        db.rollback()
+        raise
+
+    return {
+        "message": f"Imported {imported} applications, {failed} failed",
+        "imported": imported,
+        "failed": failed,
+        "errors": errors,
+    }
+
+
 @router.get("/my-applications")
 def list_user_applications(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_identity),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    status: Optional[models.ApplicationStatus] = None,
+    applied_from: Optional[datetime] = None,
+    applied_to: Optional[datetime] = None,
+    fields: Optional[str] = None,
 ):
-    applications = db.query(models.Application).filter(models.Application.user_id == current_user.id).all()
-    if not applications:
-        return {"message": "You have no applications."}
-    return {"data": applications}
+    """
+    Newest-first keyset pagination over (user_id, id).
+    Pass the returned next_cursor as `after` to fetch the following page.
+    `fields=a,b,c` picks the columns; notes and job_description are opt-in.
+    """
+    try:
+        columns = parse_fields(fields, APPLICATION_FIELDS, LIST_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # the collection version changes on every write, so it validates any page of the list
+    version = get_collection_version(db, current_user.id, APPLICATIONS_COLLECTION)
+    etag = weak_etag(current_user.id, version, request.url.query)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    query = db.query(*columns).filter(
+        *application_filters(current_user.id, status, applied_from, applied_to)
+    )
+    if after:
+        try:
+            after_id = decode_cursor(after)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        query = query.filter(models.Application.id < after_id)
+
+    # fetch one extra row so we know whether another page exists
+    applications = query.order_by(models.Application.id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(applications) > limit:
+        applications = applications[:limit]
+        next_cursor = encode_cursor(applications[-1].id)
+
+    if not applications and not after:
+        return {"message": "You have no applications.", "data": [], "next_cursor": None}
+    return {"data": [dict(row._mapping) for row in applications], "next_cursor": next_cursor}
 
 @router.get("/my-applications/{application_id}")
 def get_application_details(
     application_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_identity),
+    fields: Optional[str] = None,
 ):
-    application = (
-        db.query(
-            models.Application.id,
-            models.Application.user_id,
-            models.Application.job_title,
-            models.Application.company,
-            models.Application.status,
-            models.Application.applied_date,
-            models.Application.notes,
-            models.Application.job_description,
-            models.Application.job_link,
-            models.Application.interview_date_utc,
-            models.Application.interview_date,
-            models.Application.interview_timezone,
-            models.Application.follow_up_date
+    try:
+        columns = parse_fields(fields, APPLICATION_FIELDS, DETAIL_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # validate against updated_at alone before loading the row
+    updated_at = (
+        db.query(models.Application.updated_at)
+        .filter(
+            models.Application.id == application_id,
+            models.Application.user_id == current_user.id
         )
+        .first()
+    )
+    if not updated_at:
+        raise HTTPException(status_code=404, detail="Application not found")
+    etag = weak_etag(application_id, updated_at[0], fields or "")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    application = (
+        db.query(*columns)
         .filter(
             models.Application.id == application_id,
             models.Application.user_id == current_user.id
@@ -103,7 +416,7 @@ def update_application(
     application_id: int,
     application_data: UpdateApplicationRequest,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_identity),
 ):
     application = (
         db.query(models.Application)
@@ -134,6 +447,11 @@ def update_application(
     old_status_norm = norm(old_status_raw)
 
     update_data = application_data.dict(exclude_unset=True)
+    if "status" in update_data:
+        new_status = coerce_status(update_data["status"])
+        if new_status is None:
+            raise HTTPException(status_code=400, detail=f"Invalid status: {update_data['status']}")
+        update_data["status"] = new_status
 
     # Determine the "new" status after update (if client provided status, use that; otherwise fallback to old)
     new_status_raw = update_data.get("status", old_status_raw)
@@ -148,8 +466,16 @@ def update_application(
         application.interview_date = None
         application.interview_timezone = None
 
+    old_status, new_status = coerce_status(old_status_raw), coerce_status(new_status_raw)
+    if old_status != new_status:
+        bump_status_counts(db, current_user.id, {old_status: -1, new_status: 1})
+    bump_collection_version(db, current_user.id, APPLICATIONS_COLLECTION)
+    if application.interview_date_utc is not None and update_data.keys() & {"job_title", "company"}:
+        # the calendar feed shows title and company
+        bump_collection_version(db, current_user.id, INTERVIEWS_COLLECTION)
+
     db.commit()
-    db.refresh(application)
+    application = _reload_with_text(db, application.id)
 
     next_action = None
     if new_status_norm == "interview":
@@ -167,7 +493,7 @@ def update_application(
 def delete_application(
     application_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_identity),
 ):
     application = db.query(models.Application).filter(
         models.Application.id == application_id,
@@ -178,16 +504,131 @@ def delete_application(
         raise HTTPException(status_code=404, detail="Application not found")
     
     db.delete(application)
+    bump_status_counts(db, current_user.id, {coerce_status(application.status): -1})
+    bump_collection_version(db, current_user.id, APPLICATIONS_COLLECTION)
+    if application.interview_date_utc is not None:
+        bump_collection_version(db, current_user.id, INTERVIEWS_COLLECTION)
     db.commit()
     
     return {"message": "Application deleted successfully"}
 
+
+def _bulk_scopes(user_id: int, ids: Optional[list], filter: Optional[ApplicationFilter]):
+    """
+    Turn a bulk request into a list of WHERE-clause batches, each scoped to the user.
+    """
+    if ids is None and filter is None:
+        raise HTTPException(status_code=400, detail="Provide ids or a filter")
+    if ids is None and not filter.dict(exclude_none=True):
+        # an empty filter matches every application the user has
+        raise HTTPException(status_code=400, detail="Filter must set at least one of status, applied_from, applied_to")
+
+    status = None
+    if filter is not None and filter.status is not None:
+        status = coerce_status(filter.status)
+        if status is None:
+            raise HTTPException(status_code=400, detail=f"Invalid status: {filter.status}")
+    clauses = application_filters(
+        user_id,
+        status,
+        filter.applied_from if filter else None,
+        filter.applied_to if filter else None,
+    )
+
+    if ids is None:
+        return [clauses]
+    if len(ids) > MAX_BULK_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_IDS} ids per request")
+    unique_ids = sorted(set(ids))
+    return [
+        clauses + [models.Application.id.in_(unique_ids[i:i + BULK_BATCH_SIZE])]
+        for i in range(0, len(unique_ids), BULK_BATCH_SIZE)
+    ]
+
+
+def _status_breakdown(db: Session, scope: list) -> dict:
+    rows = (
+        db.query(models.Application.status, func.count(models.Application.id))
+        .filter(*scope)
+        .group_by(models.Application.status)
+        .all()
+    )
+    return {coerce_status(status): count for status, count in rows}
+
+
+@router.patch("/bulk/status")
+def bulk_update_status(
+    request: BulkStatusUpdateRequest,
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_identity),
+):
+    new_status = coerce_status(request.status)
+    if new_status is None:
+        raise HTTPException(status_code=400, detail=f"Invalid status: {request.status}")
+
+    values = {"status": new_status, "updated_at": datetime.utcnow()}
+    if new_status != models.ApplicationStatus.interview:
+        # same rule as update_application: leaving "Interview" clears the interview fields
+        was_interview = models.Application.status == models.ApplicationStatus.interview
+        values["interview_date"] = case((was_interview, None), else_=models.Application.interview_date)
+        values["interview_timezone"] = case((was_interview, None), else_=models.Application.interview_timezone)
+
+    updated = 0
+    deltas = {}
+    for scope in _bulk_scopes(current_user.id, request.ids, request.filter):
+        for status, count in _status_breakdown(db, scope).items():
+            deltas[status] = deltas.get(status, 0) - count
+            deltas[new_status] = deltas.get(new_status, 0) + count
+        result = db.execute(
+            update(models.Application)
+            .where(*scope)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        updated += result.rowcount
+    bump_status_counts(db, current_user.id, deltas)
+    bump_collection_version(db, current_user.id, APPLICATIONS_COLLECTION)
+    db.commit()
+
+    return {
+        "message": f"{updated} applications updated",
+        "updated": updated,
+        "next_action": "Set interview date." if new_status == models.ApplicationStatus.interview else None,
+    }
+
+
+@router.post("/bulk/delete")
+def bulk_delete_applications(
+    request: BulkDeleteRequest,
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_identity),
+):
+    deleted = 0
+    deltas = {}
+    for scope in _bulk_scopes(current_user.id, request.ids, request.filter):
+        for status, count in _status_breakdown(db, scope).items():
+            deltas[status] = deltas.get(status, 0) - count
+        result = db.execute(
+            delete(models.Application)
+            .where(*scope)
+            .execution_options(synchronize_session=False)
+        )
+        deleted += result.rowcount
+    bump_status_counts(db, current_user.id, deltas)
+    bump_collection_version(db, current_user.id, APPLICATIONS_COLLECTION)
+    if deleted:
+        # cheaper to rebuild the feed once than to check which rows had interviews
+        bump_collection_version(db, current_user.id, INTERVIEWS_COLLECTION)
+    db.commit()
+
+    return {"message": f"{deleted} applications deleted", "deleted": deleted}
+
 # @router.post("/{id}/set-interview")
 # def set_interview_date(
 #     id: int,
 #     request: InterviewDateRequest,
 #     db: Session = Depends(get_db),
-#     current_user: models.User = Depends(get_current_user),
+#     current_user: UserSnapshot = Depends(get_current_identity),
 # ):
 #     application = db.query(models.Application).filter(
 #         models.Application.id == id,
@@ -267,10 +708,13 @@ def set_interview_date(
     id: int,
     request: InterviewDateRequest,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_identity),
 ):
-    application = (
-        db.query(models.Application)
+    # the user's timezone comes from the row, not the cached identity, which
+    # another worker may not have seen change yet
+    found = (
+        db.query(models.Application, models.User.timezone)
+        .join(models.User, models.User.id == models.Application.user_id)
         .filter(
             models.Application.id == id,
             models.Application.user_id == current_user.id,
@@ -278,8 +722,9 @@ def set_interview_date(
         .first()
     )
 
-    if not application:
+    if not found:
         raise HTTPException(status_code=404, detail="Application not found")
+    application, user_timezone = found
 
     if application.status != models.ApplicationStatus.interview:
         raise HTTPException(
@@ -301,13 +746,18 @@ def set_interview_date(
 
     # 3) Convert to UTC
     # utc_dt = local_dt.astimezone(datetime.timezone.utc)
-    utc_dt = local_dt.astimezone(ZoneInfo("UTC"))
+    utc_dt = local_dt.astimezone(get_zone("UTC"))
 
 
     # ✅ Save both
-    application.interview_date = request.interview_date  # recruiter-local datetime
+    application.interview_date = local_dt.replace(tzinfo=None)  # recruiter-local datetime
     application.interview_timezone = recruiter_iana
     application.interview_date_utc = utc_dt
+    bump_collection_version(db, current_user.id, APPLICATIONS_COLLECTION)
+    bump_collection_version(db, current_user.id, INTERVIEWS_COLLECTION)
+
+    # 4) Reminders go out in the user's timezone (scheduler runs in UTC)
+    schedule_reminders_for_application(db, application, utc_dt, user_timezone or "UTC")
 
     db.commit()
     db.refresh(application)
@@ -330,53 +780,98 @@ def set_interview_date(
 def search_applications(
     query: str,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_identity),
+    limit: int = Query(DEFAULT_SEARCH_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0, le=MAX_SEARCH_OFFSET),
 ):
+    """
+    Ranked, prefix-matching full-text search across title, company, notes
+    and job description. Each result carries a highlighted snippet.
+    """
     if not query.strip():
         return []
-    results = db.query(models.Application).filter(
-        models.Application.user_id == current_user.id,
-        (models.Application.job_title.ilike(f"%{query}%")) | 
-        (models.Application.company.ilike(f"%{query}%")) | 
-        (models.Application.notes.ilike(f"%{query}%"))
-    ).all()
-    
-    return {"results": results}
+    results, has_more = search_user_applications(db, current_user.id, query, limit, offset)
+
+    return {
+        "results": results,
+        "next_offset": offset + limit if has_more else None,
+    }
+
+def stats_payload(stats: dict) -> dict:
+    return {
+        "data": {
+            "applied": stats.get("Applied", 0),
+            "interview": stats.get("Interview", 0),
+            "offer": stats.get("Offer", 0),
+            "rejected": stats.get("Rejected", 0),
+        }
+    }
+
+
+def recent_payload(applications) -> list:
+    return [
+        RecentApplicationResponse(
+            id=app.id,
+            job_title=app.job_title,
+            company_name=app.company,
+            status=app.status.value,
+            time_ago=time_ago(app.created_at),
+        )
+        for app in applications
+    ]
+
+
+def upcoming_payload(upcoming, current_user) -> dict:
+    if not upcoming:
+        return {"message": None}
+
+    # Display in user's timezone
+    user_tz = current_user.timezone or upcoming.interview_timezone or "UTC"
+    # stored naive UTC; as_utc keeps astimezone from reading it as server-local time
+    dt_local = as_utc(upcoming.interview_date_utc).astimezone(get_zone(user_tz))
+    pretty = dt_local.strftime("%A, %B %d, %Y at %I:%M %p %Z")
+
+    return {
+        "message": f"Your upcoming interview at {upcoming.company}: {pretty} 🗓️",
+        "application_id": upcoming.id,
+        "job_title": upcoming.job_title,
+        "company": upcoming.company,
+        "interview_date": upcoming.interview_date.isoformat(),
+        "interview_date_utc": upcoming.interview_date_utc.isoformat(),
+        "timezone": upcoming.interview_timezone,
+        "display_time": pretty,
+    }
+
 
 @router.get("/stats", response_model=StatsResponse)
 def all_applications_stats(
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_identity)
 ):
-    
-    results = (
-        db.query(models.Application.status, func.count(models.Application.id))
-        .filter(models.Application.user_id == current_user.id)
-        .group_by(models.Application.status)
-        .all()
-    )
-    
-    stats = {status.value: count for status, count in results}
-    
-    
-    return{
-        
-            "data":{
-                "applied": stats.get("Applied", 0),
-                "interview": stats.get("Interview", 0),
-                "offer": stats.get("Offer", 0),
-                "rejected": stats.get("Rejected", 0),
-            } 
-        
-    }
+    cache_key = response_cache.key(current_user.id, APPLICATIONS_COLLECTION, "stats")
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # maintained incrementally by the write endpoints, see app/utils/counters.py
+    stats = get_status_counts(db, current_user.id)
+
+    payload = stats_payload(stats)
+    response_cache.set(cache_key, payload)
+    return payload
     
     
 @router.get("/recent",  response_model=list[RecentApplicationResponse])
 def recent_appication(
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_identity),
     limit: int = 5,
 ):
+    route = f"recent:{limit}"
+    cache_key = response_cache.key(current_user.id, APPLICATIONS_COLLECTION, route)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
     
     applications = (
         db.query(models.Application)
@@ -386,22 +881,20 @@ def recent_appication(
         .all()
     )
     
-    return[
-        RecentApplicationResponse(
-            id=app.id,
-            job_title=app.job_title,
-            company_name=app.company,
-            status=app.status.value,  
-            time_ago=time_ago(app.created_at),
-        )
-        for app in applications
-    ]
+    payload = [item.dict() for item in recent_payload(applications)]
+    response_cache.set(cache_key, payload)
+    return payload
     
 @router.get("/upcoming-interview")
 def get_upcoming_interview(
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_identity),
 ):
+    cache_key = response_cache.key(current_user.id, APPLICATIONS_COLLECTION, "upcoming-interview")
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     # ✅ timezone-aware "now" in UTC
     now_utc = datetime.now(timezone.utc)
 
@@ -416,21 +909,71 @@ def get_upcoming_interview(
         .first()
     )
 
-    if not upcoming:
-        return {"message": None}
+    payload = upcoming_payload(upcoming, current_user)
+    response_cache.set(cache_key, payload)
+    return payload
 
-    # Display in user's timezone
-    user_tz = current_user.timezone or upcoming.interview_timezone or "UTC"
-    dt_local = upcoming.interview_date_utc.astimezone(ZoneInfo(user_tz))
-    pretty = dt_local.strftime("%A, %B %d, %Y at %I:%M %p %Z")
 
-    return {
-        "message": f"Your upcoming interview at {upcoming.company}: {pretty} 🗓️",
-        "application_id": upcoming.id,
-        "job_title": upcoming.job_title,
-        "company": upcoming.company,
-        "interview_date": upcoming.interview_date.isoformat(),
-        "interview_date_utc": upcoming.interview_date_utc.isoformat(),
-        "timezone": upcoming.interview_timezone,
-        "display_time": pretty,
-    }
\ No newline at end of file
+@router.get("/dashboard")
+def get_dashboard(
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_identity),
+    limit: int = 5,
+):
+    """
+    /stats, /recent and /upcoming-interview in one request: one user lookup,
+    one session and two statements (counters + a UNION ALL of recent and upcoming).
+    """
+    route = f"dashboard:{limit}"
+    cache_key = response_cache.key(current_user.id, APPLICATIONS_COLLECTION, route)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    now_utc = datetime.now(timezone.utc)
+    stats = get_status_counts(db, current_user.id)
+
+    columns = (
+        models.Application.id,
+        models.Application.job_title,
+        models.Application.company,
+        models.Application.status,
+        models.Application.created_at,
+        models.Application.interview_date,
+        models.Application.interview_date_utc,
+        models.Application.interview_timezone,
+    )
+    recent = (
+        select(*columns, literal("recent").label("slot"))
+        .where(models.Application.user_id == current_user.id)
+        .order_by(models.Application.created_at.desc())
+        .limit(limit)
+        .subquery()
+    )
+    upcoming = (
+        select(*columns, literal("upcoming").label("slot"))
+        .where(
+            models.Application.user_id == current_user.id,
+            models.Application.interview_date_utc != None,
+            models.Application.interview_date_utc > now_utc,
+        )
+        .order_by(models.Application.interview_date_utc.asc())
+        .limit(1)
+        .subquery()
+    )
+    # a UNION doesn't keep its branches' ORDER BY, so order the combined rows
+    combined = union_all(select(recent), select(upcoming)).subquery()
+    rows = db.execute(
+        select(combined).order_by(combined.c.slot, combined.c.created_at.desc(), combined.c.id.desc())
+    ).all()
+
+    recent_rows = [row for row in rows if row.slot == "recent"]
+    upcoming_row = next((row for row in rows if row.slot == "upcoming"), None)
+
+    payload = {
+        "stats": stats_payload(stats),
+        "recent": [item.dict() for item in recent_payload(recent_rows)],
+        "upcoming_interview": upcoming_payload(upcoming_row, current_user),
+    }
+    response_cache.set(cache_key, payload)
+    return payload
@@ -1,46 +1,63 @@
 from fastapi import APIRouter, Depends
 from fastapi.responses import JSONResponse
-from app import database
 from app.schemas import ChangePasswordRequest, ForgotPasswordRequest, RefreshRequest, TimeZoneRequest, TokenResponse
 from app.enums.timezones import TimezoneEnum
-from app.utils.utils import create_refresh_token, get_current_user, refresh_token, send_mail
+from app.utils.utils import REFRESH_TOKEN_EXPIRE_DAYS, issue_tokens, oauth2_scheme, refresh_token, verify_access_token
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app import models, database
+from app import models
+from app.database import get_db
 from app.schemas import ForgotPasswordRequest, ResetPasswordRequest, UserCreate, UserLogin
-from passlib.hash import bcrypt
-from app.utils.utils import create_access_token, genarate_reset_token, get_current_user, send_mail
+from fastapi.concurrency import run_in_threadpool
+from app.utils.utils import genarate_reset_token, get_current_identity
+from fastapi.encoders import jsonable_encoder
+from app.utils.cache import invalidate_on_commit
+from app.utils.identity import UserSnapshot, invalidate_identity_on_commit
+from app.utils.outbox import enqueue_email
+from app.utils.passwords import hash_password, verify_password
+from app.utils.reset_codes import reset_codes
+from app.utils.tokens import revoke_family, revoke_user_families, start_family
+from app.utils.counters import APPLICATIONS_COLLECTION
+from app.utils.interview import sync_user_reminders
 import logging
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
-def get_db():
-    db = database.SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
         
 
 
+def _find_user_by_email(db: Session, email: str):
+    return db.query(models.User).filter(models.User.email == email).first()
+
+
+def _save(db: Session, instance=None):
+    if instance is not None:
+        db.add(instance)
+    db.commit()
+    if instance is not None:
+        db.refresh(instance)
+    return instance
+
+
+# The auth handlers are async so bcrypt can be awaited on the password pool;
+# their (sync) DB work goes through run_in_threadpool to stay off the event loop.
+
 @router.post("/create-account")
-def create_account(user: UserCreate, db: Session = Depends(get_db)):
-    if db.query(models.User).filter(models.User.email == user.email).first():
+async def create_account(user: UserCreate, db: Session = Depends(get_db)):
+    if await run_in_threadpool(_find_user_by_email, db, user.email):
         return JSONResponse(
         status_code=400,
         content={"status": "error", "message": "Email already registered"}
     )
-    hashed_password = bcrypt.hash(user.password)
+    hashed_password = await hash_password(user.password)
     db_user = models.User(
         username=user.username,
         email=user.email,
         password_hash=hashed_password
     )
     
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await run_in_threadpool(_save, db, db_user)
     
     
     return JSONResponse(
@@ -59,71 +76,81 @@ def create_account(user: UserCreate, db: Session = Depends(get_db)):
     
     
 @router.post("/login")
-def login_app(user: UserLogin, db: Session = Depends(get_db)):
-    db_user = db.query(models.User).filter(models.User.email == user.email).first()
-    if not db_user or not bcrypt.verify(user.password, db_user.password_hash):
+async def login_app(user: UserLogin, db: Session = Depends(get_db)):
+    db_user = await run_in_threadpool(_find_user_by_email, db, user.email)
+    valid, new_hash = await verify_password(user.password, db_user.password_hash if db_user else None)
+    if not db_user or not valid:
           return JSONResponse(
                 status_code=400,
                 content={"status": "error", "message": "Invalid Credentials"}
             )
-    data={"sub": str(db_user.id)}      
-    access_token = create_access_token(data)
-    refresh_token = create_refresh_token(data)
-    return JSONResponse(
-        status_code=200,
-        content={
-        "status": "success",
-        "message": "Login Successfull",
-        "access_token": access_token,
-        "refresh_token": refresh_token,
-        "token_type": "bearer",
-        "data":{
-            
+    # read everything we return now: the commit below expires the instance
+    user_data = {
             "user_id": db_user.id,
             "username": db_user.username,
             "email": db_user.email,
             "timezone": db_user.timezone,
             "profile_picture": db_user.profile_picture
         }
+    if new_hash:
+        # stored hash is below the configured cost; upgrade it while we have the plaintext
+        db_user.password_hash = new_hash
+    family = start_family(db, db_user.id, timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
+    tokens = issue_tokens(user_data["user_id"], family)
+    await run_in_threadpool(_save, db)
+    return JSONResponse(
+        status_code=200,
+        content={
+        "status": "success",
+        "message": "Login Successfull",
+        **tokens,
+        "data": user_data
         }
     )
 
 @router.post("/refresh", response_model=TokenResponse)
-async def refresh_token_endpoint(body: RefreshRequest):
-    return refresh_token(body.refresh_token)
+def refresh_token_endpoint(body: RefreshRequest, db: Session = Depends(get_db)):
+    return refresh_token(body.refresh_token, db)
+
+
+@router.post("/logout")
+def logout(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    user_id, family_id = verify_access_token(token, db)
+    if family_id:
+        family = db.query(models.RefreshTokenFamily).filter(models.RefreshTokenFamily.id == family_id).first()
+        if family is not None:
+            revoke_family(db, family, "logout")
+            db.commit()
+    return {"message": "Logged out successfully"}
 
 
 @router.get("/me")
-def return_me(current_user: models.User = Depends(get_current_user)):
+def return_me(current_user: UserSnapshot = Depends(get_current_identity)):
     return JSONResponse(
         status_code=200,
         content={
             "message": f"Hello, {current_user.username}. You are authenticated!",
-            "data": current_user
+            "data": jsonable_encoder(current_user)
         }
         )
 
 
-reset_code_cache = {}
 @router.post("/forgot-password")
 def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(get_db)):
     db_user = db.query(models.User).filter(models.User.email == request.email).first()
     if not db_user:
         raise HTTPException(status_code=404, detail="Email not Registered")
     code = genarate_reset_token()
-    reset_entry = models.PasswordReset(
-        user_id=db_user.id,
-        code=code,
-        expires_at=datetime.utcnow() + timedelta(minutes=10)
-    )
-    db.add(reset_entry)
-    db.commit()
-    send_mail(
+    reset_codes.issue(db, db_user, code)
+    # delivered by the outbox dispatcher once this commits; SMTP stays out of the request
+    enqueue_email(
+        db,
+        request.email,
         "Password Reset Code",
         f"Your password reset code is: {code}",
-        request.email,
         html=False
     )
+    db.commit()
     return {
         "message": "Reset code sent to your email",
         "code": code  # For testing purposes only; remove in production
@@ -132,39 +159,37 @@ def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(get_db
 
 @router.post("/verify-reset-code")
 def verify_reset_code(request: ResetPasswordRequest, db: Session = Depends(get_db)):
-    db_user = db.query(models.User).filter(models.User.email == request.email).first()
-    if not db_user:
-        raise HTTPException(status_code=404, detail="Email not Registered")
-    reset_entry = db.query(models.PasswordReset).filter(
-        models.PasswordReset.user_id == db_user.id,
-        models.PasswordReset.code == request.token,
-        models.PasswordReset.expires_at > datetime.utcnow()
-    ).first()
-    if not reset_entry:
+    # checks and deletes the code in one statement
+    if not reset_codes.consume(db, request.email, request.token):
+        # only the failure path pays for telling the two errors apart
+        if not db.query(models.User.id).filter(models.User.email == request.email).first():
+            raise HTTPException(status_code=404, detail="Email not Registered")
         raise HTTPException(status_code=400, detail="Invalid or expired reset code")
-    # Delete The reset code after successful verification
-    db.delete(reset_entry)
     db.commit()
     return {"message": "Reset code verified successfully. You can now reset your password."}
 
 
+def _store_new_password(db: Session, db_user: models.User, hashed_password: str):
+    db_user.password_hash = hashed_password
+    invalidate_identity_on_commit(db, db_user.id)
+    # sign out every existing session along with the old password
+    revoke_user_families(db, db_user.id, "password_reset")
+    reset_codes.discard_user(db, db_user.id)
+    db.commit()
+
+
 @router.post("/reset-password")
-def reset_password(request: ChangePasswordRequest, db: Session = Depends(get_db)):
-    db_user = db.query(models.User).filter(models.User.email == request.email).first()
+async def reset_password(request: ChangePasswordRequest, db: Session = Depends(get_db)):
+    db_user = await run_in_threadpool(_find_user_by_email, db, request.email)
     if not db_user:
         raise HTTPException(status_code=404, detail="Email not Registered")
-    hashed_password = bcrypt.hash(request.new_password)
-    db_user.password_hash = hashed_password
-    db.commit()
-    db.query(models.PasswordReset).filter(
-        models.PasswordReset.user_id == db_user.id
-    ).delete()
-    db.commit()
+    hashed_password = await hash_password(request.new_password)
+    await run_in_threadpool(_store_new_password, db, db_user, hashed_password)
     return {"message": "Password reset successfully"}
 
 
 @router.post("/add-timezone")
-def add_timezone(timezone_request: TimeZoneRequest, current_user: models.User = Depends(get_current_user), db: Session = Depends(get_db)):
+def add_timezone(timezone_request: TimeZoneRequest, current_user: UserSnapshot = Depends(get_current_identity), db: Session = Depends(get_db)):
     try:
         tz_value = TimezoneEnum[timezone_request.timezone].value
     except KeyError:
@@ -175,6 +200,10 @@ def add_timezone(timezone_request: TimeZoneRequest, current_user: models.User =
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
     db_user.timezone = tz_value
+    sync_user_reminders(db, db_user.id, tz_value)
+    # upcoming-interview text is rendered in the user's timezone
+    invalidate_on_commit(db, db_user.id, APPLICATIONS_COLLECTION)
+    invalidate_identity_on_commit(db, db_user.id)
     db.commit()
     db.refresh(db_user)
    
@@ -182,25 +211,3 @@ def add_timezone(timezone_request: TimeZoneRequest, current_user: models.User =
         "message": "Timezone added successfully",
         "timezone": db_user.timezone
     }
-    
-
-# def cleanup_expired_reset_codes(db: Session):
-#     db.query(models.PasswordReset).filter(
-#         models.PasswordReset.expires_at < datetime.utcnow()
-#     ).delete()
-#     db.commit()        
-
-
-
-
-def cleanup_expired_reset_codes(db: Session):
-    try:
-        deleted = db.query(models.PasswordReset).filter(
-            models.PasswordReset.expires_at < datetime.utcnow()
-        ).delete(synchronize_session=False)
-        db.commit()
-        logging.info(f"✅ Cleanup ran: deleted {deleted} expired reset codes")
-    except Exception as e:
-        db.rollback()
-        logging.error(f"❌ Cleanup failed: {e}")
-
@@ -0,0 +1,115 @@
+import hashlib
+import os
+import secrets
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import get_db
+from app.utils.cache import LRUCache
+from app.utils.counters import INTERVIEWS_COLLECTION
+from app.utils.etag import etag_matches, not_modified, set_etag, weak_etag
+from app.utils.identity import UserSnapshot
+from app.utils.interview import make_ics_feed
+from app.utils.utils import get_current_identity
+
+router = APIRouter(prefix="/calendar", tags=["Calendar"])
+
+CALENDAR_FEED_CACHE_ENTRIES = int(os.getenv("CALENDAR_FEED_CACHE_ENTRIES", "2000"))
+ICS_MEDIA_TYPE = "text/calendar; charset=utf-8"
+
+# Rendered feeds keyed by (user, interviews version). A version bump makes the
+# old entry unreachable, so entries never need a TTL; LRU ages them out.
+feed_cache = LRUCache(max_entries=CALENDAR_FEED_CACHE_ENTRIES)
+
+
+def hash_calendar_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _set_token_hash(db: Session, user_id: int, token_hash):
+    db.query(models.User).filter(models.User.id == user_id).update(
+        {"calendar_token_hash": token_hash}, synchronize_session=False
+    )
+    db.commit()
+
+
+@router.post("/token")
+def rotate_calendar_token(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_identity),
+):
+    """
+    Create the user's calendar feed URL, or replace it (the old URL stops working).
+    Only a hash is stored, so the URL is shown once; rotate to get a new one.
+    """
+    token = secrets.token_urlsafe(32)
+    _set_token_hash(db, current_user.id, hash_calendar_token(token))
+    return {
+        "message": "Calendar feed URL created. Subscribe to it from Google, Apple or Outlook Calendar.",
+        "calendar_url": str(request.url_for("calendar_feed", token=token)),
+    }
+
+
+@router.delete("/token")
+def revoke_calendar_token(
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_identity),
+):
+    _set_token_hash(db, current_user.id, None)
+    return {"message": "Calendar feed disabled."}
+
+
+@router.get("/{token}.ics", name="calendar_feed")
+def calendar_feed(token: str, request: Request, db: Session = Depends(get_db)):
+    """
+    Public ICS feed of every application with an interview date; the secret
+    token in the URL is the credential. Calendar clients poll this often, so
+    a poll with a current ETag costs one indexed query and returns 304.
+    """
+    owner = (
+        db.query(models.User.id, models.CollectionVersion.version)
+        .outerjoin(
+            models.CollectionVersion,
+            and_(
+                models.CollectionVersion.user_id == models.User.id,
+                models.CollectionVersion.collection == INTERVIEWS_COLLECTION,
+            ),
+        )
+        .filter(models.User.calendar_token_hash == hash_calendar_token(token))
+        .first()
+    )
+    if owner is None:
+        raise HTTPException(status_code=404, detail="Calendar not found")
+
+    version = owner.version or 0
+    etag = weak_etag(owner.id, INTERVIEWS_COLLECTION, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    cache_key = f"{owner.id}:{version}"
+    feed = feed_cache.get(cache_key, None)
+    if feed is None:
+        interviews = (
+            db.query(
+                models.Application.id,
+                models.Application.job_title,
+                models.Application.company,
+                models.Application.interview_date_utc,
+            )
+            .filter(
+                models.Application.user_id == owner.id,
+                models.Application.interview_date_utc != None,
+            )
+            .order_by(models.Application.interview_date_utc)
+            .all()
+        )
+        feed = make_ics_feed(interviews)
+        feed_cache.set(cache_key, feed)
+
+    response = Response(content=feed, media_type=ICS_MEDIA_TYPE)
+    set_etag(response, etag)
+    return response
@@ -1,12 +1,12 @@
 import time, hashlib
 from fastapi import APIRouter, Depends
-from app.utils.utils import get_current_user
+from app.utils.utils import get_current_identity
 import cloudinary
 
 router = APIRouter(prefix="/cloudinary", tags=["Cloudinary"])
 
 @router.get("/signature")
-def get_upload_signature(current_user=Depends(get_current_user)):
+def get_upload_signature(current_user=Depends(get_current_identity)):
     timestamp = int(time.time())
     params = {
         "timestamp": timestamp,
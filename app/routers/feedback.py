@@ -1,9 +1,13 @@
 from fastapi import APIRouter, Depends, UploadFile, HTTPException, Form
-from app import database, models
+from app import models
+from app.database import get_db
 from app.api.groq_client import analyze_resume_with_groq
 from app.core.logger import get_logger
-from app.utils.pdf_utils import extract_keywords, extract_resume_text
-from app.utils.utils import get_current_user
+from app.utils.pdf_utils import extract_keywords
+from app.utils.resume_extraction import ExtractionTimeout, extract_resume_text_async
+from app.utils.identity import UserSnapshot
+from app.utils.process_pool import PoolSaturated
+from app.utils.utils import get_current_identity
 import io
 import re
 
@@ -16,18 +20,12 @@ MAX_FILE_SIZE_MB = 2
 MAX_FILE_SIZE = MAX_FILE_SIZE_MB * 1024 * 1024 
 
 
-def get_db():
-    db = database.SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
 
 
 @router.post("/resume/extract")
 async def extract_resume(
     resume: UploadFile,
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_identity),
 
     ):
     file_bytes = await resume.read()
@@ -42,7 +40,11 @@ async def extract_resume(
             detail=f"File too large. Maximum allowed size is {MAX_FILE_SIZE_MB} MB."
         )
 
-    extracted_text = extract_resume_text(file_bytes, resume.content_type, resume.filename)
+    try:
+        extracted_text = await extract_resume_text_async(file_bytes, resume.content_type, resume.filename)
+    except ExtractionTimeout as e:
+        logger.error(str(e))
+        raise HTTPException(status_code=422, detail="Timed out extracting text from file.")
 
     if not extracted_text:
         logger.error(f"Failed to extract text from: {resume.filename}")
@@ -66,7 +68,7 @@ async def extract_resume(
 async def analyze_resume(
     resume: UploadFile,
     job_description: str = Form(...),
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_identity),
 
     ):
     """
@@ -86,9 +88,12 @@ async def analyze_resume(
             )
 
         # ✅ Extract text
-        resume_text = extract_resume_text(
-            file_bytes, resume.content_type, resume.filename
-        )
+        try:
+            resume_text = await extract_resume_text_async(
+                file_bytes, resume.content_type, resume.filename
+            )
+        except ExtractionTimeout:
+            raise HTTPException(status_code=422, detail="Timed out extracting text from resume")
         if not resume_text:
             raise HTTPException(status_code=400, detail="Could not extract text from resume")
 
@@ -101,6 +106,9 @@ async def analyze_resume(
             "analysis": insights,
         }
 
+    except (HTTPException, PoolSaturated):
+        # already the right response (PoolSaturated becomes a 503 in main.py)
+        raise
     except Exception as e:
         logger.exception("Resume analysis failed")
         raise HTTPException(status_code=500, detail=str(e))
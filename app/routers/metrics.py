@@ -0,0 +1,65 @@
+import os
+import secrets
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session
+
+from app.database import checkout_stats, get_db, pool_status
+from app.routers.calendar import feed_cache
+from app.utils.cache import response_cache
+from app.utils.mail import get_mail_transport
+from app.utils.outbox import outbox_stats
+from app.utils.passwords import password_pool
+from app.utils.resume_extraction import extraction_pool
+from app.utils.scheduler import scheduler_status
+from app.utils.tokens import revoked_families, verified_token_cache
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+# operators and scrapers send this as a bearer token; unset, the endpoints are off
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+
+def require_metrics_token(request: Request):
+    """
+    Metrics are for operators (or a scraper), not the public API. The client
+    address is no use here: behind a reverse proxy every caller is 127.0.0.1.
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if not METRICS_TOKEN or scheme.lower() != "bearer" or not secrets.compare_digest(token, METRICS_TOKEN):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+@router.get("/cache", dependencies=[Depends(require_metrics_token)])
+def cache_metrics():
+    return {
+        "response_cache": response_cache.stats(),
+        "verified_tokens": {"entries": len(verified_token_cache), **verified_token_cache.stats.as_dict()},
+        "revoked_token_families": len(revoked_families),
+        "calendar_feeds": {"entries": len(feed_cache), **feed_cache.stats.as_dict()},
+    }
+
+
+@router.get("/db", dependencies=[Depends(require_metrics_token)])
+def db_metrics():
+    return {"pool": pool_status(), "checkouts": checkout_stats.as_dict()}
+
+
+@router.get("/workers", dependencies=[Depends(require_metrics_token)])
+def worker_metrics():
+    return {"password_hasher": password_pool.stats(), "resume_extractor": extraction_pool.stats()}
+
+
+@router.get("/mail", dependencies=[Depends(require_metrics_token)])
+def mail_metrics():
+    return {"smtp_pool": get_mail_transport().stats()}
+
+
+@router.get("/outbox", dependencies=[Depends(require_metrics_token)])
+def outbox_metrics(db: Session = Depends(get_db)):
+    return {"email_outbox": outbox_stats(db)}
+
+
+@router.get("/scheduler", dependencies=[Depends(require_metrics_token)])
+def scheduler_metrics():
+    return {"scheduler": scheduler_status()}
@@ -1,21 +1,19 @@
-from fastapi import APIRouter
-from app import database
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
-from app import models, database
+from app import models
+from app.database import get_db
 from app.schemas import AddResumeRequest
-from app.utils.utils import get_current_user
+from fastapi.encoders import jsonable_encoder
+from app.utils.cache import response_cache
+from app.utils.counters import RESUMES_COLLECTION, bump_collection_version, get_collection_version
+from app.utils.etag import etag_matches, not_modified, set_etag, weak_etag
+from app.utils.identity import UserSnapshot
+from app.utils.utils import get_current_identity
 import cloudinary.uploader
 
 
 router = APIRouter(prefix="/resume", tags=["Resume"])
 
-def get_db():
-    db = database.SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
 
 
 
@@ -23,7 +21,7 @@ def get_db():
 def upload_resume(
     resume_data: AddResumeRequest,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_identity),
 ):
     existing_resumes = db.query(models.Resume).filter(models.Resume.user_id == current_user.id).count()
 
@@ -50,6 +48,7 @@ def upload_resume(
     )
 
     db.add(new_resume)
+    bump_collection_version(db, current_user.id, RESUMES_COLLECTION)
     db.commit()
     db.refresh(new_resume)
 
@@ -67,7 +66,7 @@ def upload_resume(
 def delete_resume(
     resume_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_identity),
 ):
     """
     Delete a resume (and also remove it from Cloudinary).
@@ -88,20 +87,40 @@ def delete_resume(
 
     # Delete from DB
     db.delete(resume)
+    bump_collection_version(db, current_user.id, RESUMES_COLLECTION)
     db.commit()
 
     return {"message": "Resume deleted successfully"}
 
 
 @router.get("/my-resumes")
-def list_resumes(db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+def list_resumes(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_identity),
+):
+    version = get_collection_version(db, current_user.id, RESUMES_COLLECTION)
+    etag = weak_etag(current_user.id, RESUMES_COLLECTION, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    cache_key = response_cache.key(current_user.id, RESUMES_COLLECTION, "my-resumes")
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     resumes = db.query(models.Resume).filter(models.Resume.user_id == current_user.id).all()
     if not resumes:
-        return {"message": "You have no resume."}
-    return {"resumes": resumes}
+        payload = {"message": "You have no resume."}
+    else:
+        payload = {"resumes": jsonable_encoder(resumes)}
+    response_cache.set(cache_key, payload)
+    return payload
 
 @router.get("/my-resumes/{resume_id}")
-def get_resume(resume_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+def get_resume(resume_id: int, db: Session = Depends(get_db), current_user: UserSnapshot = Depends(get_current_identity)):
     resume = db.query(models.Resume).filter(
         models.Resume.id == resume_id
     ).first()
@@ -1,36 +1,49 @@
 from app.config import cloudinary
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, UploadFile
 from sqlalchemy.orm import Session
 
-from app import database, models
+from app import models
+from app.database import get_db
 from app.schemas import ProfileUpdateRequest
-from app.utils.utils import get_current_user
+from app.utils.cache import invalidate_on_commit
+from app.utils.counters import APPLICATIONS_COLLECTION
+from app.utils.etag import etag_matches, not_modified, set_etag, weak_etag
+from app.utils.identity import UserSnapshot, invalidate_identity_on_commit
+from app.utils.interview import sync_user_reminders
+from app.utils.utils import get_current_identity, get_current_user
 
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
-def get_db():
-    db = database.SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
         
 @router.get("/user-profile")
 def my_profile(
+     request: Request,
+     response: Response,
      db: Session = Depends(get_db),
-     current_user: models.User = Depends(get_current_user)
+     current_user: UserSnapshot = Depends(get_current_identity)
 ):
-     user = (
-          db.query(models.User)
+     # from the row itself: the cached identity may be stale on other workers
+     version = (
+          db.query(models.User.updated_at)
           .filter(
                models.User.id == current_user.id
           )
           .first()
      )
+     if not version:
+        raise HTTPException(status_code=404, detail="User detail not found")
+
+     etag = weak_etag(current_user.id, version.updated_at)
+     if etag_matches(request, etag):
+          return not_modified(etag)
+     set_etag(response, etag)
+
+     # full row only for a 200
+     user = db.query(models.User).filter(models.User.id == current_user.id).first()
      if not user:
         raise HTTPException(status_code=404, detail="User detail not found")
-     
+
      return {
           "data": user
      }
@@ -40,7 +53,7 @@ def my_profile(
 def save_profile_picture(
     payload: dict,
     db: Session = Depends(get_db),
-    current_user=Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_identity)
 ):
     new_url = payload.get("url")
     if not new_url:
@@ -62,6 +75,7 @@ def save_profile_picture(
     user = db.query(models.User).filter(models.User.id == current_user.id).first()
      # update the user
     user.profile_picture = new_url
+    invalidate_identity_on_commit(db, user.id)
     db.commit()
     db.refresh(user)
    
@@ -80,6 +94,11 @@ def edit_profile(
      update_data = profile_data.dict(exclude_unset=True)
      for field, value in update_data.items():
           setattr(current_user, field, value)
+     if "timezone" in update_data:
+          sync_user_reminders(db, current_user.id, current_user.timezone)
+          # upcoming-interview text is rendered in the user's timezone
+          invalidate_on_commit(db, current_user.id, APPLICATIONS_COLLECTION)
+     invalidate_identity_on_commit(db, current_user.id)
      db.commit()
      db.refresh(current_user)   
      
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, HttpUrl
 from datetime import date, datetime
-from typing import Optional
+from typing import List, Optional
 
 from sqlalchemy import Enum
 
@@ -44,6 +44,23 @@ class UpdateApplicationRequest(BaseModel):
     interview_date: Optional[datetime] = None
     interview_timezone: Optional[str] = None
     
+class ApplicationFilter(BaseModel):
+    status: Optional[str] = None
+    applied_from: Optional[datetime] = None
+    applied_to: Optional[datetime] = None
+
+
+class BulkStatusUpdateRequest(BaseModel):
+    ids: Optional[List[int]] = None
+    filter: Optional[ApplicationFilter] = None
+    status: str
+
+
+class BulkDeleteRequest(BaseModel):
+    ids: Optional[List[int]] = None
+    filter: Optional[ApplicationFilter] = None
+
+    
 class ProfileUpdateRequest(BaseModel):
     username: Optional[str] = None
     email: Optional[str] = None
@@ -0,0 +1,50 @@
+import os
+import tempfile
+
+# Point the app at a throwaway SQLite file before app.database builds its engine.
+# Set TEST_DATABASE_URL to run the suite against another database.
+os.environ["DATABASE_URL"] = os.getenv(
+    "TEST_DATABASE_URL",
+    "sqlite:///" + os.path.join(tempfile.gettempdir(), "job_tracker_test.db"),
+)
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("REFRESH_SECRET_KEY", "test-refresh-secret-key")
+
+import pytest
+
+from app import models
+from app.database import Base, SessionLocal, engine
+from app.utils.utils import create_access_token
+
+
+@pytest.fixture(scope="session", autouse=True)
+def create_schema():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def make_user(db):
+    """
+    Create a user and return (user, auth headers).
+    """
+    def _make_user(email: str, timezone: str = "Africa/Lagos"):
+        user = models.User(username=email.split("@")[0], email=email, password_hash="x", timezone=timezone)
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        token = create_access_token({"sub": str(user.id)})
+        return user, {"Authorization": f"Bearer {token}"}
+
+    return _make_user
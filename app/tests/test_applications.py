@@ -0,0 +1,357 @@
+# app/tests/test_applications.py
+import base64
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+
+from app import models
+from app.main import app
+from app.utils.counters import (
+    APPLICATIONS_COLLECTION,
+    get_collection_version,
+    get_status_counts,
+    reconcile_status_counters,
+)
+
+client = TestClient(app)
+
+
+def test_create_and_update_echo_the_deferred_text_columns(make_user):
+    _, headers = make_user("echo-notes@example.com")
+    created = client.post(
+        "/applications/add-new-application",
+        json={
+            "job_title": "Data Engineer",
+            "company": "Initech",
+            "job_link": "https://example.com/job",
+            "notes": "Referred by Sam",
+            "job_description": "Build pipelines",
+        },
+        headers=headers,
+    )
+    assert created.status_code == 200, created.text
+    application = created.json()["application"]
+    assert application["notes"] == "Referred by Sam"
+    assert application["job_description"] == "Build pipelines"
+
+    updated = client.patch(
+        f"/applications/my-applications/{application['id']}",
+        json={"notes": "Second round booked"},
+        headers=headers,
+    )
+    assert updated.status_code == 200, updated.text
+    assert updated.json()["application"]["notes"] == "Second round booked"
+    assert updated.json()["application"]["job_description"] == "Build pipelines"
+
+
+def actual_counts(db, user_id):
+    return {
+        status.value: count
+        for status, count in db.query(models.Application.status, func.count(models.Application.id))
+        .filter(models.Application.user_id == user_id)
+        .group_by(models.Application.status)
+    }
+
+
+def stored_counts(db, user_id):
+    db.expire_all()
+    return {status: count for status, count in get_status_counts(db, user_id).items() if count}
+
+
+def add(headers, title, status="Applied", **extra):
+    response = client.post(
+        "/applications/add-new-application",
+        json={"job_title": title, "company": "Acme", "job_link": "https://example.com", "status": status, **extra},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["application"]["id"]
+
+
+def test_status_counters_follow_every_write(db, make_user):
+    user, headers = make_user("counters@example.com")
+    first = add(headers, "One")
+    second = add(headers, "Two")
+    add(headers, "Three", status="Offer")
+    assert stored_counts(db, user.id) == actual_counts(db, user.id) == {"Applied": 2, "Offer": 1}
+
+    client.patch(f"/applications/my-applications/{first}", json={"status": "Interview"}, headers=headers)
+    client.delete(f"/applications/my-applications/{second}", headers=headers)
+    assert stored_counts(db, user.id) == actual_counts(db, user.id) == {"Interview": 1, "Offer": 1}
+    assert client.get("/applications/stats", headers=headers).json()["data"] == {
+        "applied": 0, "interview": 1, "offer": 1, "rejected": 0,
+    }
+
+
+def test_reconcile_repairs_drifted_counters(db, make_user):
+    user, headers = make_user("counter-drift@example.com")
+    first = add(headers, "One")
+    add(headers, "Two")
+    # a write that bypassed the counters
+    db.query(models.Application).filter(models.Application.id == first).delete(synchronize_session=False)
+    db.commit()
+
+    drift = [row for row in reconcile_status_counters(db) if row["user_id"] == user.id]
+    assert drift == [{"user_id": user.id, "status": "Applied", "expected": 1, "stored": 2}]
+    assert stored_counts(db, user.id) == {"Applied": 1}
+    assert not [row for row in reconcile_status_counters(db) if row["user_id"] == user.id]
+
+
+def test_bulk_status_update_is_scoped_and_keeps_counters(db, make_user):
+    user, headers = make_user("bulk-status@example.com")
+    other, other_headers = make_user("bulk-status-other@example.com")
+    first = add(headers, "One", status="Interview")
+    second = add(headers, "Two")
+    add(headers, "Three")
+    foreign = add(other_headers, "Theirs")
+    db.query(models.Application).filter(models.Application.id == first).update(
+        {"interview_date": datetime(2030, 1, 1, 9), "interview_timezone": "Africa/Lagos"}
+    )
+    db.commit()
+
+    response = client.patch(
+        "/applications/bulk/status", json={"ids": [first, second, foreign], "status": "Rejected"}, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["updated"] == 2
+
+    db.expire_all()
+    left_interview = db.get(models.Application, first)
+    assert left_interview.status == models.ApplicationStatus.rejected
+    assert left_interview.interview_date is None and left_interview.interview_timezone is None
+    assert db.get(models.Application, foreign).status == models.ApplicationStatus.applied
+    assert stored_counts(db, user.id) == actual_counts(db, user.id) == {"Applied": 1, "Rejected": 2}
+    assert stored_counts(db, other.id) == {"Applied": 1}
+
+    response = client.patch(
+        "/applications/bulk/status", json={"filter": {"status": "Applied"}, "status": "Offer"}, headers=headers
+    )
+    assert response.json()["updated"] == 1
+    assert stored_counts(db, user.id) == actual_counts(db, user.id) == {"Offer": 1, "Rejected": 2}
+    assert db.get(models.Application, foreign).status == models.ApplicationStatus.applied
+
+
+def test_bulk_delete_is_scoped_and_keeps_counters(db, make_user):
+    user, headers = make_user("bulk-delete@example.com")
+    other, other_headers = make_user("bulk-delete-other@example.com")
+    first = add(headers, "One")
+    add(headers, "Two", status="Offer")
+    add(headers, "Three", status="Offer")
+    foreign = add(other_headers, "Theirs", status="Offer")
+
+    response = client.post("/applications/bulk/delete", json={"ids": [first, foreign]}, headers=headers)
+    assert response.json()["deleted"] == 1
+    assert db.get(models.Application, foreign) is not None
+
+    response = client.post("/applications/bulk/delete", json={"filter": {"status": "Offer"}}, headers=headers)
+    assert response.json()["deleted"] == 2
+    assert actual_counts(db, user.id) == stored_counts(db, user.id) == {}
+    assert stored_counts(db, other.id) == {"Offer": 1}
+
+    assert client.post("/applications/bulk/delete", json={}, headers=headers).status_code == 400
+
+
+def test_bulk_requests_reject_an_empty_filter(db, make_user):
+    user, headers = make_user("bulk-empty-filter@example.com")
+    add(headers, "One")
+    add(headers, "Two", status="Offer")
+
+    for body in ({"filter": {}}, {"filter": {"status": None}}):
+        assert client.post("/applications/bulk/delete", json=body, headers=headers).status_code == 400
+        response = client.patch("/applications/bulk/status", json={**body, "status": "Rejected"}, headers=headers)
+        assert response.status_code == 400
+    assert actual_counts(db, user.id) == {"Applied": 1, "Offer": 1}
+
+
+def upload(headers, filename, content):
+    return client.post("/applications/import", files={"file": (filename, content.encode())}, headers=headers)
+
+
+@pytest.mark.parametrize(
+    "filename, content",
+    [
+        (
+            "jobs.csv",
+            "job_title,company,job_link,status,notes\n"
+            "Backend Engineer,Acme,https://example.com/1,Applied,\n"
+            "SRE,Globex,https://example.com/2,Offer,Referred\n",
+        ),
+        (
+            "jobs.json",
+            json.dumps([
+                {"job_title": "Backend Engineer", "company": "Acme", "job_link": "https://example.com/1"},
+                {"job_title": "SRE", "company": "Globex", "job_link": "https://example.com/2", "status": "Offer", "notes": "Referred"},
+            ]),
+        ),
+        (
+            "jobs.ndjson",
+            '{"job_title": "Backend Engineer", "company": "Acme", "job_link": "https://example.com/1"}\n'
+            '{"job_title": "SRE", "company": "Globex", "job_link": "https://example.com/2", "status": "Offer", "notes": "Referred"}\n',
+        ),
+    ],
+)
+def test_import_formats_bump_counters_and_version(db, make_user, filename, content):
+    user, headers = make_user(f"import-{filename}@example.com")
+    response = upload(headers, filename, content)
+    assert response.status_code == 200, response.text
+    assert response.json()["imported"] == 2 and response.json()["failed"] == 0
+
+    rows = {row.job_title: row for row in db.query(models.Application).filter(models.Application.user_id == user.id)}
+    assert rows["SRE"].company == "Globex" and rows["SRE"].notes == "Referred"
+    assert rows["Backend Engineer"].notes is None
+    assert stored_counts(db, user.id) == actual_counts(db, user.id) == {"Applied": 1, "Offer": 1}
+    assert get_collection_version(db, user.id, APPLICATIONS_COLLECTION) == 1
+
+
+def test_import_reports_invalid_rows_and_keeps_the_rest(db, make_user):
+    user, headers = make_user("import-errors@example.com")
+    content = "\n".join([
+        '{"job_title": "Backend Engineer", "company": "Acme", "job_link": "https://example.com/1"}',
+        '{"job_title": "No link", "company": "Acme"}',
+        '{"job_title": "SRE", "company": "Globex", "job_link": "https://example.com/2", "status": "Hired"}',
+        '["not", "an", "object"]',
+    ])
+    response = upload(headers, "jobs.ndjson", content)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["imported"], body["failed"]) == (1, 3)
+    assert [error["row"] for error in body["errors"]] == [2, 3, 4]
+    assert "job_link" in body["errors"][0]["errors"][0]
+    assert body["errors"][1]["errors"] == ["status: invalid status Hired"]
+    assert stored_counts(db, user.id) == {"Applied": 1}
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        '[{"job_title": "A", "company": "Acme", "job_link": "https://example.com"},'
+        ' {"job_title": "B", "company": "Acme", "job_link": "https://example.com"}',
+        '[{"job_title": "A", "company": "Acme", "job_link": "https://example.com"},]',
+        '[{"job_title": "A", "company": "Acme", "job_link": "https://example.com"}] trailing',
+    ],
+    ids=["truncated", "trailing-comma", "trailing-data"],
+)
+def test_malformed_json_import_is_rejected_whole(db, make_user, content):
+    user, headers = make_user(f"import-malformed-{len(content)}@example.com")
+    response = upload(headers, "jobs.json", content)
+    assert response.status_code == 400
+    assert actual_counts(db, user.id) == stored_counts(db, user.id) == {}
+    assert get_collection_version(db, user.id, APPLICATIONS_COLLECTION) == 0
+
+
+def walk(headers, **params):
+    ids, cursor = [], None
+    while True:
+        query = {**params, **({"after": cursor} if cursor else {})}
+        response = client.get("/applications/my-applications", params=query, headers=headers)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        ids.extend(row["id"] for row in page["data"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_list_cursor_visits_every_row_once(make_user):
+    _, headers = make_user("cursor-walk@example.com")
+    _, other_headers = make_user("cursor-walk-other@example.com")
+    created = [add(headers, f"Job {n}") for n in range(7)]
+    add(other_headers, "Theirs")
+
+    first = client.get("/applications/my-applications", params={"limit": 3}, headers=headers).json()
+    assert [row["id"] for row in first["data"]] == sorted(created, reverse=True)[:3]
+    assert walk(headers, limit=3) == sorted(created, reverse=True)
+    assert walk(headers, limit=7) == sorted(created, reverse=True)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-a-cursor!!",
+        base64.urlsafe_b64encode(b"abc").decode().rstrip("="),
+        base64.urlsafe_b64encode(b"0").decode().rstrip("="),
+        base64.urlsafe_b64encode(b"-3").decode().rstrip("="),
+        "%%%",
+    ],
+)
+def test_list_rejects_invalid_cursors(make_user, request, cursor):
+    _, headers = make_user(f"{request.node.name}@example.com")
+    response = client.get("/applications/my-applications", params={"after": cursor}, headers=headers)
+    assert response.status_code == 400
+
+
+def test_list_filters_hold_across_pages(make_user):
+    _, headers = make_user("cursor-filters@example.com")
+    expected = []
+    for day in range(1, 9):
+        status = "Offer" if day % 2 else "Applied"
+        application_id = add(headers, f"Job {day}", status=status, applied_date=f"2030-01-0{day}T12:00:00")
+        if status == "Offer" and day >= 3:
+            expected.append(application_id)
+
+    ids = walk(headers, limit=1, status="Offer", applied_from="2030-01-03T00:00:00")
+    assert ids == sorted(expected, reverse=True)
+    assert walk(headers, limit=2, status="Applied", applied_to="2030-01-04T23:59:59") == walk(
+        headers, limit=50, status="Applied", applied_to="2030-01-04T23:59:59"
+    )
+
+
+def test_list_fields_projection(make_user):
+    _, headers = make_user("list-fields@example.com")
+    add(headers, "Projected", notes="private notes")
+
+    row = client.get("/applications/my-applications", headers=headers).json()["data"][0]
+    assert "notes" not in row and "job_description" not in row
+    assert row["job_title"] == "Projected"
+
+    response = client.get("/applications/my-applications", params={"fields": "job_title,notes"}, headers=headers)
+    assert response.json()["data"] == [{"id": row["id"], "job_title": "Projected", "notes": "private notes"}]
+    assert client.get("/applications/my-applications", params={"fields": "password"}, headers=headers).status_code == 400
+
+
+EXPORT_HEADER = [
+    "id", "job_title", "company", "status", "applied_date", "notes", "job_description", "job_link",
+    "interview_date_utc", "interview_date", "interview_timezone", "follow_up_date", "created_at", "updated_at",
+]
+
+
+def test_export_ndjson_and_csv_are_scoped_to_the_caller(make_user):
+    _, headers = make_user("export@example.com")
+    _, other_headers = make_user("export-other@example.com")
+    first = add(headers, "Backend Engineer", notes="Referred, twice")
+    second = add(headers, "SRE", status="Offer")
+    add(other_headers, "Theirs")
+
+    response = client.get("/applications/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [first, second]
+    assert list(rows[0]) == EXPORT_HEADER
+    assert (rows[0]["notes"], rows[1]["status"]) == ("Referred, twice", "Offer")
+
+    response = client.get("/applications/export", params={"format": "csv"}, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="applications.csv"' in response.headers["content-disposition"]
+    header, *records = list(csv.reader(io.StringIO(response.text)))
+    assert header == EXPORT_HEADER
+    assert [(int(record[0]), record[1], record[5]) for record in records] == [
+        (first, "Backend Engineer", "Referred, twice"),
+        (second, "SRE", ""),
+    ]
+
+    offers = client.get("/applications/export", params={"status": "Offer"}, headers=headers).text.splitlines()
+    assert [json.loads(line)["id"] for line in offers] == [second]
+
+
+def test_empty_export(make_user):
+    _, headers = make_user("export-empty@example.com")
+    assert client.get("/applications/export", headers=headers).text == ""
+    response = client.get("/applications/export", params={"format": "csv"}, headers=headers)
+    assert list(csv.reader(io.StringIO(response.text))) == [EXPORT_HEADER]
@@ -0,0 +1,59 @@
+# app/tests/test_calendar.py
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+
+def feed_path(headers):
+    response = client.post("/calendar/token", headers=headers)
+    assert response.status_code == 200
+    return urlparse(response.json()["calendar_url"]).path
+
+
+def test_feed_lists_interviews_and_revalidates_by_version(make_user):
+    user, headers = make_user("calendar-feed@example.com")
+    created = client.post(
+        "/applications/add-new-application",
+        json={"job_title": "Platform Engineer", "company": "Acme", "job_link": "https://example.com", "status": "Interview"},
+        headers=headers,
+    )
+    application_id = created.json()["application"]["id"]
+    day = (datetime.utcnow() + timedelta(days=5)).date()
+    response = client.post(
+        f"/applications/{application_id}/set-interview",
+        json={"interview_date": f"{day}T10:00", "timezone": "UTC"},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+
+    path = feed_path(headers)
+    feed = client.get(path)
+    assert feed.status_code == 200
+    assert feed.headers["content-type"].startswith("text/calendar")
+    assert b"Platform Engineer" in feed.content
+    etag = feed.headers["ETag"]
+    assert client.get(path, headers={"If-None-Match": etag}).status_code == 304
+
+    # a title change shows up in the feed, so it has to invalidate it
+    client.patch(f"/applications/my-applications/{application_id}", json={"job_title": "Staff Engineer"}, headers=headers)
+    feed = client.get(path, headers={"If-None-Match": etag})
+    assert feed.status_code == 200
+    assert feed.headers["ETag"] != etag
+    assert b"Staff Engineer" in feed.content and b"Platform Engineer" not in feed.content
+
+
+def test_rotating_or_revoking_the_token_disables_the_old_url(make_user):
+    user, headers = make_user("calendar-token@example.com")
+    old_path = feed_path(headers)
+    new_path = feed_path(headers)
+    assert client.get(old_path).status_code == 404
+    assert client.get(new_path).status_code == 200
+
+    assert client.delete("/calendar/token", headers=headers).status_code == 200
+    assert client.get(new_path).status_code == 404
+    assert client.get("/calendar/not-a-token.ics").status_code == 404
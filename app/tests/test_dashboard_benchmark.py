@@ -0,0 +1,106 @@
+# app/tests/test_dashboard_benchmark.py
+import time
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import models
+from app.database import engine
+from app.main import app
+from app.utils.cache import response_cache
+from app.utils.counters import bump_status_counts
+
+TOTAL_APPLICATIONS = 300
+ROUNDS = 50
+
+
+def seed_applications(db, user):
+    statuses = list(models.ApplicationStatus)
+    now = datetime.utcnow()
+    deltas = {}
+    for i in range(TOTAL_APPLICATIONS):
+        status = statuses[i % len(statuses)]
+        application = models.Application(
+            user_id=user.id,
+            job_title=f"Engineer {i}",
+            company=f"Company {i}",
+            status=status,
+            job_link="https://example.com",
+            created_at=now - timedelta(days=3, minutes=i),
+        )
+        if status == models.ApplicationStatus.interview:
+            application.interview_date = now + timedelta(days=1 + i)
+            application.interview_date_utc = now + timedelta(days=1 + i)
+            application.interview_timezone = "Africa/Lagos"
+        db.add(application)
+        deltas[status] = deltas.get(status, 0) + 1
+    bump_status_counts(db, user.id, deltas)
+    db.commit()
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements = 0
+        self.checkouts = 0
+
+    def on_execute(self, *args):
+        self.statements += 1
+
+    def on_checkout(self, *args):
+        self.checkouts += 1
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self.on_execute)
+        event.listen(engine.pool, "checkout", self.on_checkout)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "before_cursor_execute", self.on_execute)
+        event.remove(engine.pool, "checkout", self.on_checkout)
+
+
+def three_calls(client, headers):
+    return {
+        "stats": client.get("/applications/stats", headers=headers).json(),
+        "recent": client.get("/applications/recent", headers=headers).json(),
+        "upcoming_interview": client.get("/applications/upcoming-interview", headers=headers).json(),
+    }
+
+
+def test_dashboard_matches_individual_endpoints_and_is_cheaper(db, make_user, monkeypatch):
+    # measure the database work, not the response cache
+    monkeypatch.setattr(response_cache, "get", lambda *args, **kwargs: None)
+    user, headers = make_user("dashboard@example.com")
+    seed_applications(db, user)
+    client = TestClient(app)
+
+    response = client.get("/applications/dashboard", headers=headers)
+    # auth and the handler share the request's one session
+    assert response.headers["X-DB-Checkouts"] == "1"
+    dashboard = response.json()
+    assert dashboard == three_calls(client, headers)
+    assert len(dashboard["recent"]) == 5
+    assert dashboard["upcoming_interview"]["message"] is not None
+
+    with QueryCounter() as separate:
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            three_calls(client, headers)
+        separate_elapsed = time.perf_counter() - start
+
+    with QueryCounter() as combined:
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            client.get("/applications/dashboard", headers=headers)
+        combined_elapsed = time.perf_counter() - start
+
+    print(
+        f"\n3 calls:   {separate.statements / ROUNDS:.1f} statements, "
+        f"{separate.checkouts / ROUNDS:.1f} checkouts, {separate_elapsed / ROUNDS * 1000:.2f} ms per page view"
+        f"\ndashboard: {combined.statements / ROUNDS:.1f} statements, "
+        f"{combined.checkouts / ROUNDS:.1f} checkouts, {combined_elapsed / ROUNDS * 1000:.2f} ms per page view"
+    )
+
+    assert combined.statements < separate.statements
+    assert combined.checkouts < separate.checkouts
@@ -0,0 +1,49 @@
+# app/tests/test_leader.py
+from datetime import datetime, timedelta
+
+from app import models
+from app.utils.leader import LeaderElector
+
+
+def expire_lease(db, name):
+    db.query(models.SchedulerLease).filter(models.SchedulerLease.name == name).update(
+        {"expires_at": datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db.commit()
+
+
+def test_only_one_candidate_holds_the_lease():
+    first = LeaderElector("test-acquire", ttl_seconds=30)
+    second = LeaderElector("test-acquire", ttl_seconds=30)
+    assert first.try_acquire()
+    assert not second.try_acquire()
+    assert first.try_acquire()  # the holder renews
+
+
+def test_expired_lease_is_taken_over(db):
+    events = []
+    first = LeaderElector("test-expiry", ttl_seconds=30, on_demoted=lambda: events.append("first demoted"))
+    second = LeaderElector("test-expiry", ttl_seconds=30, on_elected=lambda: events.append("second elected"))
+    first._tick()
+    second._tick()
+    assert first.is_leader and not second.is_leader
+
+    # the leader stalled past its TTL
+    expire_lease(db, "test-expiry")
+    second._tick()
+    first._tick()
+    assert second.is_leader and not first.is_leader
+    assert events == ["second elected", "first demoted"]
+    lease = db.get(models.SchedulerLease, "test-expiry")
+    assert lease.holder == second.holder
+
+
+def test_release_hands_the_lease_over_immediately():
+    first = LeaderElector("test-release", ttl_seconds=30)
+    second = LeaderElector("test-release", ttl_seconds=30)
+    assert first.try_acquire()
+    first.release()
+    assert second.try_acquire()
+    # releasing a lease held by someone else does nothing
+    first.release()
+    assert not first.try_acquire()
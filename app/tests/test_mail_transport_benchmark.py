@@ -0,0 +1,134 @@
+# app/tests/test_mail_transport_benchmark.py
+import smtplib
+import socket
+import socketserver
+import threading
+import time
+
+import pytest
+
+from app.utils.mail import SMTPConnectionPool, build_message
+
+EMAILS = 60
+# stands in for the TCP connect + STARTTLS + LOGIN round trips a real provider costs
+HANDSHAKE_DELAY = 0.01
+FROM = "jobs@example.com"
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line: str):
+        self.wfile.write((line + "\r\n").encode("ascii"))
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections.add(self.request)
+            server.opened += 1
+        time.sleep(server.handshake_delay)
+        self.reply("220 stand-in ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                break
+            command = line.decode("ascii", "replace").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.reply("250 stand-in")
+            elif command.startswith(("MAIL", "RCPT", "RSET", "NOOP")):
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                with server.lock:
+                    server.delivered += 1
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                break
+            else:
+                self.reply("502 Command not implemented")
+        with server.lock:
+            server.connections.discard(self.request)
+
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, handshake_delay: float = HANDSHAKE_DELAY):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.handshake_delay = handshake_delay
+        self.lock = threading.Lock()
+        self.connections = set()
+        self.opened = 0
+        self.delivered = 0
+
+    def drop_connections(self):
+        with self.lock:
+            for sock in list(self.connections):
+                sock.shutdown(socket.SHUT_RDWR)
+
+
+@pytest.fixture
+def smtp_server():
+    server = SMTPStandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_pool(server, **kwargs):
+    host, port = server.server_address
+    return SMTPConnectionPool(host, port, starttls=False, **kwargs)
+
+
+def messages(count):
+    return [build_message(f"Reminder {i}", "<p>Interview soon</p>", FROM, f"user{i}@example.com", html=True) for i in range(count)]
+
+
+def test_pooled_transport_outpaces_connection_per_email(smtp_server):
+    host, port = smtp_server.server_address
+
+    # before: what send_mail used to do, one fresh session per email
+    start = time.perf_counter()
+    for msg in messages(EMAILS):
+        with smtplib.SMTP(host, port, timeout=5) as server:
+            server.send_message(msg, from_addr=FROM)
+    before = EMAILS / (time.perf_counter() - start)
+    opened_before = smtp_server.opened
+
+    # after: persistent pooled sessions, sent in batches
+    pool = make_pool(smtp_server, size=2)
+    start = time.perf_counter()
+    batch = messages(EMAILS)
+    for i in range(0, EMAILS, 20):
+        assert pool.send_many(FROM, batch[i:i + 20]) == []
+    after = EMAILS / (time.perf_counter() - start)
+    pool.close()
+
+    print(f"\nconnection per email: {before:.0f} emails/s\npooled transport:     {after:.0f} emails/s")
+    assert smtp_server.delivered == 2 * EMAILS
+    assert smtp_server.opened - opened_before == 1
+    assert after > before
+
+
+def test_pool_health_checks_and_reconnects_dropped_connections(smtp_server):
+    pool = make_pool(smtp_server, size=1, healthcheck_after=3600)
+    pool.send_many(FROM, messages(1))
+
+    # server drops the idle session; the next send reconnects and retries
+    smtp_server.drop_connections()
+    assert pool.send_many(FROM, messages(1)) == []
+    assert pool.stats()["reconnects"] == 1
+
+    # with a zero idle allowance the NOOP probe spots the dead session before sending
+    pool.healthcheck_after = 0
+    smtp_server.drop_connections()
+    assert pool.send_many(FROM, messages(1)) == []
+    stats = pool.stats()
+    assert stats["health_checks"] == 1 and stats["reconnects"] == 1
+    assert stats["connections_opened"] == 3 and stats["sent"] == 3
+    assert smtp_server.delivered == 3
+    pool.close()
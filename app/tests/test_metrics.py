@@ -0,0 +1,34 @@
+# app/tests/test_metrics.py
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routers import metrics
+
+client = TestClient(app)
+
+
+def test_metrics_need_the_configured_token(monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", None)
+    assert client.get("/metrics/db", headers={"Authorization": "Bearer anything"}).status_code == 404
+
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "s3cret")
+    assert client.get("/metrics/db").status_code == 404
+    assert client.get("/metrics/db", headers={"Authorization": "Bearer wrong"}).status_code == 404
+    # a same-host reverse proxy makes every caller look local; that alone is not enough
+    assert client.get("/metrics/db", headers={"X-Forwarded-For": "127.0.0.1"}).status_code == 404
+    response = client.get("/metrics/db", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert "checkouts" in response.json()
+
+
+@pytest.fixture
+def operator():
+    app.dependency_overrides[metrics.require_metrics_token] = lambda: None
+    yield
+    app.dependency_overrides.pop(metrics.require_metrics_token, None)
+
+
+def test_metrics_endpoints_respond(operator):
+    for path in ("/metrics/cache", "/metrics/db", "/metrics/workers", "/metrics/outbox", "/metrics/scheduler"):
+        assert client.get(path).status_code == 200, path
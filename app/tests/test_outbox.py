@@ -0,0 +1,69 @@
+# app/tests/test_outbox.py
+import smtplib
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+
+from app import models
+from app.utils import outbox
+from app.utils.mail import SMTPConnectionPool
+from app.utils.outbox import dispatch_outbox, enqueue_emails
+
+EMAILS = 6
+FAIL_AT = 2
+
+
+class FlakyTransport(SMTPConnectionPool):
+    """
+    The real send_many over a fake connection that dies for good on message `fail_at`.
+    """
+
+    def __init__(self, fail_at=None):
+        super().__init__("localhost", 25)
+        self.fail_at = fail_at
+        self.delivered = []
+
+    @contextmanager
+    def connection(self):
+        yield [None]
+
+    def _send_one(self, holder, from_addr, msg):
+        if len(self.delivered) == self.fail_at:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.delivered.append(msg["To"])
+
+
+@pytest.fixture
+def clean_outbox(db, monkeypatch):
+    monkeypatch.setenv("EMAIL_USER", "jobs@example.com")
+    db.query(models.EmailOutbox).delete()
+    db.commit()
+    yield
+    db.query(models.EmailOutbox).delete()
+    db.commit()
+
+
+def test_connection_loss_retries_only_unsent_messages(db, clean_outbox, monkeypatch):
+    recipients = [f"user{i}@example.com" for i in range(EMAILS)]
+    enqueue_emails(db, [{"to_email": to, "subject": "Hi", "body": "Hello", "dedup_key": to} for to in recipients])
+    db.commit()
+
+    flaky = FlakyTransport(fail_at=FAIL_AT)
+    monkeypatch.setattr(outbox, "get_mail_transport", lambda: flaky)
+    totals = dispatch_outbox(db)
+    assert totals == {"sent": FAIL_AT, "retried": EMAILS - FAIL_AT, "dead": 0}
+    assert flaky.delivered == recipients[:FAIL_AT]
+
+    # make the retries due now and let a healthy connection drain them
+    db.query(models.EmailOutbox).update({"next_attempt_at": datetime.utcnow()})
+    db.commit()
+    healthy = FlakyTransport()
+    monkeypatch.setattr(outbox, "get_mail_transport", lambda: healthy)
+    totals = dispatch_outbox(db)
+    assert totals == {"sent": EMAILS - FAIL_AT, "retried": 0, "dead": 0}
+    assert sorted(healthy.delivered) == recipients[FAIL_AT:]
+
+    rows = db.query(models.EmailOutbox).order_by(models.EmailOutbox.to_email).all()
+    assert all(row.status == models.OutboxStatus.sent for row in rows)
+    assert [row.attempts for row in rows] == [0] * FAIL_AT + [1] * (EMAILS - FAIL_AT)
@@ -0,0 +1,115 @@
+# app/tests/test_password_hashing_benchmark.py
+import asyncio
+import os
+import time
+
+import httpx
+import pytest
+
+from app import models
+from app.main import app
+from app.utils import passwords
+from app.utils.process_pool import BoundedProcessPool
+
+BENCH_ROUNDS = 8
+LOGINS = 24
+PASSWORD = "correct horse battery staple"
+
+
+@pytest.fixture
+def login_user(db):
+    def _login_user(email: str, rounds: int = BENCH_ROUNDS):
+        user = models.User(
+            username=email.split("@")[0],
+            email=email,
+            password_hash=passwords._hash(PASSWORD, rounds),
+        )
+        db.add(user)
+        db.commit()
+        return user
+
+    return _login_user
+
+
+@pytest.fixture
+def use_pool(monkeypatch):
+    pools = []
+
+    def _use_pool(workers: int, max_queue: int = 64):
+        pool = BoundedProcessPool("password_hasher", max_workers=workers, max_queue=max_queue)
+        monkeypatch.setattr(passwords, "password_pool", pool)
+        pools.append(pool)
+        return pool
+
+    yield _use_pool
+    for pool in pools:
+        pool.shutdown(wait=True)
+
+
+def client():
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+async def login(ac, email, password=PASSWORD):
+    return await ac.post("/auth/login", json={"email": email, "password": password})
+
+
+async def login_storm(email):
+    async with client() as ac:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(login(ac, email) for _ in range(LOGINS)))
+        elapsed = time.perf_counter() - start
+    return responses, elapsed
+
+
+def test_login_verifies_and_upgrades_hash_cost(db, login_user, use_pool, monkeypatch):
+    monkeypatch.setattr(passwords, "BCRYPT_ROUNDS", BENCH_ROUNDS)
+    use_pool(1)
+    user = login_user("rehash@example.com", rounds=4)
+
+    async def scenario():
+        async with client() as ac:
+            return await login(ac, user.email, "wrong"), await login(ac, user.email)
+
+    wrong, ok = asyncio.run(scenario())
+    assert wrong.status_code == 400
+    assert ok.status_code == 200
+    db.refresh(user)
+    assert user.password_hash.startswith(f"$2b${BENCH_ROUNDS:02d}$")
+
+
+def test_login_throughput_scales_with_workers(login_user, use_pool, monkeypatch):
+    monkeypatch.setattr(passwords, "BCRYPT_ROUNDS", BENCH_ROUNDS)
+    user = login_user("storm@example.com")
+    cores = os.cpu_count() or 1
+
+    throughput = {}
+    for workers in sorted({1, min(4, cores)}):
+        pool = use_pool(workers)
+        asyncio.run(login_storm(user.email))  # warm the worker processes up
+        responses, elapsed = asyncio.run(login_storm(user.email))
+        assert all(response.status_code == 200 for response in responses)
+        throughput[workers] = LOGINS / elapsed
+        stats = pool.stats()
+        print(
+            f"\n{workers} worker(s): {throughput[workers]:.1f} logins/s, "
+            f"peak queue {stats['peak_queue_depth']}, avg wait {stats['avg_queue_wait_ms']} ms, "
+            f"avg bcrypt {stats['avg_run_ms']} ms"
+        )
+        assert stats["failed"] == 0 and stats["rejected"] == 0
+
+    if cores > 1:
+        assert throughput[min(4, cores)] > throughput[1]
+
+
+def test_saturated_pool_sheds_load_with_503(login_user, use_pool, monkeypatch):
+    monkeypatch.setattr(passwords, "BCRYPT_ROUNDS", BENCH_ROUNDS)
+    pool = use_pool(1, max_queue=0)
+    user = login_user("busy@example.com", rounds=10)
+
+    responses, _ = asyncio.run(login_storm(user.email))
+    codes = [response.status_code for response in responses]
+    assert 200 in codes and 503 in codes
+    busy = next(response for response in responses if response.status_code == 503)
+    assert busy.headers["Retry-After"] == "1"
+    assert pool.stats()["rejected"] == codes.count(503)
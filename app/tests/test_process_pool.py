@@ -0,0 +1,56 @@
+# app/tests/test_process_pool.py
+import asyncio
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.utils.process_pool import BoundedProcessPool
+
+
+# These run inside the worker processes.
+
+def square(x: int) -> int:
+    return x * x
+
+
+def die():
+    os._exit(1)
+
+
+def hang(seconds: float):
+    time.sleep(seconds)
+
+
+@pytest.fixture
+def pool():
+    pool = BoundedProcessPool("test", max_workers=1, max_queue=4)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+@pytest.mark.asyncio
+async def test_pool_recovers_after_a_worker_dies(pool):
+    assert await pool.run(square, 3) == 9
+    with pytest.raises(BrokenProcessPool):
+        await pool.run(die)
+
+    assert await pool.run(square, 4) == 16
+    stats = pool.stats()
+    assert stats["restarts"] == 1
+    assert stats["in_flight"] == 0 and stats["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_timed_out_job_does_not_hold_its_worker(pool):
+    await pool.run(square, 1)  # warm up
+    with pytest.raises(asyncio.TimeoutError):
+        await pool.run(hang, 60, timeout=0.2)
+    stuck = pool.stats()
+
+    # the only worker is still sleeping, yet the next job runs on a fresh one
+    start = time.perf_counter()
+    assert await pool.run(square, 5, timeout=10) == 25
+    assert time.perf_counter() - start < 10
+    assert stuck["timed_out"] == 1 and stuck["restarts"] == 1
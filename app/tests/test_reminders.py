@@ -0,0 +1,165 @@
+# app/tests/test_reminders.py
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import models
+from app.main import app
+from app.utils.interview import schedule_reminders_for_application
+
+client = TestClient(app)
+
+
+def add_application(db, user, status=models.ApplicationStatus.interview, interview_utc=None):
+    application = models.Application(
+        user_id=user.id,
+        job_title="Backend Engineer",
+        company="Acme",
+        status=status,
+        job_link="https://example.com",
+        interview_date_utc=interview_utc,
+        interview_date=interview_utc,
+        interview_timezone="UTC" if interview_utc else None,
+    )
+    db.add(application)
+    db.commit()
+    db.refresh(application)
+    return application
+
+
+def reminders_for(db, application_id):
+    return {
+        row.type: row.scheduled_date
+        for row in db.query(models.Notification).filter(models.Notification.application_id == application_id)
+    }
+
+
+def test_set_interview_schedules_in_the_stored_timezone(db, make_user):
+    user, headers = make_user("set-interview@example.com", timezone="Africa/Lagos")
+    application = add_application(db, user)
+    assert client.get("/auth/me", headers=headers).status_code == 200  # identity cached with Africa/Lagos
+
+    # the user moved to Tokyo through another worker
+    db.query(models.User).filter(models.User.id == user.id).update({"timezone": "Asia/Tokyo"})
+    db.commit()
+
+    day = (datetime.utcnow() + timedelta(days=10)).date()
+    response = client.post(
+        f"/applications/{application.id}/set-interview",
+        json={"interview_date": f"{day}T03:00", "timezone": "UTC"},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+
+    reminders = reminders_for(db, application.id)
+    # 09:00 in Tokyo is 00:00 UTC; in Lagos it would have been 08:00 UTC
+    assert reminders["day_of_9am"] == datetime.combine(day, datetime.min.time())
+    assert reminders["30min_before"] == datetime.combine(day, datetime.min.time()) + timedelta(hours=2, minutes=30)
+
+
+@pytest.mark.parametrize("via", ["add-timezone", "edit-profile"])
+def test_timezone_change_retimes_upcoming_reminders(db, make_user, via):
+    user, headers = make_user(f"retime-{via}@example.com", timezone="Africa/Lagos")
+    interview_utc = datetime.combine((datetime.utcnow() + timedelta(days=10)).date(), datetime.min.time()) + timedelta(hours=12)
+    application = add_application(db, user, interview_utc=interview_utc)
+    schedule_reminders_for_application(db, application, interview_utc, "Africa/Lagos")
+    db.commit()
+    # 09:00 in Lagos is 08:00 UTC
+    assert reminders_for(db, application.id)["day_of_9am"] == interview_utc - timedelta(hours=4)
+
+    if via == "add-timezone":
+        response = client.post("/auth/add-timezone", json={"timezone": "JST"}, headers=headers)
+    else:
+        response = client.patch("/users/edit-profile", json={"timezone": "Asia/Tokyo"}, headers=headers)
+    assert response.status_code == 200, response.text
+
+    db.expire_all()
+    reminders = reminders_for(db, application.id)
+    # 09:00 in Tokyo is 00:00 UTC, same day as the 12:00 UTC interview
+    assert reminders["day_of_9am"] == interview_utc - timedelta(hours=12)
+    assert reminders["30min_before"] == interview_utc - timedelta(minutes=30)
+
+
+def add_reminder(db, application, reminder_type, scheduled_date):
+    notification = models.Notification(
+        user_id=application.user_id,
+        application_id=application.id,
+        type=reminder_type,
+        message="Interview reminder",
+        scheduled_date=scheduled_date,
+        is_sent=False,
+    )
+    db.add(notification)
+    db.commit()
+    return notification.id
+
+
+def outbox_for(db, email):
+    db.expire_all()
+    return db.query(models.EmailOutbox).filter(models.EmailOutbox.to_email == email).all()
+
+
+def is_sent(db, notification_id):
+    db.expire_all()
+    return db.get(models.Notification, notification_id).is_sent
+
+
+def test_sweeper_queues_due_reminders_once(db, make_user):
+    from app.utils.reminders import sweep_due_notifications
+
+    now = datetime.utcnow()
+    user, _ = make_user("sweep-due@example.com")
+    application = add_application(db, user, interview_utc=now + timedelta(hours=2))
+    due = add_reminder(db, application, "day_of_9am", now - timedelta(minutes=1))
+    later = add_reminder(db, application, "30min_before", now + timedelta(minutes=90))
+
+    sweep_due_notifications(db, digest=False)
+    assert is_sent(db, due) and not is_sent(db, later)
+    [email] = outbox_for(db, user.email)
+    assert email.subject == "Reminder: Interview today"
+    assert email.status == models.OutboxStatus.pending
+
+    # a second run finds nothing new to claim
+    sweep_due_notifications(db, digest=False)
+    assert len(outbox_for(db, user.email)) == 1
+
+
+def test_sweeper_skips_stale_reminders(db, make_user):
+    from app.utils.reminders import sweep_due_notifications
+
+    now = datetime.utcnow()
+    user, _ = make_user("sweep-stale@example.com")
+    moved_off = add_application(db, user, status=models.ApplicationStatus.rejected, interview_utc=now + timedelta(hours=2))
+    already_held = add_application(db, user, interview_utc=now - timedelta(hours=1))
+    stale = [
+        add_reminder(db, moved_off, "day_of_9am", now - timedelta(minutes=1)),
+        add_reminder(db, already_held, "30min_before", now - timedelta(minutes=90)),
+    ]
+
+    sweep_due_notifications(db, digest=False)
+    assert all(is_sent(db, notification_id) for notification_id in stale)  # claimed, never retried
+    assert outbox_for(db, user.email) == []
+
+
+def test_sweeper_digest_sends_one_email_per_user(db, make_user):
+    from app.utils.reminders import sweep_due_notifications
+
+    now = datetime.utcnow()
+    user, _ = make_user("sweep-digest@example.com")
+    first = add_application(db, user, interview_utc=now + timedelta(hours=3))
+    second = add_application(db, user, interview_utc=now + timedelta(hours=4))
+    reminders = [
+        add_reminder(db, first, "day_of_9am", now - timedelta(minutes=1)),
+        add_reminder(db, second, "day_of_9am", now - timedelta(minutes=1)),
+        # not due yet, but inside the digest window
+        add_reminder(db, second, "30min_before", now + timedelta(minutes=5)),
+    ]
+    outside_window = add_reminder(db, first, "30min_before", now + timedelta(hours=2, minutes=30))
+
+    sweep_due_notifications(db, digest=True, digest_window=timedelta(minutes=15))
+    assert all(is_sent(db, notification_id) for notification_id in reminders)
+    assert not is_sent(db, outside_window)
+    [email] = outbox_for(db, user.email)
+    assert email.dedup_key.startswith(f"reminder-digest:{user.id}:")
+    assert email.body.count("<li>") == 3
@@ -1,9 +1,16 @@
-# app/tests/test_resume_extract_load.py
+# app/tests/test_resume_extract.py
 import io
 import asyncio
+import os
+import time
+
 import pytest
-from httpx import AsyncClient
+from httpx import ASGITransport, AsyncClient
 from app.main import app
+from app.utils import resume_extraction
+from app.utils.identity import UserSnapshot
+from app.utils.process_pool import BoundedProcessPool
+from app.utils.utils import get_current_identity
 
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
@@ -35,28 +42,106 @@ def make_docx_with_text(text: str) -> bytes:
 TOTAL_REQUESTS = 200  # adjust for load
 
 
-@pytest.mark.asyncio
-async def test_resume_extract_high_load():
-    async with AsyncClient(app=app, base_url="http://test") as client:
-        tasks = []
+def upload(i: int) -> dict:
+    if i % 2 == 0:  # alternate between PDF and DOCX
+        file_bytes = make_pdf_with_text(f"This is resume number {i}")
+        return {"resume": (f"resume_{i}.pdf", io.BytesIO(file_bytes), "application/pdf")}
+    file_bytes = make_docx_with_text(f"Python FastAPI SQL resume {i}")
+    return {"resume": (f"resume_{i}.docx", io.BytesIO(file_bytes),
+                       "application/vnd.openxmlformats-officedocument.wordprocessingml.document")}
+
+
+@pytest.fixture
+def signed_in():
+    app.dependency_overrides[get_current_identity] = lambda: UserSnapshot(id=1, username="load", email="load@example.com")
+    yield
+    app.dependency_overrides.pop(get_current_identity, None)
+
+
+@pytest.fixture
+def use_pool(monkeypatch):
+    pools = []
+
+    def _use_pool(workers: int, max_queue: int = TOTAL_REQUESTS):
+        pool = BoundedProcessPool(
+            "resume_extractor",
+            max_workers=workers,
+            max_queue=max_queue,
+            initializer=resume_extraction._init_worker,
+            initargs=(resume_extraction.RESUME_EXTRACT_MEMORY_LIMIT_MB,),
+        )
+        monkeypatch.setattr(resume_extraction, "extraction_pool", pool)
+        pools.append(pool)
+        return pool
+
+    yield _use_pool
+    for pool in pools:
+        pool.shutdown(wait=True)
+
+
+def client():
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
 
-        for i in range(TOTAL_REQUESTS):
-            if i % 2 == 0:  # alternate between PDF and DOCX
-                file_bytes = make_pdf_with_text(f"This is resume number {i}")
-                files = {"resume": (f"resume_{i}.pdf", io.BytesIO(file_bytes), "application/pdf")}
-            else:
-                file_bytes = make_docx_with_text(f"Python FastAPI SQL resume {i}")
-                files = {"resume": (f"resume_{i}.docx", io.BytesIO(file_bytes),
-                                    "application/vnd.openxmlformats-officedocument.wordprocessingml.document")}
 
-            tasks.append(client.post("/resume/extract", files=files))
+async def upload_storm(total=TOTAL_REQUESTS):
+    async with client() as ac:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(ac.post("/ai/resume/extract", files=upload(i)) for i in range(total)))
+        return responses, time.perf_counter() - start
 
-        responses = await asyncio.gather(*tasks)
+
+async def probe_latency(stop: asyncio.Event) -> float:
+    # how long a trivial request waits while uploads are being parsed
+    worst = 0.0
+    async with client() as ac:
+        while not stop.is_set():
+            start = time.perf_counter()
+            await ac.get("/")
+            worst = max(worst, time.perf_counter() - start)
+            await asyncio.sleep(0.01)
+    return worst
+
+
+@pytest.mark.asyncio
+async def test_resume_extract_high_load(signed_in, use_pool):
+    pool = use_pool(os.cpu_count() or 1)
+    await upload_storm(8)  # warm the worker processes up
+
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_latency(stop))
+    responses, elapsed = await upload_storm()
+    stop.set()
+    worst_probe = await probe
 
     # check all results
     success_count = sum(1 for r in responses if r.status_code == 200)
     fail_count = TOTAL_REQUESTS - success_count
+    stats = pool.stats()
 
-    print(f"\n✅ {success_count} succeeded, ❌ {fail_count} failed")
+    print(f"\n✅ {success_count} succeeded, ❌ {fail_count} failed in {elapsed:.2f}s "
+          f"({TOTAL_REQUESTS / elapsed:.0f}/s), worst '/' latency {worst_probe * 1000:.0f} ms, "
+          f"peak queue {stats['peak_queue_depth']}, avg parse {stats['avg_run_ms']} ms")
 
     assert success_count >= TOTAL_REQUESTS * 0.95  # allow up to 5% failures under heavy load
+    assert all("resume" in r.json()["extracted_text_preview"] for r in responses if r.status_code == 200)
+    assert stats["failed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_extraction_timeout_and_saturation(signed_in, use_pool, monkeypatch):
+    use_pool(1, max_queue=0)
+    await upload_storm(2)
+
+    # a budget no parse can meet: the worker's alarm interrupts it
+    monkeypatch.setattr(resume_extraction, "RESUME_EXTRACT_TIMEOUT_SECONDS", 1e-6)
+    async with client() as ac:
+        response = await ac.post("/ai/resume/extract", files=upload(0))
+    assert response.status_code == 422
+    assert "Timed out" in response.json()["detail"]
+    monkeypatch.undo()
+
+    # one worker, no queue: the overflow is shed with 503 instead of piling up
+    use_pool(1, max_queue=0)
+    responses, _ = await upload_storm(20)
+    codes = [r.status_code for r in responses]
+    assert 200 in codes and 503 in codes
@@ -0,0 +1,28 @@
+# app/tests/test_scheduler.py
+import pytest
+
+from app.utils import scheduler as scheduler_module
+
+
+def test_local_file_jobstore_is_refused(monkeypatch):
+    monkeypatch.setattr(scheduler_module, "SCHEDULER_JOBSTORE_URL", "sqlite:///jobs.sqlite")
+    with pytest.raises(RuntimeError, match="local file"):
+        scheduler_module._build_jobstore()
+
+
+def test_election_registers_jobs_then_resumes(monkeypatch):
+    calls = []
+    monkeypatch.setattr(scheduler_module.scheduler, "resume", lambda: calls.append("resume"))
+
+    monkeypatch.setattr(scheduler_module, "_register_jobs", lambda: calls.append("register"))
+    scheduler_module._on_elected()
+    assert calls == ["register", "resume"]
+
+    # a failed registration must not leave the new leader paused
+    def broken():
+        raise RuntimeError("database unavailable")
+
+    calls.clear()
+    monkeypatch.setattr(scheduler_module, "_register_jobs", broken)
+    scheduler_module._on_elected()
+    assert calls == ["resume"]
@@ -0,0 +1,38 @@
+# app/tests/test_scheduler_metrics.py
+import time
+
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from app.utils.scheduler_metrics import SCHEDULER_EVENTS, InstrumentedThreadPoolExecutor, SchedulerMetrics
+
+JOBS = 5
+
+
+def noop():
+    pass
+
+
+def test_fast_jobs_leave_nothing_in_flight():
+    # fast jobs finish before APScheduler dispatches EVENT_JOB_SUBMITTED;
+    # every run must still be matched to its submission
+    metrics = SchedulerMetrics(executor_workers=4)
+    scheduler = BackgroundScheduler(
+        jobstores={"default": MemoryJobStore()},
+        executors={"default": InstrumentedThreadPoolExecutor(metrics, 4)},
+        timezone="UTC",
+    )
+    scheduler.add_listener(metrics.listener, SCHEDULER_EVENTS)
+    for i in range(JOBS):
+        scheduler.add_job(noop, "interval", seconds=0.2, id=f"noop-{i}", name="noop")
+    scheduler.start()
+    time.sleep(2)
+    scheduler.shutdown(wait=True)
+
+    stats = metrics.as_dict()
+    job = stats["jobs"]["noop"]
+    assert job["runs"] >= JOBS * 5
+    assert job["duration_seconds"]["count"] == job["runs"]
+    assert job["lag_seconds"]["count"] == job["runs"]
+    assert stats["executor"]["in_flight"] == 0
+    assert stats["executor"]["queue_depth"] == 0
@@ -0,0 +1,59 @@
+# app/tests/test_search.py
+import pytest
+from fastapi.testclient import TestClient
+
+from app import models
+from app.main import app
+from app.utils import search
+
+client = TestClient(app)
+
+
+def search_ids(headers, query):
+    response = client.get("/applications/search-applications", params={"query": query}, headers=headers)
+    assert response.status_code == 200, response.text
+    return [result["id"] for result in response.json()["results"]]
+
+
+@pytest.fixture
+def seeded(db, make_user, request):
+    user, headers = make_user(f"{request.node.name}@example.com")
+    other, _ = make_user(f"{request.node.name}-other@example.com")
+    rows = [
+        models.Application(user_id=user.id, job_title="Platform Engineer", company="Globex", job_link="x",
+                           notes="Kubernetes migration", status=models.ApplicationStatus.applied),
+        models.Application(user_id=user.id, job_title="Data Analyst", company="Initech", job_link="x",
+                           job_description="SQL dashboards", status=models.ApplicationStatus.applied),
+        # another user's row must never show up
+        models.Application(user_id=other.id, job_title="Platform Engineer", company="Umbrella", job_link="x",
+                           status=models.ApplicationStatus.applied),
+    ]
+    db.add_all(rows)
+    db.commit()
+    return headers, rows
+
+
+def test_search_matches_prefixes_across_fields(seeded):
+    headers, (platform, analyst, _) = seeded
+    assert search_ids(headers, "platf") == [platform.id]
+    assert search_ids(headers, "kubernetes") == [platform.id]
+    assert search_ids(headers, "dashboard") == [analyst.id]
+    assert search_ids(headers, "engineer globex") == [platform.id]
+    assert search_ids(headers, "engineer initech") == []
+
+
+def test_search_index_follows_updates_and_deletes(db, seeded):
+    headers, (platform, analyst, _) = seeded
+    client.patch(f"/applications/my-applications/{platform.id}", json={"notes": "Terraform rollout"}, headers=headers)
+    assert search_ids(headers, "kubernetes") == []
+    assert search_ids(headers, "terraform") == [platform.id]
+
+    client.delete(f"/applications/my-applications/{analyst.id}", headers=headers)
+    assert search_ids(headers, "dashboards") == []
+
+
+def test_search_falls_back_without_the_index(db, seeded, monkeypatch):
+    headers, (platform, _, _) = seeded
+    assert search.has_search_index(db)
+    monkeypatch.setattr(search, "_index_present", {str(db.get_bind().url): False})
+    assert search_ids(headers, "kubernetes") == [platform.id]
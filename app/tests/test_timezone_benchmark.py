@@ -0,0 +1,68 @@
+# app/tests/test_timezone_benchmark.py
+import time
+from zoneinfo import ZoneInfo
+
+import pytest
+from dateutil import parser
+
+from app.utils import interview
+from app.utils.interview import get_zone, parse_local_datetime, resolve_to_iana
+
+ITERATIONS = 20000
+# what the frontend sends, plus a non-ISO string that has to take the dateutil path
+ISO_INPUTS = ["2026-11-03T14:30", "2026-11-03T14:30:00", "2026-11-03 09:00:00+01:00", "2026-11-03T14:30:00Z"]
+ZONES = ["Africa/Lagos", "America/New_York", "Europe/London", "Asia/Tokyo", "Australia/Sydney"]
+
+
+def per_second(fn, inputs, iterations=ITERATIONS):
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(inputs[i % len(inputs)])
+    return iterations / (time.perf_counter() - start)
+
+
+def legacy_parse(dt_str, recruiter_iana="Africa/Lagos"):
+    # before: dateutil for every input and a fresh ZoneInfo lookup per call
+    raw = parser.parse(dt_str)
+    tz = ZoneInfo(recruiter_iana)
+    return raw.replace(tzinfo=tz) if raw.tzinfo is None else raw.astimezone(tz)
+
+
+@pytest.mark.parametrize("dt_str", ISO_INPUTS + ["Nov 3 2026 2:30 PM"])
+def test_fast_path_matches_dateutil(dt_str):
+    assert parse_local_datetime(dt_str, "Africa/Lagos") == legacy_parse(dt_str)
+
+
+def test_iso_fast_path_outpaces_dateutil():
+    before = per_second(legacy_parse, ISO_INPUTS)
+    after = per_second(lambda s: parse_local_datetime(s, "Africa/Lagos"), ISO_INPUTS)
+
+    print(f"\ndateutil parse:       {before:,.0f} /s\nfromisoformat parse:  {after:,.0f} /s")
+    assert after > 3 * before
+
+
+def test_zone_lookups_are_memoized_and_case_insensitive():
+    assert resolve_to_iana("wat") == "Africa/Lagos"
+    assert resolve_to_iana(" america/new_york ") == "America/New_York"
+    assert resolve_to_iana("Europe/London") == "Europe/London"
+    with pytest.raises(ValueError):
+        resolve_to_iana("Mars/Olympus_Mons")
+
+    assert get_zone("Asia/Tokyo") is get_zone("Asia/Tokyo")
+    interview._timezone_lookup.cache_clear()
+    lookup_build_start = time.perf_counter()
+    resolve_to_iana("UTC")
+    build = time.perf_counter() - lookup_build_start
+
+    before = per_second(ZoneInfo, ZONES)
+    after = per_second(get_zone, ZONES)
+    resolved = per_second(resolve_to_iana, ZONES)
+
+    # zoneinfo keeps its own small cache, so this is about sharing one object
+    # per zone rather than raw speed; reported, not asserted
+    print(
+        f"\nZoneInfo(key):        {before:,.0f} /s"
+        f"\nget_zone:             {after:,.0f} /s"
+        f"\nresolve_to_iana:      {resolved:,.0f} /s"
+        f"\none-off lookup build: {build * 1000:.1f} ms"
+    )
@@ -0,0 +1,57 @@
+# app/tests/test_token_revocation.py
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from app import models
+from app.main import app
+from app.utils.tokens import RevokedFamilies, new_token_id, revoked_families
+from app.utils.utils import create_access_token
+
+
+def add_family(db, user, revoked_at=None):
+    now = datetime.utcnow()
+    family = models.RefreshTokenFamily(
+        id=new_token_id(),
+        user_id=user.id,
+        current_jti=new_token_id(),
+        expires_at=now + timedelta(days=7),
+        revoked_at=revoked_at,
+    )
+    db.add(family)
+    db.commit()
+    return family.id
+
+
+def test_revocation_committed_late_is_still_loaded(db, make_user):
+    user, _ = make_user("late-revoke@example.com")
+    revoked = RevokedFamilies(refresh_seconds=0, retention=timedelta(hours=1))
+    now = datetime.utcnow()
+
+    # another worker's revocation lands and is loaded...
+    newer = add_family(db, user, revoked_at=now)
+    assert revoked.is_revoked(newer, db)
+    # ...then one stamped earlier commits afterwards
+    older = add_family(db, user, revoked_at=now - timedelta(seconds=5))
+    assert revoked.is_revoked(older, db)
+
+    # outside the retention window nothing is kept
+    expired = add_family(db, user, revoked_at=now - timedelta(hours=2))
+    assert not revoked.is_revoked(expired, db)
+
+
+def test_revoked_session_is_rejected(db, make_user):
+    user, _ = make_user("revoked-session@example.com")
+    family_id = add_family(db, user)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id), 'fam': family_id})}"}
+    revoked_families.clear()
+    client = TestClient(app)
+    assert client.get("/auth/me", headers=headers).status_code == 200
+
+    # revoked by another worker: seen on the next refresh
+    db.query(models.RefreshTokenFamily).filter(models.RefreshTokenFamily.id == family_id).update(
+        {"revoked_at": datetime.utcnow() - timedelta(seconds=5)}
+    )
+    db.commit()
+    revoked_families.clear()
+    assert client.get("/auth/me", headers=headers).status_code == 401
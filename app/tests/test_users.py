@@ -0,0 +1,49 @@
+# app/tests/test_users.py
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import models
+from app.database import engine
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_profile_etag_follows_the_row_not_the_cached_identity(db, make_user):
+    user, headers = make_user("profile-etag@example.com")
+    first = client.get("/users/user-profile", headers=headers)
+    etag = first.headers["ETag"]
+    assert client.get("/users/user-profile", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    # changed by another worker: this worker's cached identity still has the old updated_at
+    db.query(models.User).filter(models.User.id == user.id).update({"username": "renamed"})
+    db.commit()
+    response = client.get("/users/user-profile", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["data"]["username"] == "renamed"
+
+
+def test_auth_and_handler_share_one_session(make_user):
+    user, headers = make_user("profile-checkouts@example.com")
+    response = client.get("/users/user-profile", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["X-DB-Checkouts"] == "1"
+
+
+def test_profile_revalidation_does_not_load_the_row(make_user):
+    user, headers = make_user("profile-304@example.com")
+    etag = client.get("/users/user-profile", headers=headers).headers["ETag"]
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get("/users/user-profile", headers={**headers, "If-None-Match": etag})
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert response.status_code == 304
+    assert not [statement for statement in statements if "users.password_hash" in statement]
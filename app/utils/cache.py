@@ -0,0 +1,276 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+MISSING = object()
+
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")  # "memory" or "shared"
+RESPONSE_CACHE_REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL")
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "30"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "10000"))
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "sets": self.sets,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU with a per-entry TTL.
+    Counters (incr) live outside the LRU so they are never evicted.
+    """
+
+    def __init__(self, max_entries: int = 1024, default_ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.stats = CacheStats()
+        self._entries = OrderedDict()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=MISSING):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            self.stats.sets += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.stats.invalidations += 1
+
+    def incr(self, key) -> int:
+        with self._lock:
+            value = self._counters.get(key, 0) + 1
+            self._counters[key] = value
+            return value
+
+    def counter(self, key) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class LocalRedis:
+    """
+    Minimal in-process stand-in for the subset of the redis client we use
+    (get / set with ex / delete / incr), for local runs without a Redis server.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value, ex=None):
+        with self._lock:
+            self._data[key] = (str(value).encode("utf-8"), time.monotonic() + ex if ex else None)
+        return True
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(1 for key in keys if self._data.pop(key, None) is not None)
+
+    def incr(self, key):
+        with self._lock:
+            value, expires_at = self._data.get(key, (b"0", None))
+            value = int(value) + 1
+            self._data[key] = (str(value).encode("utf-8"), expires_at)
+            return value
+
+
+class SharedCache:
+    """
+    Cache backed by a redis-compatible client so every worker sees the same
+    entries and invalidations. Values are stored as JSON.
+    """
+
+    def __init__(self, client, default_ttl: Optional[float] = None, prefix: str = "jt:"):
+        self.client = client
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+        self.stats = CacheStats()
+
+    def get(self, key, default=MISSING):
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            self.stats.misses += 1
+            return default
+        self.stats.hits += 1
+        return json.loads(raw)
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        ttl = self.default_ttl if ttl is None else ttl
+        self.client.set(self.prefix + key, json.dumps(value), ex=int(ttl) if ttl else None)
+        self.stats.sets += 1
+
+    def delete(self, key):
+        if self.client.delete(self.prefix + key):
+            self.stats.invalidations += 1
+
+    def incr(self, key) -> int:
+        return int(self.client.incr(self.prefix + "counter:" + key))
+
+    def counter(self, key) -> int:
+        raw = self.client.get(self.prefix + "counter:" + key)
+        return int(raw) if raw is not None else 0
+
+
+def make_shared_client(redis_url: Optional[str]):
+    """
+    Real redis client when configured and installed, otherwise the local stand-in.
+    """
+    if redis_url:
+        try:
+            import redis
+            return redis.Redis.from_url(redis_url)
+        except ImportError:
+            logger.warning("redis package not installed; using in-process stand-in for the shared cache")
+    return LocalRedis()
+
+
+class ResponseCache:
+    """
+    Per-user cache of JSON-ready response bodies, keyed by user and route.
+
+    Each (user, scope) pair has a generation number that is part of every key;
+    invalidating a scope just bumps it, so stale entries are never read again
+    and age out through TTL/LRU. Scopes are collection names ("applications", "resumes").
+    """
+
+    def __init__(self, store, ttl: Optional[float] = None):
+        self.store = store
+        self.ttl = ttl
+
+    def key(self, user_id: int, scope: str, route: str) -> str:
+        """
+        Resolve the key once per request and use it for both get and set: if a
+        write commits in between, the value lands under the old generation and
+        is never served.
+        """
+        generation = self.store.counter(f"{scope}:{user_id}")
+        return f"{scope}:{user_id}:{generation}:{route}"
+
+    def get(self, key: str):
+        value = self.store.get(key)
+        return None if value is MISSING else value
+
+    def set(self, key: str, value: Any):
+        self.store.set(key, value, ttl=self.ttl)
+
+    def invalidate(self, user_id: int, *scopes: str):
+        for scope in scopes:
+            self.store.incr(f"{scope}:{user_id}")
+            self.store.stats.invalidations += 1
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.store).__name__,
+            "entries": len(self.store) if hasattr(self.store, "__len__") else None,
+            **self.store.stats.as_dict(),
+        }
+
+
+def _build_response_cache() -> ResponseCache:
+    if RESPONSE_CACHE_BACKEND == "shared":
+        store = SharedCache(make_shared_client(RESPONSE_CACHE_REDIS_URL), default_ttl=RESPONSE_CACHE_TTL_SECONDS)
+    else:
+        store = LRUCache(max_entries=RESPONSE_CACHE_MAX_ENTRIES, default_ttl=RESPONSE_CACHE_TTL_SECONDS)
+    return ResponseCache(store, ttl=RESPONSE_CACHE_TTL_SECONDS)
+
+
+response_cache = _build_response_cache()
+
+
+# Work queued on a session runs only once its transaction commits, so a
+# concurrent reader can't re-cache the pre-commit state.
+_AFTER_COMMIT = "after_commit_callbacks"
+
+
+def run_after_commit(db: Session, callback, *args):
+    db.info.setdefault(_AFTER_COMMIT, {})[(callback, *args)] = None
+
+
+def invalidate_on_commit(db: Session, user_id: int, *scopes: str):
+    for scope in scopes:
+        run_after_commit(db, response_cache.invalidate, user_id, scope)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session):
+    for callback, *args in session.info.pop(_AFTER_COMMIT, {}):
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.error(f"After-commit callback {callback.__name__} failed: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_commit(session):
+    session.info.pop(_AFTER_COMMIT, None)
@@ -0,0 +1,188 @@
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.logger import get_logger
+from app.utils.cache import invalidate_on_commit
+
+logger = get_logger(__name__)
+
+RECONCILE_BATCH_SIZE = 500
+
+APPLICATIONS_COLLECTION = "applications"
+RESUMES_COLLECTION = "resumes"
+# applications with an interview date, as seen by the calendar feed
+INTERVIEWS_COLLECTION = "interviews"
+
+# accept the enum member, its name ("not_applied") or its label ("Not Applied")
+_STATUS_LOOKUP = {}
+for _member in models.ApplicationStatus:
+    _STATUS_LOOKUP[_member.name.lower()] = _member
+    _STATUS_LOOKUP[_member.value.lower()] = _member
+
+
+def coerce_status(raw) -> Optional[models.ApplicationStatus]:
+    """
+    Map whatever a client or the DB handed us to an ApplicationStatus.
+    Returns None when it isn't a known status.
+    """
+    if raw is None:
+        return None
+    if isinstance(raw, models.ApplicationStatus):
+        return raw
+    return _STATUS_LOOKUP.get(str(getattr(raw, "value", raw)).strip().lower())
+
+
+def dialect_insert(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    return None
+
+
+def upsert_counter(db: Session, model, keys: dict, column: str, delta: int):
+    """
+    Add `delta` to `column` of the row identified by `keys`, creating the row
+    if needed. Runs inside the caller's transaction.
+    """
+    table = model.__table__
+    insert = dialect_insert(db)
+
+    if insert is not None:
+        stmt = insert(table).values(**keys, **{column: delta})
+        new_value = table.c[column] + stmt.excluded[column]
+        db.execute(stmt.on_conflict_do_update(index_elements=list(keys), set_={column: new_value}))
+        return
+
+    # no native upsert: update first, insert if nothing was there
+    where = [table.c[name] == key for name, key in keys.items()]
+    result = db.execute(table.update().where(*where).values(**{column: table.c[column] + delta}))
+    if result.rowcount == 0:
+        db.execute(table.insert().values(**keys, **{column: delta}))
+
+
+def bump_status_counts(db: Session, user_id: int, deltas: Dict[models.ApplicationStatus, int]):
+    """
+    Apply per-status deltas for one user, e.g. {applied: -1, interview: +1}.
+    Call before db.commit() so the counters commit with the application change.
+    """
+    for status, delta in deltas.items():
+        if status is None or not delta:
+            continue
+        upsert_counter(
+            db,
+            models.ApplicationStatusCount,
+            {"user_id": user_id, "status": status},
+            "count",
+            delta=delta,
+        )
+
+
+def get_status_counts(db: Session, user_id: int) -> Dict[str, int]:
+    """
+    Counts keyed by status label ("Applied", "Interview", ...). Primary-key range read.
+    """
+    rows = (
+        db.query(models.ApplicationStatusCount.status, models.ApplicationStatusCount.count)
+        .filter(models.ApplicationStatusCount.user_id == user_id)
+        .all()
+    )
+    return {status.value: count for status, count in rows}
+
+
+def bump_collection_version(db: Session, user_id: int, collection: str):
+    """
+    Mark one of the user's collections as changed. Call before db.commit().
+    Also drops the user's cached responses for the collection once the commit lands.
+    """
+    upsert_counter(
+        db,
+        models.CollectionVersion,
+        {"user_id": user_id, "collection": collection},
+        "version",
+        delta=1,
+    )
+    invalidate_on_commit(db, user_id, collection)
+
+
+def get_collection_version(db: Session, user_id: int, collection: str) -> int:
+    version = (
+        db.query(models.CollectionVersion.version)
+        .filter(
+            models.CollectionVersion.user_id == user_id,
+            models.CollectionVersion.collection == collection,
+        )
+        .scalar()
+    )
+    return version or 0
+
+
+def reconcile_status_counters(db: Session, batch_size: int = RECONCILE_BATCH_SIZE) -> List[dict]:
+    """
+    Recount applications per (user, status) and repair any counter that drifted.
+    Walks users in id batches so no single statement scans the whole table.
+    Returns the drift that was found and fixed.
+    """
+    drift = []
+    last_user_id = 0
+    while True:
+        user_ids = [
+            row.id
+            for row in db.query(models.User.id)
+            .filter(models.User.id > last_user_id)
+            .order_by(models.User.id)
+            .limit(batch_size)
+            .all()
+        ]
+        if not user_ids:
+            break
+        last_user_id = user_ids[-1]
+
+        # lock the counters before counting: a write that races the recount
+        # either committed before the lock (and is counted) or waits on it
+        stored = {
+            (row.user_id, row.status): row.count
+            for row in db.query(models.ApplicationStatusCount)
+            .filter(models.ApplicationStatusCount.user_id.in_(user_ids))
+            .order_by(models.ApplicationStatusCount.user_id, models.ApplicationStatusCount.status)
+            .with_for_update()
+            .all()
+        }
+        actual = {
+            (user_id, status): count
+            for user_id, status, count in db.query(
+                models.Application.user_id, models.Application.status, func.count(models.Application.id)
+            )
+            .filter(models.Application.user_id.in_(user_ids))
+            .group_by(models.Application.user_id, models.Application.status)
+            .all()
+        }
+
+        for user_id, status in set(actual) | set(stored):
+            expected = actual.get((user_id, status), 0)
+            found = stored.get((user_id, status), 0)
+            if expected == found:
+                continue
+            drift.append({"user_id": user_id, "status": status.value, "expected": expected, "stored": found})
+            upsert_counter(
+                db,
+                models.ApplicationStatusCount,
+                {"user_id": user_id, "status": status},
+                "count",
+                # a delta, not the absolute count: a counter row created by a
+                # write still in flight keeps that write's bump
+                delta=expected - found,
+            )
+        db.commit()
+
+    if drift:
+        logger.warning(f"Status counters drifted for {len(drift)} (user, status) pairs: {drift[:20]}")
+    else:
+        logger.info("Status counters reconciled: no drift")
+    return drift
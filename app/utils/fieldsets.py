@@ -0,0 +1,23 @@
+from typing import Iterable, List, Optional
+
+
+def parse_fields(fields: Optional[str], allowed: dict, default: Iterable[str], required: Iterable[str] = ("id",)) -> List:
+    """
+    Resolve a `fields=a,b,c` query value into the matching columns from `allowed`.
+    Falls back to `default` when nothing was asked for; `required` names are
+    always included. Raises ValueError for unknown names.
+    """
+    if fields and fields.strip():
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+    else:
+        names = list(default)
+
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+
+    ordered = []
+    for name in [*required, *names]:
+        if name not in ordered:
+            ordered.append(name)
+    return [allowed[name] for name in ordered]
@@ -0,0 +1,90 @@
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.utils.cache import MISSING, LRUCache, SharedCache, make_shared_client, run_after_commit
+
+IDENTITY_CACHE_BACKEND = os.getenv("IDENTITY_CACHE_BACKEND", "memory")  # "memory" or "shared"
+IDENTITY_CACHE_REDIS_URL = os.getenv("IDENTITY_CACHE_REDIS_URL")
+IDENTITY_CACHE_TTL_SECONDS = int(os.getenv("IDENTITY_CACHE_TTL_SECONDS", "300"))
+IDENTITY_CACHE_MAX_ENTRIES = int(os.getenv("IDENTITY_CACHE_MAX_ENTRIES", "10000"))
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """
+    Detached, read-only view of a user for handlers that only need to know who
+    is calling. It is not bound to any session, so it can be cached and shared.
+    """
+    id: int
+    username: str
+    email: str
+    timezone: Optional[str] = None
+    profile_picture: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @classmethod
+    def from_user(cls, user) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            timezone=user.timezone,
+            profile_picture=user.profile_picture,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+    def to_cache(self) -> dict:
+        data = asdict(self)
+        for field in ("created_at", "updated_at"):
+            if data[field] is not None:
+                data[field] = data[field].isoformat()
+        return data
+
+    @classmethod
+    def from_cache(cls, data: dict) -> "UserSnapshot":
+        data = dict(data)
+        for field in ("created_at", "updated_at"):
+            if data.get(field):
+                data[field] = datetime.fromisoformat(data[field])
+        return cls(**data)
+
+
+def _build_identity_cache():
+    if IDENTITY_CACHE_BACKEND == "shared":
+        return SharedCache(
+            make_shared_client(IDENTITY_CACHE_REDIS_URL),
+            default_ttl=IDENTITY_CACHE_TTL_SECONDS,
+            prefix="jt:identity:",
+        )
+    return LRUCache(max_entries=IDENTITY_CACHE_MAX_ENTRIES, default_ttl=IDENTITY_CACHE_TTL_SECONDS)
+
+
+identity_cache = _build_identity_cache()
+
+
+def get_cached_identity(user_id: int) -> Optional[UserSnapshot]:
+    data = identity_cache.get(str(user_id))
+    if data is MISSING:
+        return None
+    return UserSnapshot.from_cache(data)
+
+
+def cache_identity(snapshot: UserSnapshot) -> None:
+    identity_cache.set(str(snapshot.id), snapshot.to_cache())
+
+
+def invalidate_identity(user_id: int) -> None:
+    identity_cache.delete(str(user_id))
+
+
+def invalidate_identity_on_commit(db: Session, user_id: int) -> None:
+    """
+    Drop the cached snapshot once the caller's change to the user row commits.
+    """
+    run_after_commit(db, invalidate_identity, user_id)
@@ -0,0 +1,111 @@
+import codecs
+import csv
+import io
+import json
+from typing import BinaryIO, Iterator, Tuple
+
+READ_CHUNK_SIZE = 64 * 1024
+# a JSON row still undecoded past this is malformed (or absurd): stop reading instead of buffering the upload
+MAX_ROW_CHARS = 1024 * 1024
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def detect_format(filename: str, content_type: str) -> str:
+    fname = (filename or "").lower()
+    ctype = (content_type or "").lower()
+    if fname.endswith(".csv") or "csv" in ctype:
+        return "csv"
+    if fname.endswith((".json", ".ndjson", ".jsonl")) or "json" in ctype:
+        return "json"
+    raise ImportFormatError(f"Unsupported file format: {filename}")
+
+
+def _iter_csv(stream: BinaryIO) -> Iterator[Tuple[int, object]]:
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        for number, row in enumerate(reader, start=1):
+            # spreadsheets export missing cells as "", which pydantic would reject for dates
+            yield number, {key: (value if value != "" else None) for key, value in row.items() if key}
+    finally:
+        text.detach()
+
+
+def _iter_json(stream: BinaryIO) -> Iterator[Tuple[int, object]]:
+    """
+    Incrementally decode either a top-level JSON array of objects or NDJSON,
+    holding at most one chunk plus one partial object in memory. A truncated
+    array, a stray or trailing comma, data after the closing bracket, or a
+    row that never decodes within MAX_ROW_CHARS raises ImportFormatError.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    in_array = None
+    # inside an array, what may come next: "first" (a value or "]"), "value", "separator" or "closed"
+    expect = None
+    number = 0
+    eof = False
+
+    while True:
+        if not eof:
+            chunk = stream.read(READ_CHUNK_SIZE)
+            eof = not chunk
+            buffer += utf8.decode(chunk or b"", final=eof)
+
+        while True:
+            buffer = buffer.lstrip()
+            if not buffer:
+                break
+            if in_array is None:
+                in_array = buffer.startswith("[")
+                if in_array:
+                    buffer = buffer[1:]
+                    expect = "first"
+                continue
+            if in_array:
+                char = buffer[0]
+                if expect == "closed":
+                    raise ImportFormatError("Unexpected data after the JSON array")
+                if expect == "separator":
+                    if char not in (",", "]"):
+                        raise ImportFormatError(f"Expected ',' or ']' after row {number}")
+                    expect = "value" if char == "," else "closed"
+                    buffer = buffer[1:]
+                    continue
+                if char == "]" and expect == "first":
+                    expect = "closed"
+                    buffer = buffer[1:]
+                    continue
+                if char in (",", "]"):
+                    raise ImportFormatError(f"Unexpected '{char}' after row {number}")
+            try:
+                value, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    raise ImportFormatError(f"Malformed JSON after row {number}")
+                if len(buffer) > MAX_ROW_CHARS:
+                    raise ImportFormatError(f"Row {number + 1} is malformed or longer than {MAX_ROW_CHARS} characters")
+                break  # need more input
+            number += 1
+            buffer = buffer[end:]
+            if in_array:
+                expect = "separator"
+            yield number, value
+
+        if eof:
+            if in_array and expect != "closed":
+                raise ImportFormatError(f"JSON array is not closed after row {number}; the upload looks truncated")
+            return
+
+
+def iter_import_rows(stream: BinaryIO, fmt: str) -> Iterator[Tuple[int, object]]:
+    """
+    Yield (row_number, raw_row) pairs from an uploaded file without reading it all.
+    """
+    if fmt == "csv":
+        return _iter_csv(stream)
+    return _iter_json(stream)
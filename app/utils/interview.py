@@ -1,13 +1,11 @@
 from datetime import datetime, timedelta, time
-from zoneinfo import ZoneInfo
+from functools import lru_cache
+from zoneinfo import ZoneInfo, available_timezones
 from typing import Optional
 from dateutil import parser
 import pytz
 from icalendar import Calendar, Event, Alarm
-from .scheduler import scheduler
 from app import models  # adjust import to your project
-from app.database import SessionLocal  # small helper to create DB sessions in scheduled jobs
-from app.utils.utils import send_mail  
 from datetime import timezone
 
 
@@ -60,30 +58,65 @@ ALIAS_MAP = {
     "AST_ARABIA": "Asia/Riyadh",
     "CST_CHINA": "Asia/Shanghai",
 }
+
+
+@lru_cache(maxsize=None)
+def get_zone(iana: str) -> ZoneInfo:
+    """
+    Shared ZoneInfo per IANA name, so per-row conversions don't rebuild one.
+    Raises ZoneInfoNotFoundError (a KeyError) for unknown names.
+    """
+    return ZoneInfo(iana)
+
+
+@lru_cache(maxsize=1)
+def _timezone_lookup() -> dict:
+    """
+    Upper-cased abbreviation or IANA name -> IANA name, built once.
+    Aliases win over IANA names that happen to collide (e.g. "EST").
+    """
+    lookup = {name.upper(): name for name in available_timezones()}
+    lookup.update(ALIAS_MAP)
+    return lookup
+
+
 def resolve_to_iana(tz_str: str) -> str:
     
     """
     Map recruiter-provided timezone string (abbreviation or IANA) to a valid IANA timezone.
+    Case-insensitive: "wat", "WAT" and "africa/lagos" all work.
     """
-    tz_str = tz_str.strip().upper()
-    if tz_str in ALIAS_MAP:
-        return ALIAS_MAP[tz_str]
+    tz_str = tz_str.strip()
+    iana = _timezone_lookup().get(tz_str.upper())
+    if iana is not None:
+        return iana
 
     try:
-        # if it's already a valid IANA name (like "America/New_York")
-        ZoneInfo(tz_str)
+        # not in the system tz database listing (e.g. served from the tzdata package)
+        get_zone(tz_str)
         return tz_str
     except Exception:
         raise ValueError(f"Unknown or unsupported timezone: {tz_str}")
 
 
+def parse_datetime(dt_str: str) -> datetime:
+    """
+    ISO 8601 (what the frontend sends) via fromisoformat; anything else via
+    dateutil, which is an order of magnitude slower.
+    """
+    try:
+        return datetime.fromisoformat(dt_str)
+    except ValueError:
+        return parser.parse(dt_str)
+
+
 def parse_local_datetime(dt_str: str, recruiter_iana: str) -> datetime:
     """
     Parse dt_str and return a timezone-aware datetime in recruiter tz.
     Accepts ISO strings or flexible date formats.
     """
-    raw = parser.parse(dt_str)
-    tz = ZoneInfo(recruiter_iana)
+    raw = parse_datetime(dt_str)
+    tz = get_zone(recruiter_iana)
 
     if raw.tzinfo is None:
         # naive => assume recruiter tz
@@ -93,126 +126,228 @@ def parse_local_datetime(dt_str: str, recruiter_iana: str) -> datetime:
         local_dt = raw.astimezone(tz)
     return local_dt
 
-def make_ics(application, start_dt_local, recruiter_iana, duration_minutes=60):
-    """
-    Create a simple ICS bytes object. start_dt_local should be tz-aware (recruiter tz).
-    We'll put DTSTART/DTEND with timezone-aware datetimes.
-    """
-    """
-    start_dt_local: tz-aware datetime in recruiter tz (ZoneInfo)
-    returns: bytes of the .ics file
-    """
+def _calendar(method: str) -> Calendar:
     cal = Calendar()
     cal.add("prodid", "-//YourApp//Interview//EN")
     cal.add("version", "2.0")
     cal.add("calscale", "GREGORIAN")
-    cal.add("method", "REQUEST")
+    cal.add("method", method)
+    return cal
 
+
+def _interview_event(application_id, job_title, company, start_dt, duration_minutes=60) -> Event:
     ev = Event()
-    ev.add("uid", f"application-{application.id}@yourapp")
-    ev.add("summary", f"Interview: {application.job_title} — {application.company}")
-    ev.add("dtstart", start_dt_local)
-    ev.add("dtend", start_dt_local + timedelta(minutes=duration_minutes))
-#     ev.add("dtstamp", datetime.utcnow())
+    ev.add("uid", f"application-{application_id}@yourapp")
+    ev.add("summary", f"Interview: {job_title} — {company}")
+    ev.add("dtstart", start_dt)
+    ev.add("dtend", start_dt + timedelta(minutes=duration_minutes))
     ev.add("dtstamp", datetime.now(timezone.utc))
 
-
-     # 30-min before
+    # 30-min before
     alarm_30 = Alarm()
     alarm_30.add("action", "DISPLAY")
     alarm_30.add("description", "Interview reminder — 30 min before")
     alarm_30.add("trigger", timedelta(minutes=-30))
     ev.add_component(alarm_30)
+    return ev
+
 
-    cal.add_component(ev)
+def make_ics(application, start_dt_local, recruiter_iana, duration_minutes=60):
+    """
+    Create a simple ICS bytes object. start_dt_local should be tz-aware (recruiter tz).
+    We'll put DTSTART/DTEND with timezone-aware datetimes.
+    """
+    """
+    start_dt_local: tz-aware datetime in recruiter tz (ZoneInfo)
+    returns: bytes of the .ics file
+    """
+    cal = _calendar("REQUEST")
+    cal.add_component(
+        _interview_event(application.id, application.job_title, application.company, start_dt_local, duration_minutes)
+    )
     return cal.to_ical()
 
-def send_interview_reminder(application_id: int, reminder_type: str):
+
+def make_ics_feed(interviews, name="Interviews", duration_minutes=60) -> bytes:
     """
-    reminder_type: "confirmation", "day_before_9am", "day_of_9am", "30min_before"
-    This function will be scheduled; it needs to open its own DB session.
+    Subscribable calendar with one event per interview.
+    interviews: rows with id, job_title, company and interview_date_utc.
+    Times are written in UTC, so no VTIMEZONE blocks are needed; calendar
+    apps show them in the viewer's zone. Event UIDs match make_ics, so an
+    invite already accepted and the feed entry are the same event.
     """
-    db = SessionLocal()
-    try:
-        app_obj = db.query(models.Application).filter(models.Application.id == application_id).first()
-        if not app_obj:
-            return
-
-        user = db.query(models.User).filter(models.User.id == app_obj.user_id).first()
-        if not user:
-            return
-
-        # parse stored UTC and user tz
-        utc_dt = app_obj.interview_date_utc
-        if utc_dt is None or utc_dt.tzinfo is None:
-            return
-        
-        user_iana = user.timezone or "UTC"
-        local_dt = utc_dt.astimezone(ZoneInfo(user_iana))
-        pretty = local_dt.strftime("%A, %B %d, %Y at %I:%M %p %Z")
-
-        subjects = {
-            "confirmation": "Interview Scheduled",
-            "day_before_9am": "Reminder: Interview tomorrow",
-            "day_of_9am": "Reminder: Interview today",
-            "30min_before": "Reminder: Interview in 30 minutes",
-        }
-        subject = subjects.get(reminder_type, "Interview Reminder")
+    cal = _calendar("PUBLISH")
+    cal.add("x-wr-calname", name)
+    for row in interviews:
+        cal.add_component(
+            _interview_event(row.id, row.job_title, row.company, as_utc(row.interview_date_utc), duration_minutes)
+        )
+    return cal.to_ical()
+
+REMINDER_SUBJECTS = {
+    "confirmation": "Interview Scheduled",
+    "day_before_9am": "Reminder: Interview tomorrow",
+    "day_of_9am": "Reminder: Interview today",
+    "30min_before": "Reminder: Interview in 30 minutes",
+}
+
+def as_utc(dt: datetime) -> datetime:
+    """
+    interview_date_utc is stored naive (in UTC); make it aware.
+    """
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
+
+
+def reminder_dedup_key(application_id: int, reminder_type: str, utc_dt: datetime) -> str:
+    return f"reminder:{application_id}:{reminder_type}:{as_utc(utc_dt).isoformat()}"
+
 
-        body_html = f"""
-        <p>Hello {getattr(user, 'username', user.email)},</p>
-        <p>Your interview for <b>{app_obj.job_title}</b> at <b>{app_obj.company}</b> is scheduled on:</p>
+def render_reminder(reminder_type, username, job_title, company, utc_dt, user_iana):
+    """
+    Subject and HTML body for one interview reminder.
+    """
+    local_dt = as_utc(utc_dt).astimezone(get_zone(user_iana or "UTC"))
+    pretty = local_dt.strftime("%A, %B %d, %Y at %I:%M %p %Z")
+    subject = REMINDER_SUBJECTS.get(reminder_type, "Interview Reminder")
+
+    body_html = f"""
+        <p>Hello {username},</p>
+        <p>Your interview for <b>{job_title}</b> at <b>{company}</b> is scheduled on:</p>
         <p><b>📅 {pretty}</b></p>
         <p>Good luck!</p>
         """
+    return subject, body_html
+
+
+def render_reminder_digest(username, reminders, user_iana):
+    """
+    Subject and HTML body for several reminders going to one user at once.
+    reminders: (reminder_type, job_title, company, utc_dt) tuples.
+    """
+    user_tz = get_zone(user_iana or "UTC")
+    items = "".join(
+        f"<li><b>{job_title}</b> at <b>{company}</b>: "
+        f"📅 {as_utc(utc_dt).astimezone(user_tz).strftime('%A, %B %d, %Y at %I:%M %p %Z')}</li>"
+        for _, job_title, company, utc_dt in sorted(reminders, key=lambda r: as_utc(r[3]))
+    )
+    subject = f"Reminder: {len(reminders)} upcoming interviews"
+
+    body_html = f"""
+        <p>Hello {username},</p>
+        <p>You have these interviews coming up:</p>
+        <ul>{items}</ul>
+        <p>Good luck!</p>
+        """
+    return subject, body_html
 
-        send_mail(subject=subject, body=body_html, to_email=user.email, html=True)
-    finally:
-        db.close()
 
-def schedule_reminders_for_application(application, utc_dt, user_iana):
+def reminder_times(utc_dt: datetime, user_iana: str) -> dict:
     """
-    Schedule the three reminders:
+    When each reminder is due, in UTC:
     - 1 day before at 09:00 user local time
     - day of at 09:00 user local time
     - 30 minutes before interview exact time (UTC-30min)
-    All jobs scheduled in UTC (scheduler timezone is UTC).
     """
-    user_tz = ZoneInfo(user_iana)
+    utc_dt = as_utc(utc_dt)
+    user_tz = get_zone(user_iana)
     user_local_interview = utc_dt.astimezone(user_tz)  # applies tz
 
     # 1) 1 day before at 09:00 local
     day_before_date = (user_local_interview.date() - timedelta(days=1))
     run_local_day_before = datetime.combine(day_before_date, time(hour=9, minute=0), tzinfo=user_tz)
-    run_utc_day_before = run_local_day_before.astimezone(ZoneInfo("UTC"))
 
     # 2) day-of at 09:00 local
     run_local_day_of = datetime.combine(user_local_interview.date(), time(hour=9, minute=0), tzinfo=user_tz)
-    run_utc_day_of = run_local_day_of.astimezone(ZoneInfo("UTC"))
-
-    # 3) 30 minutes before interview (easy: utc_dt - 30m)
-    run_utc_30min = utc_dt - timedelta(minutes=30)
-
-    now_utc = datetime.utcnow().replace(tzinfo=ZoneInfo("UTC"))
-
-    # schedule only if in the future
-    if run_utc_day_before > now_utc:
-        scheduler.add_job(send_interview_reminder, "date",
-                          run_date=run_utc_day_before,
-                          args=[application.id, "day_before_9am"],
-                          id=f"appl_{application.id}_day_before",
-                          replace_existing=True)
-
-    if run_utc_day_of > now_utc:
-        scheduler.add_job(send_interview_reminder, "date",
-                          run_date=run_utc_day_of,
-                          args=[application.id, "day_of_9am"],
-                          id=f"appl_{application.id}_day_of",
-                          replace_existing=True)
-
-    if run_utc_30min > now_utc:
-        scheduler.add_job(send_interview_reminder, "date",
-                          run_date=run_utc_30min,
-                          args=[application.id, "30min_before"],
-                          id=f"appl_{application.id}_30min",
-                          replace_existing=True)
\ No newline at end of file
+
+    return {
+        "day_before_9am": run_local_day_before.astimezone(timezone.utc),
+        "day_of_9am": run_local_day_of.astimezone(timezone.utc),
+        # 3) 30 minutes before interview (easy: utc_dt - 30m)
+        "30min_before": utc_dt - timedelta(minutes=30),
+    }
+
+
+def sync_reminders(db, targets):
+    """
+    Bring Notification rows in line with the current interview times.
+    targets: (application_id, user_id, interview_utc, user_iana) tuples.
+
+    Diffs against what is already stored instead of rebuilding: unsent rows
+    that no longer match the interview time (it moved, or the user changed
+    timezone) are deleted, and future reminders with no row at all (sent or
+    not) are inserted. Untouched applications cost one shared read.
+    Returns (inserted, deleted). Call before db.commit().
+    """
+    if not targets:
+        return 0, 0
+    now_utc = datetime.now(timezone.utc)
+    existing = {}
+    for row in db.query(
+        models.Notification.id,
+        models.Notification.application_id,
+        models.Notification.type,
+        models.Notification.scheduled_date,
+        models.Notification.is_sent,
+    ).filter(models.Notification.application_id.in_([target[0] for target in targets])):
+        existing.setdefault(row.application_id, []).append(row)
+
+    stale_ids, rows = [], []
+    for application_id, user_id, utc_dt, user_iana in targets:
+        # stored naive UTC, like interview_date_utc
+        expected = {
+            (reminder_type, run_at.replace(tzinfo=None)): run_at
+            for reminder_type, run_at in reminder_times(utc_dt, user_iana or "UTC").items()
+        }
+        have = set()
+        for row in existing.get(application_id, ()):
+            key = (row.type, row.scheduled_date)
+            if key in expected:
+                have.add(key)
+            elif not row.is_sent:
+                stale_ids.append(row.id)
+        rows.extend(
+            {
+                "user_id": user_id,
+                "application_id": application_id,
+                "type": reminder_type,
+                "message": REMINDER_SUBJECTS[reminder_type],
+                "scheduled_date": scheduled_date,
+                "is_sent": False,
+            }
+            for (reminder_type, scheduled_date), run_at in expected.items()
+            # schedule only if in the future
+            if run_at > now_utc and (reminder_type, scheduled_date) not in have
+        )
+
+    if stale_ids:
+        db.query(models.Notification).filter(models.Notification.id.in_(stale_ids)).delete(synchronize_session=False)
+    if rows:
+        db.execute(models.Notification.__table__.insert(), rows)
+    return len(rows), len(stale_ids)
+
+
+def schedule_reminders_for_application(db, application, utc_dt, user_iana):
+    """
+    Make the application's reminders match its interview time; the sweeper
+    (app/utils/reminders.py) sends them when due. Call before db.commit().
+    """
+    return sync_reminders(db, [(application.id, application.user_id, utc_dt, user_iana)])
+
+
+def sync_user_reminders(db, user_id, user_iana):
+    """
+    Re-time a user's upcoming reminders after their timezone changed: the
+    09:00 reminders are 09:00 in the old zone until synced. Call before
+    db.commit(), in the transaction that changes the timezone.
+    """
+    upcoming = (
+        db.query(models.Application.id, models.Application.interview_date_utc)
+        .filter(
+            models.Application.user_id == user_id,
+            models.Application.status == models.ApplicationStatus.interview,
+            models.Application.interview_date_utc > datetime.utcnow(),
+        )
+        .all()
+    )
+    return sync_reminders(db, [(row.id, user_id, row.interview_date_utc, user_iana) for row in upcoming])
+
@@ -0,0 +1,139 @@
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+
+from app import models
+from app.core.logger import get_logger
+from app.database import SessionLocal
+from app.utils.counters import dialect_insert
+
+logger = get_logger(__name__)
+
+SCHEDULER_LEASE_NAME = "scheduler"
+SCHEDULER_LEASE_TTL_SECONDS = int(os.getenv("SCHEDULER_LEASE_TTL_SECONDS", "30"))
+
+
+class LeaderElector:
+    """
+    Lease-row leader election: at most one process holds the named lease.
+
+    Every `ttl / 3` seconds each candidate tries to take or extend the lease
+    with one conditional upsert, which succeeds only if it already holds the
+    lease or the current lease has expired. A leader that dies stops
+    renewing, so another candidate takes over within about one TTL.
+    Callbacks fire on the elector thread when leadership is won or lost.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl_seconds: int,
+        on_elected: Optional[Callable[[], None]] = None,
+        on_demoted: Optional[Callable[[], None]] = None,
+    ):
+        self.name = name
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.interval = max(1.0, ttl_seconds / 3)
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.is_leader = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def try_acquire(self) -> bool:
+        now = datetime.utcnow()
+        expires_at = now + self.ttl
+        table = models.SchedulerLease.__table__
+        claimable = or_(table.c.holder == self.holder, table.c.expires_at < now)
+        db = SessionLocal()
+        try:
+            insert = dialect_insert(db)
+            if insert is not None:
+                stmt = insert(table).values(name=self.name, holder=self.holder, expires_at=expires_at)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["name"],
+                    set_={"holder": self.holder, "expires_at": expires_at},
+                    where=claimable,
+                )
+                acquired = db.execute(stmt).rowcount > 0
+            else:
+                result = db.execute(
+                    update(table).where(table.c.name == self.name, claimable).values(holder=self.holder, expires_at=expires_at)
+                )
+                acquired = result.rowcount > 0
+                if not acquired:
+                    try:
+                        db.execute(table.insert().values(name=self.name, holder=self.holder, expires_at=expires_at))
+                        acquired = True
+                    except IntegrityError:
+                        db.rollback()
+            db.commit()
+            return acquired
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Lease {self.name} renewal failed: {e}")
+            return False
+        finally:
+            db.close()
+
+    def release(self):
+        db = SessionLocal()
+        try:
+            table = models.SchedulerLease.__table__
+            db.execute(
+                update(table)
+                .where(table.c.name == self.name, table.c.holder == self.holder)
+                .values(expires_at=datetime.utcnow())
+            )
+            db.commit()
+        except Exception as e:
+            logger.error(f"Lease {self.name} release failed: {e}")
+        finally:
+            db.close()
+
+    def _tick(self):
+        acquired = self.try_acquire()
+        if acquired and not self.is_leader:
+            self.is_leader = True
+            logger.info(f"{self.holder} is now leader for {self.name}")
+            if self.on_elected:
+                self.on_elected()
+        elif not acquired and self.is_leader:
+            # lost the lease (DB unreachable, or we stalled past the TTL): stand down
+            self.is_leader = False
+            logger.warning(f"{self.holder} lost leadership for {self.name}")
+            if self.on_demoted:
+                self.on_demoted()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._tick()
+            except Exception as e:
+                logger.error(f"Leader election for {self.name} failed: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f"leader-{self.name}", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if self.is_leader:
+            self.is_leader = False
+            if self.on_demoted:
+                self.on_demoted()
+            self.release()
+
+    def status(self) -> dict:
+        return {"name": self.name, "holder": self.holder, "is_leader": self.is_leader, "ttl_seconds": self.ttl.total_seconds()}
@@ -0,0 +1,290 @@
+import os
+import queue
+import smtplib
+import ssl
+import threading
+import time
+from contextlib import contextmanager
+from email import encoders
+from email.mime.base import MIMEBase
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Iterable, List, Optional, Tuple
+
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() != "false"
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "2"))
+SMTP_TIMEOUT_SECONDS = float(os.getenv("SMTP_TIMEOUT_SECONDS", "30"))
+# connections idle longer than this get a NOOP before reuse; servers drop idle sessions
+SMTP_HEALTHCHECK_AFTER_SECONDS = float(os.getenv("SMTP_HEALTHCHECK_AFTER_SECONDS", "30"))
+# recycle a connection after this many messages (providers cap messages per session)
+SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100"))
+
+# errors that mean the connection itself is gone, as opposed to the server rejecting a message
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError, OSError)
+
+
+class MailDeliveryError(Exception):
+    """
+    Raised when a message could not be delivered. Callers decide whether
+    that is a 5xx, a retry or a log line. For a batch, `sent` holds the
+    messages that went out before the failure.
+    """
+
+    def __init__(self, message: str, sent: Iterable = ()):
+        super().__init__(message)
+        self.sent = list(sent)
+
+
+def build_message(subject, body, from_addr, to_email, attachments=None, html=False) -> MIMEMultipart:
+    msg = MIMEMultipart("mixed")
+    msg["Subject"] = subject
+    msg["From"] = from_addr
+    msg["To"] = to_email
+
+    # Always create an alternative section
+    alt = MIMEMultipart("alternative")
+    msg.attach(alt)
+
+    # Add body
+    if html:
+        alt.attach(MIMEText("This email contains HTML. Please view in an HTML-capable client.", "plain"))
+        alt.attach(MIMEText(body, "html"))
+    else:
+        alt.attach(MIMEText(body, "plain"))
+
+    # Handle attachments
+    for attachment in attachments or ():
+        if isinstance(attachment, str):
+            with open(attachment, "rb") as f:
+                part = MIMEBase("application", "octet-stream")
+                part.set_payload(f.read())
+            encoders.encode_base64(part)
+            part.add_header("Content-Disposition", f'attachment; filename="{os.path.basename(attachment)}"')
+            msg.attach(part)
+
+        elif isinstance(attachment, tuple):
+            filename, file_bytes, mime_type = attachment
+            if mime_type.startswith("text/calendar"):
+                # ICS should be inside the alternative part
+                ics_part = MIMEText(file_bytes.decode("utf-8"), "calendar", "utf-8")
+                ics_part.add_header("Content-Type", "text/calendar; method=REQUEST; charset=UTF-8")
+                ics_part.add_header("Content-Disposition", f'attachment; filename="{filename}"')
+                ics_part.add_header("Content-Class", "urn:content-classes:calendarmessage")
+                alt.attach(ics_part)
+            else:
+                maintype, subtype = mime_type.split("/", 1)
+                part = MIMEBase(maintype, subtype)
+                part.set_payload(file_bytes)
+                encoders.encode_base64(part)
+                part.add_header("Content-Disposition", f'attachment; filename="{filename}"')
+                msg.attach(part)
+        else:
+            raise ValueError(f"Unsupported attachment type: {type(attachment)}")
+
+    return msg
+
+
+class _PooledConnection:
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.last_used = time.monotonic()
+        self.messages = 0
+
+
+class SMTPConnectionPool:
+    """
+    A few persistent, already-authenticated SMTP sessions shared by all senders.
+
+    The TCP connect, STARTTLS and LOGIN are paid once per connection instead
+    of once per email. Connections idle past `healthcheck_after` are probed
+    with NOOP before reuse, and a send that fails because the connection died
+    reconnects and retries once.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: bool = True,
+        size: int = 2,
+        timeout: float = 30,
+        healthcheck_after: float = 30,
+        max_messages: int = 100,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.healthcheck_after = healthcheck_after
+        self.max_messages = max_messages
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "connections_opened": 0,
+            "connections_reused": 0,
+            "health_checks": 0,
+            "reconnects": 0,
+            "sent": 0,
+            "failed": 0,
+        }
+
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def _connect(self) -> _PooledConnection:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                smtp.starttls(context=ssl.create_default_context())
+            if self.username:
+                smtp.login(self.username, self.password)
+        except Exception:
+            self._close(smtp)
+            raise
+        self._count("connections_opened")
+        return _PooledConnection(smtp)
+
+    @staticmethod
+    def _close(smtp: smtplib.SMTP):
+        try:
+            smtp.quit()
+        except Exception:
+            smtp.close()
+
+    def _healthy(self, conn: _PooledConnection) -> bool:
+        if self.max_messages and conn.messages >= self.max_messages:
+            return False
+        if time.monotonic() - conn.last_used < self.healthcheck_after:
+            return True
+        self._count("health_checks")
+        try:
+            return conn.smtp.noop()[0] == 250
+        except CONNECTION_ERRORS + (smtplib.SMTPException,):
+            return False
+
+    @contextmanager
+    def connection(self):
+        """
+        Check out a live connection, wrapped in a one-item list so the body
+        can swap in a replacement after a reconnect.
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise MailDeliveryError("Timed out waiting for an SMTP connection")
+        holder = None
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = None
+            if conn is not None and not self._healthy(conn):
+                self._close(conn.smtp)
+                conn = None
+            if conn is None:
+                conn = self._connect()
+            else:
+                self._count("connections_reused")
+            holder = [conn]
+            yield holder
+        except Exception:
+            if holder is not None:
+                self._close(holder[0].smtp)
+                holder = None
+            raise
+        finally:
+            if holder is not None:
+                holder[0].last_used = time.monotonic()
+                self._idle.put(holder[0])
+            self._slots.release()
+
+    def _send_one(self, holder: list, from_addr: str, msg) -> None:
+        if self.max_messages and holder[0].messages >= self.max_messages:
+            self._close(holder[0].smtp)
+            holder[0] = self._connect()
+        try:
+            holder[0].smtp.send_message(msg, from_addr=from_addr)
+        except CONNECTION_ERRORS:
+            # the server dropped us (idle timeout, restart): reconnect and retry once
+            self._count("reconnects")
+            self._close(holder[0].smtp)
+            holder[0] = self._connect()
+            holder[0].smtp.send_message(msg, from_addr=from_addr)
+        holder[0].messages += 1
+
+    def send_many(self, from_addr: str, messages: Iterable) -> List[Tuple[object, Exception]]:
+        """
+        Send a batch over one pooled connection. Returns (message, error) for
+        every message the server refused; connection failures that survive a
+        reconnect raise MailDeliveryError, whose `sent` lists the messages
+        already delivered so the caller doesn't send them again.
+        """
+        failures = []
+        sent = []
+        try:
+            with self.connection() as holder:
+                for msg in messages:
+                    try:
+                        self._send_one(holder, from_addr, msg)
+                        self._count("sent")
+                        sent.append(msg)
+                    except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError, smtplib.SMTPSenderRefused) as e:
+                        self._count("failed")
+                        failures.append((msg, e))
+        except MailDeliveryError as e:
+            raise MailDeliveryError(str(e), sent=sent) from e
+        except Exception as e:
+            self._count("failed")
+            raise MailDeliveryError(f"SMTP delivery failed: {e}", sent=sent) from e
+        return failures
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {"size": self.size, "idle": self._idle.qsize(), **self._stats}
+
+    def close(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(conn.smtp)
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_mail_transport() -> SMTPConnectionPool:
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = SMTPConnectionPool(
+                    SMTP_HOST,
+                    SMTP_PORT,
+                    username=os.getenv("EMAIL_USER"),
+                    password=os.getenv("EMAIL_PASSWORD"),
+                    starttls=SMTP_STARTTLS,
+                    size=SMTP_POOL_SIZE,
+                    timeout=SMTP_TIMEOUT_SECONDS,
+                    healthcheck_after=SMTP_HEALTHCHECK_AFTER_SECONDS,
+                    max_messages=SMTP_MAX_MESSAGES_PER_CONNECTION,
+                )
+    return _transport
+
+
+def close_mail_transport():
+    if _transport is not None:
+        _transport.close()
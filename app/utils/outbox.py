@@ -0,0 +1,228 @@
+import os
+import random
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.logger import get_logger
+from app.utils.cache import run_after_commit
+from app.utils.counters import dialect_insert
+from app.utils.mail import MailDeliveryError, build_message, get_mail_transport
+
+logger = get_logger(__name__)
+
+OUTBOX_DISPATCH_INTERVAL_SECONDS = int(os.getenv("OUTBOX_DISPATCH_INTERVAL_SECONDS", "15"))
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_MAX_BATCHES_PER_RUN = 20
+# a claimed batch not finished within this is assumed lost (worker died) and claimed again
+OUTBOX_CLAIM_LEASE = timedelta(minutes=5)
+OUTBOX_BACKOFF_BASE = timedelta(seconds=30)
+OUTBOX_BACKOFF_CAP = timedelta(hours=2)
+OUTBOX_RETENTION = timedelta(days=7)
+OUTBOX_DISPATCH_JOB_ID = "dispatch_email_outbox"
+
+Status = models.OutboxStatus
+
+
+def enqueue_email(
+    db: Session,
+    to_email: str,
+    subject: str,
+    body: str,
+    html: bool = False,
+    dedup_key: Optional[str] = None,
+):
+    """
+    Queue an email in the caller's transaction; it goes out only if the
+    transaction commits. An email whose dedup_key is already queued (or sent)
+    is silently skipped. Call before db.commit().
+    """
+    enqueue_emails(db, [{"to_email": to_email, "subject": subject, "body": body, "html": html, "dedup_key": dedup_key}])
+
+
+def enqueue_emails(db: Session, emails: List[dict]):
+    """
+    Bulk form of enqueue_email: one multi-row INSERT for the whole list.
+    Each dict has to_email, subject, body and optionally html and dedup_key.
+    """
+    if not emails:
+        return
+    now = datetime.utcnow()
+    rows = [
+        {
+            "to_email": email["to_email"],
+            "subject": email["subject"],
+            "body": email["body"],
+            "html": email.get("html", False),
+            "dedup_key": email.get("dedup_key"),
+            "status": Status.pending,
+            "attempts": 0,
+            "next_attempt_at": now,
+            "created_at": now,
+        }
+        for email in emails
+    ]
+    insert = dialect_insert(db)
+    if insert is not None:
+        db.execute(insert(models.EmailOutbox).values(rows).on_conflict_do_nothing(index_elements=["dedup_key"]))
+    else:
+        keys = [row["dedup_key"] for row in rows if row["dedup_key"] is not None]
+        queued = {
+            key for (key,) in db.query(models.EmailOutbox.dedup_key).filter(models.EmailOutbox.dedup_key.in_(keys))
+        } if keys else set()
+        rows = [row for row in rows if row["dedup_key"] is None or row["dedup_key"] not in queued]
+        if rows:
+            db.execute(models.EmailOutbox.__table__.insert(), rows)
+    run_after_commit(db, wake_dispatcher)
+
+
+def wake_dispatcher():
+    """
+    Pull the next dispatcher run forward so freshly queued mail (reset codes)
+    doesn't wait out the interval. Best effort, and only on the leader, the one
+    worker that writes to the jobstore: elsewhere the mail goes on the next
+    regular run.
+    """
+    from app.utils.scheduler import is_leader, scheduler
+
+    try:
+        if scheduler.running and is_leader():
+            scheduler.modify_job(OUTBOX_DISPATCH_JOB_ID, next_run_time=datetime.utcnow())
+    except Exception:
+        pass
+
+
+def backoff(attempts: int) -> timedelta:
+    delay = min(OUTBOX_BACKOFF_BASE * (2 ** (attempts - 1)), OUTBOX_BACKOFF_CAP)
+    return delay * random.uniform(0.8, 1.2)  # jitter so a failed burst doesn't retry in lockstep
+
+
+def _claim_batch(db: Session, batch_size: int):
+    now = datetime.utcnow()
+    claimable = (
+        select(models.EmailOutbox.id)
+        .where(
+            models.EmailOutbox.status.in_([Status.pending, Status.sending]),
+            models.EmailOutbox.next_attempt_at <= now,
+        )
+        .order_by(models.EmailOutbox.next_attempt_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    ids = db.scalars(claimable).all()
+    if not ids:
+        return []
+    db.execute(
+        update(models.EmailOutbox)
+        .where(models.EmailOutbox.id.in_(ids))
+        .values(status=Status.sending, next_attempt_at=now + OUTBOX_CLAIM_LEASE)
+    )
+    db.commit()
+    return db.query(models.EmailOutbox).filter(models.EmailOutbox.id.in_(ids)).all()
+
+
+def _record_failure(entry: models.EmailOutbox, error: Exception, max_attempts: int):
+    entry.attempts += 1
+    entry.last_error = str(error)[:1000]
+    if entry.attempts >= max_attempts:
+        entry.status = Status.dead
+        logger.error(f"Email {entry.id} to {entry.to_email} dead-lettered after {entry.attempts} attempts: {error}")
+    else:
+        entry.status = Status.pending
+        entry.next_attempt_at = datetime.utcnow() + backoff(entry.attempts)
+
+
+def dispatch_outbox(
+    db: Session,
+    batch_size: int = OUTBOX_BATCH_SIZE,
+    max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+    max_batches: int = OUTBOX_MAX_BATCHES_PER_RUN,
+) -> dict:
+    """
+    Drain due outbox rows in batches. Each batch is claimed (and committed)
+    before any SMTP traffic, so no row lock is held while talking to the
+    mail server and a second dispatcher skips what this one is sending.
+    """
+    totals = {"sent": 0, "retried": 0, "dead": 0}
+    transport = get_mail_transport()
+    from_addr = os.getenv("EMAIL_USER")
+
+    for _ in range(max_batches):
+        entries = _claim_batch(db, batch_size)
+        if not entries:
+            break
+
+        by_message = {}
+        messages = []
+        for entry in entries:
+            msg = build_message(entry.subject, entry.body, from_addr, entry.to_email, html=entry.html)
+            messages.append(msg)
+            by_message[id(msg)] = entry
+
+        try:
+            refused = {id(msg): error for msg, error in transport.send_many(from_addr, messages)}
+        except MailDeliveryError as e:
+            # the connection died mid-batch: what went out before it stays sent
+            delivered = {id(msg) for msg in e.sent}
+            refused = {id(msg): e for msg in messages if id(msg) not in delivered}
+
+        now = datetime.utcnow()
+        for msg in messages:
+            entry = by_message[id(msg)]
+            error = refused.get(id(msg))
+            if error is None:
+                entry.status = Status.sent
+                entry.sent_at = now
+                entry.last_error = None
+                totals["sent"] += 1
+            else:
+                _record_failure(entry, error, max_attempts)
+                totals["dead" if entry.status == Status.dead else "retried"] += 1
+        db.commit()
+
+        if len(entries) < batch_size:
+            break
+
+    if any(totals.values()):
+        logger.info(f"Outbox dispatch: {totals}")
+    return totals
+
+
+def purge_outbox(db: Session, retention: timedelta = OUTBOX_RETENTION, chunk_size: int = 1000) -> int:
+    """
+    Delete sent rows older than `retention`, in chunks. Dead letters are kept for inspection.
+    """
+    cutoff = datetime.utcnow() - retention
+    total = 0
+    while True:
+        ids = db.scalars(
+            select(models.EmailOutbox.id)
+            .where(models.EmailOutbox.status == Status.sent, models.EmailOutbox.sent_at < cutoff)
+            .limit(chunk_size)
+        ).all()
+        if not ids:
+            return total
+        db.execute(delete(models.EmailOutbox).where(models.EmailOutbox.id.in_(ids)))
+        db.commit()
+        total += len(ids)
+
+
+def outbox_stats(db: Session) -> dict:
+    counts = dict(
+        db.query(models.EmailOutbox.status, func.count(models.EmailOutbox.id))
+        .group_by(models.EmailOutbox.status)
+        .all()
+    )
+    oldest_due = (
+        db.query(func.min(models.EmailOutbox.next_attempt_at))
+        .filter(or_(models.EmailOutbox.status == Status.pending, models.EmailOutbox.status == Status.sending))
+        .scalar()
+    )
+    return {
+        **{status.value: counts.get(status, 0) for status in Status},
+        "oldest_due_age_seconds": max(0.0, round((datetime.utcnow() - oldest_due).total_seconds(), 1)) if oldest_due else 0.0,
+    }
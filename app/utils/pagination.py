@@ -0,0 +1,26 @@
+import base64
+import binascii
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Build an opaque cursor that points just past the row with id `last_id`.
+    """
+    return base64.urlsafe_b64encode(str(last_id).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Reverse of encode_cursor. Raises ValueError for anything we didn't issue.
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        last_id = int(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (binascii.Error, ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
+    if last_id <= 0:
+        raise ValueError("Invalid cursor")
+    return last_id
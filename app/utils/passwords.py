@@ -0,0 +1,52 @@
+import os
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.utils.process_pool import BoundedProcessPool
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+
+
+@lru_cache(maxsize=None)
+def _context(rounds: int) -> CryptContext:
+    # min_rounds makes hashes below the configured cost report needs_update,
+    # so raising BCRYPT_ROUNDS upgrades users as they log in
+    return CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+
+
+# These two run inside the worker processes.
+
+def _hash(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+
+def _verify_and_update(password: str, password_hash: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    try:
+        return _context(rounds).verify_and_update(password, password_hash)
+    except ValueError:  # not a hash we recognise
+        return False, None
+
+
+password_pool = BoundedProcessPool(
+    "password_hasher",
+    max_workers=PASSWORD_HASH_WORKERS,
+    max_queue=PASSWORD_HASH_MAX_QUEUE,
+)
+
+
+async def hash_password(password: str) -> str:
+    return await password_pool.run(_hash, password, BCRYPT_ROUNDS)
+
+
+async def verify_password(password: str, password_hash: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """
+    Returns (valid, new_hash). new_hash is set when the stored hash used a
+    lower cost than BCRYPT_ROUNDS and should be saved in its place.
+    """
+    if not password_hash:
+        return False, None
+    return await password_pool.run(_verify_and_update, password, password_hash, BCRYPT_ROUNDS)
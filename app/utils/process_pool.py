@@ -0,0 +1,212 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PoolSaturated(Exception):
+    """
+    Raised instead of queueing when a pool's backlog is full.
+    main.py turns it into a 503 with Retry-After.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(f"{name} pool is saturated")
+        self.name = name
+
+
+def _kill_workers(executor: ProcessPoolExecutor):
+    # ProcessPoolExecutor has no public way to stop a running job
+    for process in list((executor._processes or {}).values()):
+        if process.is_alive():
+            process.kill()
+
+
+def _timed_call(fn: Callable, args: tuple):
+    # runs in the worker: report when the job actually started so the parent can measure queue wait
+    return time.time(), fn(*args)
+
+
+class BoundedProcessPool:
+    """
+    ProcessPoolExecutor with a hard cap on queued work.
+
+    CPU-bound jobs (bcrypt, PDF parsing) run in worker processes so they
+    neither hold the GIL nor tie up the request threadpool. At most
+    `max_workers + max_queue` jobs are accepted at once; beyond that submit
+    raises PoolSaturated so callers shed load instead of piling up latency.
+    The executor starts lazily on first use.
+
+    A worker that dies (killed at its memory limit, segfault in a parser)
+    breaks the whole executor; it is discarded and the next submit starts a
+    fresh one. A job that overruns its `run` timeout can't be interrupted
+    from outside, so its executor is retired too: new work goes to a fresh
+    one, and the old one's workers are killed once its other jobs have had
+    the same timeout to finish.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        max_queue: int,
+        initializer: Optional[Callable] = None,
+        initargs: tuple = (),
+    ):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.initializer = initializer
+        self.initargs = initargs
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._peak_queued = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._run_total = 0.0
+        self._restarts = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                # spawn, not fork: the API process has scheduler and threadpool threads
+                # whose held locks would be copied into forked children
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self.initializer,
+                initargs=self.initargs,
+            )
+        return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor, kill_after: Optional[float] = None):
+        """
+        Stop handing work to `executor`; the next submit starts a new one.
+        With kill_after, its workers are killed after that many seconds
+        instead of being left to finish on their own.
+        """
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+            self._restarts += 1
+        logger.warning(f"{self.name} pool restarted ({'job timed out' if kill_after is not None else 'worker died'})")
+        executor.shutdown(wait=False)
+        if kill_after is not None:
+            timer = threading.Timer(kill_after, _kill_workers, args=(executor,))
+            timer.daemon = True
+            timer.start()
+
+    def _submit_to_executor(self, fn: Callable, args: tuple):
+        for attempt in range(2):
+            with self._lock:
+                executor = self._get_executor()
+            try:
+                return executor, executor.submit(_timed_call, fn, args)
+            except (BrokenProcessPool, RuntimeError):
+                # broken since the last job, or retired under us: retry once on a fresh executor
+                self._discard(executor)
+                if attempt:
+                    raise
+
+    def submit(self, fn: Callable, *args) -> Future:
+        return self._submit(fn, args)[1]
+
+    def _submit(self, fn: Callable, args: tuple):
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise PoolSaturated(self.name)
+            self._pending += 1
+            self._submitted += 1
+            self._peak_queued = max(self._peak_queued, self._pending - self.max_workers)
+        submitted_at = time.time()
+        try:
+            executor, future = self._submit_to_executor(fn, args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+                self._failed += 1
+            raise
+        outer = Future()
+
+        def _done(inner: Future):
+            finished_at = time.time()
+            if not inner.cancelled() and isinstance(inner.exception(), BrokenProcessPool):
+                self._discard(executor)
+            with self._lock:
+                self._pending -= 1
+                if inner.cancelled() or inner.exception() is not None:
+                    self._failed += 1
+                else:
+                    started_at, _ = inner.result()
+                    wait = max(0.0, started_at - submitted_at)
+                    self._completed += 1
+                    self._wait_total += wait
+                    self._wait_max = max(self._wait_max, wait)
+                    self._run_total += finished_at - started_at
+            if outer.cancelled():
+                # the caller stopped waiting (asyncio.wait_for cancels what it wraps)
+                return
+            if inner.cancelled():
+                outer.cancel()
+            elif inner.exception() is not None:
+                outer.set_exception(inner.exception())
+            else:
+                outer.set_result(inner.result()[1])
+
+        future.add_done_callback(_done)
+        return executor, outer
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None):
+        """
+        Run fn(*args) in a worker and await the result without blocking the event loop.
+        On timeout the caller gets asyncio.TimeoutError and the stuck worker is recycled.
+        """
+        executor, outer = self._submit(fn, args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(outer), timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._timed_out += 1
+            self._discard(executor, kill_after=timeout)
+            raise
+
+    def stats(self) -> dict:
+        with self._lock:
+            in_flight = min(self._pending, self.max_workers)
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "started": self._executor is not None,
+                "in_flight": in_flight,
+                "queue_depth": self._pending - in_flight,
+                "peak_queue_depth": self._peak_queued,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "restarts": self._restarts,
+                "avg_queue_wait_ms": round(self._wait_total / self._completed * 1000, 2) if self._completed else 0.0,
+                "max_queue_wait_ms": round(self._wait_max * 1000, 2),
+                "avg_run_ms": round(self._run_total / self._completed * 1000, 2) if self._completed else 0.0,
+            }
+
+    def shutdown(self, wait: bool = False):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
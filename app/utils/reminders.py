@@ -0,0 +1,246 @@
+import hashlib
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, false, or_, select, update
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.logger import get_logger
+from app.utils.interview import reminder_dedup_key, render_reminder, render_reminder_digest, sync_reminders
+from app.utils.outbox import enqueue_emails
+
+logger = get_logger(__name__)
+
+REMINDER_SWEEP_INTERVAL_SECONDS = int(os.getenv("REMINDER_SWEEP_INTERVAL_SECONDS", "60"))
+REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE", "200"))
+REMINDER_MAX_BATCHES_PER_RUN = 50
+REMINDER_SWEEP_JOB_ID = "sweep_due_notifications"
+REMINDER_REHYDRATE_BATCH_SIZE = int(os.getenv("REMINDER_REHYDRATE_BATCH_SIZE", "500"))
+REMINDER_REHYDRATE_JOB_ID = "rehydrate_reminders"
+# coalesce a user's reminders due together into one email
+REMINDER_DIGEST = os.getenv("REMINDER_DIGEST", "true").lower() != "false"
+# in digest mode, a user's reminders due this soon ride along with one that is due now
+REMINDER_DIGEST_WINDOW = timedelta(minutes=int(os.getenv("REMINDER_DIGEST_WINDOW_MINUTES", "15")))
+
+
+def _claim_due(db: Session, batch_size: int):
+    """
+    Lock the next batch of due, unsent notifications. Rows another sweeper
+    has locked are skipped rather than waited on (Postgres SKIP LOCKED; a
+    no-op on SQLite, where the single leader is the only sweeper anyway).
+    """
+    return db.scalars(
+        select(models.Notification.id)
+        .where(
+            models.Notification.is_sent == false(),
+            models.Notification.scheduled_date <= datetime.utcnow(),
+        )
+        .order_by(models.Notification.scheduled_date)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+
+def _claim_upcoming(db: Session, user_ids, exclude_ids, until: datetime):
+    """
+    Digest lookahead: lock these users' other unsent reminders due before `until`.
+    """
+    return db.scalars(
+        select(models.Notification.id)
+        .where(
+            models.Notification.user_id.in_(user_ids),
+            models.Notification.is_sent == false(),
+            models.Notification.scheduled_date <= until,
+            models.Notification.id.not_in(exclude_ids),
+        )
+        .with_for_update(skip_locked=True)
+    ).all()
+
+
+def _load_due(db: Session, ids):
+    # one joined read for the whole batch instead of an application and user lookup per reminder
+    return db.execute(
+        select(
+            models.Notification.id,
+            models.Notification.type,
+            models.Application.id.label("application_id"),
+            models.Application.job_title,
+            models.Application.company,
+            models.Application.status,
+            models.Application.interview_date_utc,
+            models.User.id.label("user_id"),
+            models.User.username,
+            models.User.email,
+            models.User.timezone,
+        )
+        .join(models.Application, models.Application.id == models.Notification.application_id)
+        .join(models.User, models.User.id == models.Notification.user_id)
+        .where(models.Notification.id.in_(ids))
+        .order_by(models.Notification.scheduled_date)
+    ).all()
+
+
+def _is_stale(row, now: datetime) -> bool:
+    # the interview moved off the board or already happened while we were down
+    return (
+        row.status != models.ApplicationStatus.interview
+        or row.interview_date_utc is None
+        or row.interview_date_utc <= now
+    )
+
+
+def _single_email(row) -> dict:
+    subject, body = render_reminder(
+        row.type, row.username or row.email, row.job_title, row.company, row.interview_date_utc, row.timezone
+    )
+    return {
+        "to_email": row.email,
+        "subject": subject,
+        "body": body,
+        "html": True,
+        "dedup_key": reminder_dedup_key(row.application_id, row.type, row.interview_date_utc),
+    }
+
+
+def _digest_email(rows) -> dict:
+    first = rows[0]
+    subject, body = render_reminder_digest(
+        first.username or first.email,
+        [(row.type, row.job_title, row.company, row.interview_date_utc) for row in rows],
+        first.timezone,
+    )
+    # same reminders, same key: a re-run sweep can't send the digest twice
+    keys = sorted(reminder_dedup_key(row.application_id, row.type, row.interview_date_utc) for row in rows)
+    digest = hashlib.sha256("|".join(keys).encode()).hexdigest()[:32]
+    return {
+        "to_email": first.email,
+        "subject": subject,
+        "body": body,
+        "html": True,
+        "dedup_key": f"reminder-digest:{first.user_id}:{digest}",
+    }
+
+
+def build_reminder_emails(rows, digest: bool = REMINDER_DIGEST) -> list:
+    """
+    One email per reminder, or in digest mode one per user covering all of
+    that user's reminders in `rows`.
+    """
+    if not digest:
+        return [_single_email(row) for row in rows]
+    by_user = defaultdict(list)
+    for row in rows:
+        by_user[row.user_id].append(row)
+    return [
+        _single_email(user_rows[0]) if len(user_rows) == 1 else _digest_email(user_rows)
+        for user_rows in by_user.values()
+    ]
+
+
+def sweep_due_notifications(
+    db: Session,
+    batch_size: int = REMINDER_BATCH_SIZE,
+    max_batches: int = REMINDER_MAX_BATCHES_PER_RUN,
+    digest: bool = REMINDER_DIGEST,
+    digest_window: timedelta = REMINDER_DIGEST_WINDOW,
+) -> dict:
+    """
+    Turn due Notification rows into outbox emails, a batch per transaction:
+    claim, render, bulk-enqueue, mark sent, commit. SMTP happens later in the
+    outbox dispatcher, so row locks are held only for a few statements.
+
+    In digest mode the batch also claims the same users' reminders due within
+    `digest_window`, and each user gets a single email for all of them.
+    """
+    totals = {"queued": 0, "reminders": 0, "skipped": 0}
+    for _ in range(max_batches):
+        ids = _claim_due(db, batch_size)
+        if not ids:
+            break
+
+        now = datetime.utcnow()
+        claimed = list(ids)
+        if digest and digest_window:
+            user_ids = db.scalars(
+                select(models.Notification.user_id).where(models.Notification.id.in_(ids)).distinct()
+            ).all()
+            claimed += _claim_upcoming(db, user_ids, ids, now + digest_window)
+
+        rows = []
+        for row in _load_due(db, claimed):
+            if _is_stale(row, now):
+                totals["skipped"] += 1
+            else:
+                rows.append(row)
+
+        emails = build_reminder_emails(rows, digest=digest)
+        enqueue_emails(db, emails)
+        db.execute(update(models.Notification).where(models.Notification.id.in_(claimed)).values(is_sent=True))
+        db.commit()
+        totals["queued"] += len(emails)
+        totals["reminders"] += len(rows)
+
+        if len(ids) < batch_size:
+            break
+
+    if any(totals.values()):
+        logger.info(f"Reminder sweep: {totals}")
+    return totals
+
+
+def rehydrate_reminders(db: Session, batch_size: int = REMINDER_REHYDRATE_BATCH_SIZE) -> dict:
+    """
+    Startup reconciliation: walk upcoming interviews on the
+    (interview_date_utc, id) index in keyset batches and sync each batch's
+    reminders, so interviews set before reminders were rows (or while
+    scheduling failed) get them, and moved ones are corrected. Past
+    interviews are never read, and applications whose reminders already
+    match cost nothing but the shared read.
+    """
+    now = datetime.utcnow()
+    totals = {"applications": 0, "inserted": 0, "deleted": 0}
+    last = None
+    while True:
+        query = (
+            select(
+                models.Application.id,
+                models.Application.user_id,
+                models.Application.interview_date_utc,
+                models.User.timezone,
+            )
+            .join(models.User, models.User.id == models.Application.user_id)
+            .where(
+                models.Application.interview_date_utc > now,
+                models.Application.status == models.ApplicationStatus.interview,
+            )
+            .order_by(models.Application.interview_date_utc, models.Application.id)
+            .limit(batch_size)
+        )
+        if last is not None:
+            last_date, last_id = last
+            query = query.where(
+                or_(
+                    models.Application.interview_date_utc > last_date,
+                    and_(models.Application.interview_date_utc == last_date, models.Application.id > last_id),
+                )
+            )
+        rows = db.execute(query).all()
+        if not rows:
+            break
+
+        inserted, deleted = sync_reminders(
+            db, [(row.id, row.user_id, row.interview_date_utc, row.timezone) for row in rows]
+        )
+        db.commit()
+        totals["applications"] += len(rows)
+        totals["inserted"] += inserted
+        totals["deleted"] += deleted
+
+        last = (rows[-1].interview_date_utc, rows[-1].id)
+        if len(rows) < batch_size:
+            break
+
+    logger.info(f"Reminder rehydration: {totals}")
+    return totals
@@ -0,0 +1,117 @@
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.logger import get_logger
+from app.utils.cache import MISSING, LRUCache, SharedCache, make_shared_client, run_after_commit
+
+logger = get_logger(__name__)
+
+RESET_CODE_TTL_MINUTES = 10
+RESET_CODE_CACHE_BACKEND = os.getenv("RESET_CODE_CACHE_BACKEND", "memory")  # "memory" or "shared"
+RESET_CODE_CACHE_REDIS_URL = os.getenv("RESET_CODE_CACHE_REDIS_URL")
+RESET_CODE_CLEANUP_CHUNK_SIZE = 1000
+
+
+class ResetCodeStore:
+    """
+    Password reset codes: the password_resets table is the source of truth,
+    with a TTL tier in front mapping (email, code) to the row id.
+
+    A tier hit makes verification a primary-key delete; a miss (another
+    worker issued the code, or the entry aged out) falls back to one delete
+    on the (user_id, code) index. Either way a code is consumed by the same
+    statement that checks it, so it can only be used once.
+    """
+
+    def __init__(self, tier, ttl: timedelta):
+        self.tier = tier
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(email: str, code: str) -> str:
+        return f"{email}:{code}"
+
+    def issue(self, db: Session, user: models.User, code: str) -> models.PasswordReset:
+        """
+        Replace the user's outstanding codes with a new one. Call before db.commit().
+        """
+        db.execute(delete(models.PasswordReset).where(models.PasswordReset.user_id == user.id))
+        entry = models.PasswordReset(user_id=user.id, code=code, expires_at=datetime.utcnow() + self.ttl)
+        db.add(entry)
+        db.flush()
+        run_after_commit(db, self.tier.set, self._key(user.email, code), entry.id, self.ttl.total_seconds())
+        return entry
+
+    def consume(self, db: Session, email: str, code: str) -> bool:
+        """
+        Delete the code if it is valid and unexpired. Returns whether it was. Call db.commit() after.
+        """
+        key = self._key(email, code)
+        now = datetime.utcnow()
+        entry_id = self.tier.get(key)
+        if entry_id is not MISSING:
+            stmt = delete(models.PasswordReset).where(
+                models.PasswordReset.id == entry_id,
+                models.PasswordReset.expires_at > now,
+            )
+        else:
+            user_id = select(models.User.id).where(models.User.email == email).scalar_subquery()
+            stmt = delete(models.PasswordReset).where(
+                models.PasswordReset.user_id == user_id,
+                models.PasswordReset.code == code,
+                models.PasswordReset.expires_at > now,
+            )
+        consumed = db.execute(stmt).rowcount > 0
+        self.tier.delete(key)
+        return consumed
+
+    def discard_user(self, db: Session, user_id: int):
+        """
+        Drop all of a user's codes. Stale tier entries are harmless: their row is gone.
+        """
+        db.execute(delete(models.PasswordReset).where(models.PasswordReset.user_id == user_id))
+
+    def cleanup_expired(self, db: Session, chunk_size: int = RESET_CODE_CLEANUP_CHUNK_SIZE) -> int:
+        """
+        Delete expired codes in chunks of ids off the expires_at index,
+        committing after each so no single statement locks the whole table.
+        """
+        now = datetime.utcnow()
+        total = 0
+        while True:
+            ids = db.scalars(
+                select(models.PasswordReset.id)
+                .where(models.PasswordReset.expires_at < now)
+                .order_by(models.PasswordReset.expires_at)
+                .limit(chunk_size)
+            ).all()
+            if not ids:
+                break
+            db.execute(delete(models.PasswordReset).where(models.PasswordReset.id.in_(ids)))
+            db.commit()
+            total += len(ids)
+            if len(ids) < chunk_size:
+                break
+        return total
+
+
+def _build_tier():
+    if RESET_CODE_CACHE_BACKEND == "shared":
+        return SharedCache(make_shared_client(RESET_CODE_CACHE_REDIS_URL), prefix="jt:reset:")
+    return LRUCache(max_entries=10000)
+
+
+reset_codes = ResetCodeStore(_build_tier(), ttl=timedelta(minutes=RESET_CODE_TTL_MINUTES))
+
+
+def cleanup_expired_reset_codes(db: Session):
+    try:
+        deleted = reset_codes.cleanup_expired(db)
+        logger.info(f"✅ Cleanup ran: deleted {deleted} expired reset codes")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Cleanup failed: {e}")
@@ -0,0 +1,103 @@
+import asyncio
+import os
+import signal
+from concurrent.futures.process import BrokenProcessPool
+
+from app.core.logger import get_logger
+
+from app.utils.pdf_utils import extract_resume_text
+from app.utils.process_pool import BoundedProcessPool
+
+logger = get_logger(__name__)
+
+RESUME_EXTRACT_WORKERS = int(os.getenv("RESUME_EXTRACT_WORKERS", str(os.cpu_count() or 1)))
+RESUME_EXTRACT_MAX_QUEUE = int(os.getenv("RESUME_EXTRACT_MAX_QUEUE", "32"))
+RESUME_EXTRACT_TIMEOUT_SECONDS = float(os.getenv("RESUME_EXTRACT_TIMEOUT_SECONDS", "10"))
+# address-space cap per worker; an idle worker with PyMuPDF loaded is ~110 MB
+RESUME_EXTRACT_MEMORY_LIMIT_MB = int(os.getenv("RESUME_EXTRACT_MEMORY_LIMIT_MB", "512"))
+# how much longer than the in-worker timeout the handler waits before giving up
+_AWAIT_GRACE_SECONDS = 2
+
+
+class ExtractionTimeout(Exception):
+    """
+    A file took longer than RESUME_EXTRACT_TIMEOUT_SECONDS to parse.
+    """
+
+
+class _Deadline(BaseException):
+    # a BaseException so the parsers' blanket `except Exception` can't swallow it
+    pass
+
+
+# These run inside the worker processes.
+
+def _on_alarm(signum, frame):
+    raise _Deadline()
+
+
+def _init_worker(memory_limit_mb: int):
+    if hasattr(signal, "setitimer"):
+        signal.signal(signal.SIGALRM, _on_alarm)
+    # a hostile or broken file fails with MemoryError in its worker instead of
+    # taking the host down; not available on Windows
+    try:
+        import resource
+    except ImportError:
+        return
+    limit = memory_limit_mb * 1024 * 1024
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _extract(file_bytes: bytes, content_type: str, filename: str, timeout: float) -> str:
+    # interrupts the parse itself, so a stuck file frees its worker
+    use_timer = hasattr(signal, "setitimer")
+    try:
+        if use_timer:
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            return extract_resume_text(file_bytes, content_type, filename)
+        finally:
+            if use_timer:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+    except _Deadline:  # also covers the alarm landing while it's being armed or disarmed
+        raise ExtractionTimeout(f"Extraction of {filename} exceeded {timeout}s")
+
+
+extraction_pool = BoundedProcessPool(
+    "resume_extractor",
+    max_workers=RESUME_EXTRACT_WORKERS,
+    max_queue=RESUME_EXTRACT_MAX_QUEUE,
+    initializer=_init_worker,
+    initargs=(RESUME_EXTRACT_MEMORY_LIMIT_MB,),
+)
+
+
+async def extract_resume_text_async(file_bytes: bytes, content_type: str, filename: str) -> str:
+    """
+    extract_resume_text in a worker process, so PDF/DOCX parsing neither
+    blocks the event loop nor holds the GIL. Returns "" when nothing could be
+    extracted (unsupported format, unreadable file, memory limit hit, or the
+    worker died parsing it).
+    Raises ExtractionTimeout when the parse overruns and PoolSaturated when
+    the queue is full.
+    """
+    try:
+        return await extraction_pool.run(
+            _extract,
+            file_bytes,
+            content_type,
+            filename,
+            RESUME_EXTRACT_TIMEOUT_SECONDS,
+            timeout=RESUME_EXTRACT_TIMEOUT_SECONDS + _AWAIT_GRACE_SECONDS,
+        )
+    except asyncio.TimeoutError:
+        # the worker never answered (stuck in C code the alarm can't interrupt)
+        raise ExtractionTimeout(f"Extraction of {filename} did not finish")
+    except BrokenProcessPool:
+        # killed mid-parse, e.g. by the OS at the memory cap; the pool restarts itself
+        logger.error(f"Resume extractor worker died parsing {filename}")
+        return ""
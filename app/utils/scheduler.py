@@ -1,13 +1,106 @@
+import os
+from typing import Callable, Optional
+
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from sqlalchemy.engine import make_url
+
+from app.core.logger import get_logger
+from app.utils.leader import SCHEDULER_LEASE_NAME, SCHEDULER_LEASE_TTL_SECONDS, LeaderElector
+from app.utils.scheduler_metrics import SCHEDULER_EVENTS, InstrumentedThreadPoolExecutor, SchedulerMetrics
+
+logger = get_logger(__name__)
+
+# "main" keeps jobs in the application database (apscheduler_jobs), which every
+# worker and host can see; anything else is a SQLAlchemy URL of another shared
+# database. The leader runs whatever is in the one jobstore, so a per-host
+# SQLite file would strand jobs on hosts that never lead.
+SCHEDULER_JOBSTORE_URL = os.getenv("SCHEDULER_JOBSTORE_URL", "main")
+SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", "10"))
+
+
+def _build_jobstore() -> SQLAlchemyJobStore:
+    if SCHEDULER_JOBSTORE_URL == "main":
+        from app.database import engine
+        return SQLAlchemyJobStore(engine=engine)
+    if make_url(SCHEDULER_JOBSTORE_URL).get_backend_name() == "sqlite":
+        raise RuntimeError(
+            f"SCHEDULER_JOBSTORE_URL={SCHEDULER_JOBSTORE_URL} is a local file, but scheduled jobs run on "
+            "one elected leader across all hosts; use 'main' or a shared database"
+        )
+    return SQLAlchemyJobStore(url=SCHEDULER_JOBSTORE_URL)
+
 
 jobstores = {
-    "default": SQLAlchemyJobStore(url="sqlite:///jobs.sqlite")
+    "default": _build_jobstore()
 }
 
 
-scheduler = BackgroundScheduler(jobstores=jobstores, timezone="UTC")
+scheduler_metrics = SchedulerMetrics(executor_workers=SCHEDULER_WORKERS)
+
+
+executors = {
+    "default": InstrumentedThreadPoolExecutor(scheduler_metrics, SCHEDULER_WORKERS)
+}
+
+
+scheduler = BackgroundScheduler(jobstores=jobstores, executors=executors, timezone="UTC")
+
+scheduler.add_listener(scheduler_metrics.listener, SCHEDULER_EVENTS)
 
-def start_scheduler():
+# Every worker runs a scheduler, paused, but only the lease holder writes to
+# the jobstore or executes jobs. On election it (re)registers the app's jobs
+# with replace_existing, which restarts each interval job's clock, and resumes.
+# A job left with its stored next run time (registration failed) that came due
+# while nobody led is a misfire on resume: APScheduler skips it after one
+# second unless the job sets misfire_grace_time=None and coalesce=True, which
+# the app's long-interval jobs do. Non-leaders never add, modify or remove
+# jobs, so there is nothing for a leader to miss.
+_register_jobs: Optional[Callable[[], None]] = None
+
+
+def _on_elected():
+    if _register_jobs is not None:
+        try:
+            _register_jobs()
+        except Exception as e:
+            # jobs already in the jobstore still need running
+            logger.error(f"Registering scheduled jobs failed: {e}")
+    scheduler.resume()
+
+
+elector = LeaderElector(
+    SCHEDULER_LEASE_NAME,
+    SCHEDULER_LEASE_TTL_SECONDS,
+    on_elected=_on_elected,
+    on_demoted=lambda: scheduler.pause(),
+)
+
+
+def is_leader() -> bool:
+    return elector.is_leader
+
+
+def start_scheduler(register_jobs: Optional[Callable[[], None]] = None):
+    """
+    Start this worker's scheduler paused and join the election.
+    `register_jobs` adds the app's jobs; it runs each time this worker becomes leader.
+    """
+    global _register_jobs
     if scheduler.state == 0:  # only start if stopped
-        scheduler.start()
\ No newline at end of file
+        _register_jobs = register_jobs
+        scheduler.start(paused=True)
+        elector.start()
+
+
+def scheduler_status() -> dict:
+    return {
+        "state": {0: "stopped", 1: "running", 2: "paused"}.get(scheduler.state, scheduler.state),
+        "leader": elector.status(),
+        **scheduler_metrics.as_dict(),
+    }
+
+
+def stop_scheduler():
+    elector.stop()
+    scheduler.shutdown(wait=False)
@@ -0,0 +1,247 @@
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from apscheduler.events import (
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_MISSED,
+)
+from apscheduler.executors.pool import ThreadPoolExecutor
+
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# upper bounds in seconds; wide enough for a 1 ms cleanup and a multi-minute outbox drain
+HISTOGRAM_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300)
+# runs later than this are logged; reminders should never be this far behind
+LAG_WARNING_SECONDS = 30
+
+SCHEDULER_EVENTS = EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (cumulative counts, Prometheus style) plus count, sum and max.
+    """
+
+    def __init__(self, buckets=HISTOGRAM_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        value = max(0.0, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def as_dict(self) -> dict:
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            running += count
+            cumulative[str(bound)] = running
+        return {
+            "count": self.count,
+            "sum": round(self.total, 4),
+            "avg": round(self.total / self.count, 4) if self.count else 0.0,
+            "max": round(self.max, 4),
+            "buckets": cumulative,
+        }
+
+
+class _JobMetrics:
+    def __init__(self):
+        self.lag = Histogram()
+        self.duration = Histogram()
+        self.runs = 0
+        self.errors = 0
+        self.misfires = 0
+        self.skipped_max_instances = 0
+
+
+class SchedulerMetrics:
+    """
+    Per job function:
+    - lag: how late a run was submitted relative to its scheduled time;
+    - duration: submit to finish, so executor queue wait is included;
+    - runs, errors, misfires (past misfire_grace_time) and runs skipped
+      because the previous one was still going (max_instances).
+    Plus executor in-flight and queue depth.
+
+    Submissions are recorded by InstrumentedThreadPoolExecutor before the
+    job reaches the pool, so they always precede the job's outcome.
+    (APScheduler's EVENT_JOB_SUBMITTED is only dispatched after the whole
+    wakeup loop, by which time a fast job may already have finished.)
+    Outcomes come from the listener. Both run on scheduler and executor
+    threads, so everything is updated under one lock.
+    """
+
+    def __init__(self, executor_workers: int):
+        self.executor_workers = executor_workers
+        self._lock = threading.Lock()
+        self._jobs = defaultdict(_JobMetrics)
+        # (job_id, scheduled_run_time) -> [job name, monotonic submit time, run times still pending]
+        self._in_flight = {}
+        self._in_flight_count = 0
+        self._names = {}
+        self._peak_in_flight = 0
+        self._started = datetime.now(timezone.utc)
+
+    def job_name(self, job_id: str) -> str:
+        """
+        Group by the job's function rather than its id.
+        Resolved once per id from the scheduler, falling back to the id.
+        """
+        name = self._names.get(job_id)
+        if name is None:
+            from app.utils.scheduler import scheduler
+
+            job = scheduler.get_job(job_id)
+            name = job.name if job is not None else job_id
+            self._remember_name(job_id, name)
+        return name
+
+    def _remember_name(self, job_id: str, name: str):
+        if len(self._names) < 10000:
+            self._names[job_id] = name
+
+    def submitted(self, job, run_times):
+        now = datetime.now(timezone.utc)
+        submitted_at = time.monotonic()
+        late = []
+        with self._lock:
+            self._remember_name(job.id, job.name)
+            metrics = self._jobs[job.name]
+            for run_time in run_times:
+                lag = (now - run_time).total_seconds()
+                metrics.lag.observe(lag)
+                if lag > LAG_WARNING_SECONDS:
+                    late.append(lag)
+            # one submission covers every run time it was handed (several when
+            # not coalescing); the executor reports each as executed, failed or missed
+            entry = [job.name, submitted_at, len(run_times)]
+            for run_time in run_times:
+                self._in_flight[(job.id, run_time)] = entry
+            self._in_flight_count += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight_count)
+        for lag in late:
+            logger.warning(f"Job {job.id} started {lag:.1f}s late")
+
+    def abandoned(self, job_id: str, run_times=None):
+        """
+        A submission that will produce no events: the pool refused it, or
+        APScheduler's run_job itself failed (then only the job id is known,
+        and the oldest submission for it is dropped).
+        """
+        with self._lock:
+            if run_times is None:
+                pending = [(entry[1], run_time) for (jid, run_time), entry in self._in_flight.items() if jid == job_id]
+                if not pending:
+                    return
+                oldest = min(pending)[0]
+                run_times = [
+                    run_time for (jid, run_time), entry in self._in_flight.items()
+                    if jid == job_id and entry[1] == oldest
+                ]
+            entry = None
+            for run_time in run_times:
+                entry = self._in_flight.pop((job_id, run_time), None) or entry
+            if entry is not None:
+                self._in_flight_count -= 1
+
+    def listener(self, event):
+        try:
+            if event.code in (EVENT_JOB_EXECUTED, EVENT_JOB_ERROR):
+                self._finished(event, failed=event.code == EVENT_JOB_ERROR)
+            elif event.code == EVENT_JOB_MISSED:
+                self._finished(event, failed=False, missed=True)
+                logger.warning(f"Job {event.job_id} missed its run at {event.scheduled_run_time}")
+            elif event.code == EVENT_JOB_MAX_INSTANCES:
+                name = self.job_name(event.job_id)
+                with self._lock:
+                    self._jobs[name].skipped_max_instances += 1
+        except Exception as e:
+            # metrics must never take the scheduler down
+            logger.error(f"Scheduler metrics listener failed: {e}")
+
+    def _finished(self, event, failed: bool, missed: bool = False):
+        finished_at = time.monotonic()
+        with self._lock:
+            entry = self._in_flight.pop((event.job_id, event.scheduled_run_time), None)
+            if entry is not None:
+                name, submitted_at = entry[0], entry[1]
+                entry[2] -= 1
+                if entry[2] == 0:
+                    self._in_flight_count -= 1
+        if entry is None:
+            # ran on an executor we don't instrument; resolve outside our
+            # lock, get_job takes the scheduler's jobstore lock
+            name, submitted_at = self.job_name(event.job_id), None
+        with self._lock:
+            metrics = self._jobs[name]
+            if missed:
+                metrics.misfires += 1
+                return
+            metrics.runs += 1
+            metrics.errors += failed
+            if submitted_at is not None:
+                metrics.duration.observe(finished_at - submitted_at)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            in_flight = self._in_flight_count
+            return {
+                "since": self._started.isoformat(),
+                "executor": {
+                    "workers": self.executor_workers,
+                    "in_flight": in_flight,
+                    "queue_depth": max(0, in_flight - self.executor_workers),
+                    "peak_in_flight": self._peak_in_flight,
+                },
+                "jobs": {
+                    name: {
+                        "runs": metrics.runs,
+                        "errors": metrics.errors,
+                        "misfires": metrics.misfires,
+                        "skipped_max_instances": metrics.skipped_max_instances,
+                        "lag_seconds": metrics.lag.as_dict(),
+                        "duration_seconds": metrics.duration.as_dict(),
+                    }
+                    for name, metrics in sorted(self._jobs.items())
+                },
+            }
+
+
+class InstrumentedThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    ThreadPoolExecutor that stamps each submission into SchedulerMetrics
+    before handing it to the pool.
+    """
+
+    def __init__(self, metrics: SchedulerMetrics, max_workers=10, pool_kwargs=None):
+        super().__init__(max_workers, pool_kwargs)
+        self._metrics = metrics
+
+    def _do_submit_job(self, job, run_times):
+        self._metrics.submitted(job, run_times)
+        try:
+            super()._do_submit_job(job, run_times)
+        except BaseException:
+            self._metrics.abandoned(job.id, run_times)
+            raise
+
+    def _run_job_error(self, job_id, exc, traceback=None):
+        self._metrics.abandoned(job_id)
+        super()._run_job_error(job_id, exc, traceback)
@@ -0,0 +1,164 @@
+import re
+from typing import List, Tuple
+
+from sqlalchemy import column, func, inspect, literal_column, or_, select, table
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# The search index itself (a generated tsvector column + GIN index on
+# Postgres, an FTS5 table on SQLite) is models.SEARCH_INDEX_DDL, built by the
+# 4ea3c541eeec migration or by metadata.create_all.
+
+TS_CONFIG = "english"
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=25, MinWords=8"
+MAX_TERMS = 8
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(query: str) -> List[str]:
+    """
+    Split user input into plain word tokens. Anything that could be read as
+    search syntax (quotes, operators, colons) is dropped.
+    """
+    return _TOKEN_RE.findall(query.lower())[:MAX_TERMS]
+
+
+def _result_columns():
+    return (
+        models.Application.id,
+        models.Application.job_title,
+        models.Application.company,
+        models.Application.status,
+        models.Application.applied_date,
+    )
+
+
+def _postgres_search(user_id: int, terms: List[str], limit: int, offset: int):
+    # every term is a prefix match, all terms must match
+    ts_query = func.to_tsquery(TS_CONFIG, " & ".join(f"{term}:*" for term in terms))
+    vector = literal_column("applications.search_vector")
+    rank = func.ts_rank_cd(vector, ts_query)
+
+    # rank and page on the GIN index first, so ts_headline only runs for the returned page
+    page = (
+        select(models.Application.id, rank.label("rank"))
+        .where(models.Application.user_id == user_id, vector.op("@@")(ts_query))
+        .order_by(rank.desc(), models.Application.id.desc())
+        .limit(limit)
+        .offset(offset)
+        .subquery()
+    )
+    document = func.concat_ws(
+        " ",
+        models.Application.job_title,
+        models.Application.company,
+        models.Application.notes,
+        models.Application.job_description,
+    )
+    return (
+        select(
+            *_result_columns(),
+            page.c.rank,
+            func.ts_headline(TS_CONFIG, document, ts_query, HEADLINE_OPTIONS).label("highlight"),
+        )
+        .join(page, page.c.id == models.Application.id)
+        .order_by(page.c.rank.desc(), models.Application.id.desc())
+    )
+
+
+def _sqlite_search(user_id: int, terms: List[str], limit: int, offset: int):
+    fts = table("applications_fts", column("rowid"))
+    fts_ref = literal_column("applications_fts")
+    # bm25 is "lower is better"; negate it so both backends rank descending
+    rank = -func.bm25(fts_ref, 10.0, 5.0, 2.0, 1.0)
+    match = " ".join(f'"{term}"*' for term in terms)
+    return (
+        select(
+            *_result_columns(),
+            rank.label("rank"),
+            func.snippet(fts_ref, -1, "<mark>", "</mark>", "…", 16).label("highlight"),
+        )
+        .select_from(fts)
+        .join(models.Application, models.Application.id == fts.c.rowid)
+        .where(fts_ref.op("MATCH")(match), models.Application.user_id == user_id)
+        .order_by(rank.desc(), models.Application.id.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+
+
+def _fallback_search(user_id: int, terms: List[str], limit: int, offset: int):
+    # no full-text index on this backend: bounded substring scan
+    conditions = []
+    for term in terms:
+        pattern = f"%{term}%"
+        conditions.append(
+            or_(
+                models.Application.job_title.ilike(pattern),
+                models.Application.company.ilike(pattern),
+                models.Application.notes.ilike(pattern),
+                models.Application.job_description.ilike(pattern),
+            )
+        )
+    return (
+        select(*_result_columns(), literal_column("0").label("rank"), literal_column("NULL").label("highlight"))
+        .where(models.Application.user_id == user_id, *conditions)
+        .order_by(models.Application.id.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+
+
+# database URL -> whether its search index exists; checked once per process
+_index_present = {}
+
+
+def has_search_index(db: Session) -> bool:
+    bind = db.get_bind()
+    key = str(bind.url)
+    if key not in _index_present:
+        dialect = bind.dialect.name
+        inspector = inspect(bind)
+        if dialect == "postgresql":
+            present = any(col["name"] == "search_vector" for col in inspector.get_columns("applications"))
+        elif dialect == "sqlite":
+            present = inspector.has_table("applications_fts")
+        else:
+            present = False
+        if not present and dialect in ("postgresql", "sqlite"):
+            logger.error(
+                "Search index missing (run `alembic upgrade head`); "
+                "search-applications falls back to an unranked substring scan"
+            )
+        _index_present[key] = present
+    return _index_present[key]
+
+
+def search_user_applications(
+    db: Session, user_id: int, query: str, limit: int, offset: int = 0
+) -> Tuple[list, bool]:
+    """
+    Ranked full-text search over a user's applications.
+    Returns (results, has_more).
+    """
+    terms = tokenize(query)
+    if not terms:
+        return [], False
+
+    dialect = db.get_bind().dialect.name
+    if not has_search_index(db):
+        builder = _fallback_search
+    elif dialect == "postgresql":
+        builder = _postgres_search
+    else:
+        builder = _sqlite_search
+
+    # ask for one extra row to find out whether there is a next page
+    rows = db.execute(builder(user_id, terms, limit + 1, offset)).all()
+    results = [dict(row._mapping) for row in rows[:limit]]
+    return results, len(rows) > limit
@@ -0,0 +1,144 @@
+import hashlib
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.logger import get_logger
+from app.utils.cache import LRUCache, run_after_commit
+
+logger = get_logger(__name__)
+
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+# how stale another worker's view of logouts may get; this worker sees its own immediately
+REVOCATION_REFRESH_SECONDS = int(os.getenv("REVOCATION_REFRESH_SECONDS", "30"))
+
+# sha256(token) -> (user_id, family_id), each entry living no longer than the token itself
+verified_token_cache = LRUCache(max_entries=TOKEN_CACHE_MAX_ENTRIES)
+
+
+def token_cache_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def new_token_id() -> str:
+    return uuid.uuid4().hex
+
+
+class RevokedFamilies:
+    """
+    In-memory set of revoked refresh-token families, so checking an access
+    token's `fam` claim is a set lookup rather than a query.
+
+    At most once every REVOCATION_REFRESH_SECONDS the whole retention window
+    is re-read from refresh_token_families (one indexed range read on
+    revoked_at), and a family is forgotten once every access token it could
+    have issued has expired. The window is re-read rather than tailed from a
+    watermark because revoked_at is stamped by the app before commit, so a
+    revocation can become visible after later ones already have.
+    """
+
+    def __init__(self, refresh_seconds: float, retention: timedelta):
+        self.refresh_seconds = refresh_seconds
+        self.retention = retention
+        self._revoked: Dict[str, datetime] = {}
+        self._next_refresh = 0.0
+        self._lock = threading.Lock()
+
+    def is_revoked(self, family_id: str, db: Session) -> bool:
+        """
+        `db` is the caller's session, used only when a refresh is due.
+        """
+        self._maybe_refresh(db)
+        return family_id in self._revoked
+
+    def add(self, family_id: str, revoked_at: Optional[datetime] = None):
+        with self._lock:
+            self._revoked[family_id] = revoked_at or datetime.utcnow()
+
+    def _maybe_refresh(self, db: Session):
+        if time.monotonic() < self._next_refresh:
+            return
+        with self._lock:
+            if time.monotonic() < self._next_refresh:
+                return
+            self._next_refresh = time.monotonic() + self.refresh_seconds
+            cutoff = datetime.utcnow() - self.retention
+            try:
+                rows = (
+                    db.query(models.RefreshTokenFamily.id, models.RefreshTokenFamily.revoked_at)
+                    .filter(models.RefreshTokenFamily.revoked_at >= cutoff)
+                    .all()
+                )
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Could not refresh revoked token families: {e}")
+                return
+            # keep this worker's own recent revocations in case the read raced their commit
+            revoked = {
+                family_id: revoked_at for family_id, revoked_at in self._revoked.items() if revoked_at >= cutoff
+            }
+            revoked.update(rows)
+            self._revoked = revoked
+
+    def clear(self):
+        with self._lock:
+            self._revoked.clear()
+            self._next_refresh = 0.0
+
+    def __len__(self):
+        return len(self._revoked)
+
+
+# an hour comfortably outlives any access token (15 minutes) a revoked family issued
+revoked_families = RevokedFamilies(REVOCATION_REFRESH_SECONDS, retention=timedelta(hours=1))
+
+
+def start_family(db: Session, user_id: int, lifetime: timedelta) -> models.RefreshTokenFamily:
+    """
+    Open a new refresh-token family for a login. Call before db.commit().
+    """
+    now = datetime.utcnow()
+    family = models.RefreshTokenFamily(
+        id=new_token_id(),
+        user_id=user_id,
+        current_jti=new_token_id(),
+        created_at=now,
+        last_used_at=now,
+        expires_at=now + lifetime,
+    )
+    db.add(family)
+    return family
+
+
+def revoke_family(db: Session, family: models.RefreshTokenFamily, reason: str):
+    """
+    Mark a family revoked. Call before db.commit(); this worker's revoked set
+    is updated once the commit lands, the others on their next refresh.
+    """
+    if family.revoked_at is None:
+        family.revoked_at = datetime.utcnow()
+        family.revoked_reason = reason
+        run_after_commit(db, revoked_families.add, family.id, family.revoked_at)
+
+
+def revoke_user_families(db: Session, user_id: int, reason: str):
+    """
+    Revoke every live session of a user, e.g. after a password reset.
+    """
+    families = (
+        db.query(models.RefreshTokenFamily)
+        .filter(
+            models.RefreshTokenFamily.user_id == user_id,
+            models.RefreshTokenFamily.revoked_at.is_(None),
+            models.RefreshTokenFamily.expires_at > datetime.utcnow(),
+        )
+        .all()
+    )
+    for family in families:
+        revoke_family(db, family, reason)
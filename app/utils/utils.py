@@ -1,11 +1,8 @@
-from email.mime.base import MIMEBase
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
 import os
 import random
-import smtplib
+import time
+from typing import Optional, Tuple
 from fastapi import Depends, HTTPException,  status
-from email import encoders
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from fastapi.security import OAuth2PasswordBearer
@@ -14,7 +11,22 @@ import cloudinary.uploader
 from sqlalchemy.orm import Session
 
 
-from app import database, models
+from app import models
+from app.core.logger import get_logger
+from app.database import get_db
+from app.utils.cache import MISSING
+from app.utils.identity import UserSnapshot, cache_identity, get_cached_identity
+from app.utils.mail import MailDeliveryError, build_message, get_mail_transport
+from app.utils.tokens import (
+    new_token_id,
+    revoke_family,
+    revoked_families,
+    start_family,
+    token_cache_key,
+    verified_token_cache,
+)
+
+logger = get_logger(__name__)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/applications/login-app")
 
@@ -24,12 +36,6 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 15
 REFRESH_SECRET_KEY = os.getenv("REFRESH_SECRET_KEY")
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 
-def get_db():
-    db = database.SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
 
 # def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
 #      try:
@@ -51,37 +57,88 @@ def get_db():
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-):
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        id: str = payload.get("sub")
-
-        if id is None:
+def verify_access_token(token: str, db: Session) -> Tuple[int, Optional[str]]:
+    """
+    Verify an access token and return (user_id, refresh-token family id).
+    Verified tokens are cached by hash until they expire, and the family is
+    checked against the in-memory revoked set, so neither costs a query.
+    """
+    key = token_cache_key(token)
+    verified = verified_token_cache.get(key)
+    if verified is MISSING:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials",
+                detail="Could not validate credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        id: str = payload.get("sub")
 
-        user = db.query(models.User).filter(models.User.id == int(id)).first()
-        if user is None:
+        if id is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found",
+                detail="Invalid authentication credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        verified = (int(id), payload.get("fam"))
+        ttl = payload["exp"] - time.time() if "exp" in payload else ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        verified_token_cache.set(key, verified, ttl=ttl)
 
-        return user
+    user_id, family_id = verified
+    if family_id and revoked_families.is_revoked(family_id, db):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session has been logged out",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user_id, family_id
 
-    except JWTError:
+
+def decode_access_token(token: str, db: Session) -> int:
+    """
+    Verify an access token and return the user id it was issued for.
+    """
+    return verify_access_token(token, db)[0]
+
+
+def _load_user(db: Session, user_id: int) -> models.User:
+    user = db.query(models.User).filter(models.User.id == user_id).first()
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
+            detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    cache_identity(UserSnapshot.from_user(user))
+    return user
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    """
+    The authenticated user as a live ORM object. Use this only in handlers
+    that modify the user; everything else should take get_current_identity.
+    """
+    return _load_user(db, decode_access_token(token, db))
+
+
+def get_current_identity(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> UserSnapshot:
+    """
+    The authenticated user as a cached, read-only UserSnapshot.
+    On a cache hit no query is issued (and no connection is checked out).
+    """
+    user_id = decode_access_token(token, db)
+    snapshot = get_cached_identity(user_id)
+    if snapshot is not None:
+        return snapshot
+    return UserSnapshot.from_user(_load_user(db, user_id))
     
 
 
@@ -98,22 +155,53 @@ def create_refresh_token(data: dict, expires_delta: timedelta = None):
     return jwt.encode(to_encode, REFRESH_SECRET_KEY, algorithm=ALGORITHM)
 
 
-def refresh_token(refresh_token:  str):
-    try:
-        payload = jwt.decode(refresh_token, REFRESH_SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Invalid refresh token")
-
-        # optionally check if refresh token is in DB and valid
-        data = {"sub": user_id}
-        access_token = create_access_token(data)
-        new_refresh_token = create_refresh_token(data)
+def issue_tokens(user_id: int, family: models.RefreshTokenFamily) -> dict:
+    data = {"sub": str(user_id), "fam": family.id}
+    return {
+        "access_token": create_access_token(data),
+        "refresh_token": create_refresh_token({**data, "jti": family.current_jti}),
+        "token_type": "bearer",
+    }
 
-        return {"access_token": access_token, "refresh_token": new_refresh_token, "token_type": "bearer"}
 
+def refresh_token(refresh_token:  str, db: Session):
+    """
+    Rotate a refresh token. Presenting a token that was already rotated away
+    means it leaked (or was replayed), so the whole family is revoked.
+    """
+    try:
+        payload = jwt.decode(refresh_token, REFRESH_SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid refresh token")
+    user_id = payload.get("sub")
+    if user_id is None:
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+    user_id = int(user_id)
+    family_id, jti = payload.get("fam"), payload.get("jti")
+
+    if family_id is None:
+        # issued before token families existed: move it onto a fresh family
+        family = start_family(db, user_id, timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
+    else:
+        family = (
+            db.query(models.RefreshTokenFamily)
+            .filter(models.RefreshTokenFamily.id == family_id)
+            .with_for_update()
+            .first()
+        )
+        if family is None or family.user_id != user_id or family.revoked_at is not None:
+            raise HTTPException(status_code=401, detail="Invalid refresh token")
+        if family.current_jti != jti:
+            revoke_family(db, family, "reuse")
+            db.commit()
+            logger.warning(f"Refresh token reuse detected for user {user_id}; family {family.id} revoked")
+            raise HTTPException(status_code=401, detail="Invalid refresh token")
+        family.current_jti = new_token_id()
+        family.last_used_at = datetime.utcnow()
+        family.expires_at = family.last_used_at + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    tokens = issue_tokens(user_id, family)  # before commit expires the family's attributes
+    db.commit()
+    return tokens
 
 
 def genarate_reset_token():
@@ -121,66 +209,15 @@ def genarate_reset_token():
 
 
 def send_mail(subject, body, to_email, attachments=None, html=False):
+    """
+    Send one message per recipient over the pooled SMTP transport.
+    Raises MailDeliveryError if any of them could not be delivered.
+    """
     recipients = [to_email] if isinstance(to_email, str) else to_email
-
-    smtp_server = "smtp.gmail.com"
-    smtp_port = 587
     from_addr = os.getenv("EMAIL_USER")
-    password = os.getenv("EMAIL_PASSWORD")
 
-    try:
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(from_addr, password)
-
-            for email in recipients:
-                msg = MIMEMultipart("mixed")
-                msg["Subject"] = subject
-                msg["From"] = from_addr
-                msg["To"] = email
-
-                # Always create an alternative section
-                alt = MIMEMultipart("alternative")
-                msg.attach(alt)
-
-                # Add body
-                if html:
-                    alt.attach(MIMEText("This email contains HTML. Please view in an HTML-capable client.", "plain"))
-                    alt.attach(MIMEText(body, "html"))
-                else:
-                    alt.attach(MIMEText(body, "plain"))
-
-                # Handle attachments
-                if attachments:
-                    for attachment in attachments:
-                        if isinstance(attachment, str):
-                            with open(attachment, "rb") as f:
-                                part = MIMEBase("application", "octet-stream")
-                                part.set_payload(f.read())
-                            encoders.encode_base64(part)
-                            part.add_header("Content-Disposition", f'attachment; filename="{os.path.basename(attachment)}"')
-                            msg.attach(part)
-
-                        elif isinstance(attachment, tuple):
-                            filename, file_bytes, mime_type = attachment
-                            if mime_type.startswith("text/calendar"):
-                                # ICS should be inside the alternative part
-                                ics_part = MIMEText(file_bytes.decode("utf-8"), "calendar", "utf-8")
-                                ics_part.add_header("Content-Type", "text/calendar; method=REQUEST; charset=UTF-8")
-                                ics_part.add_header("Content-Disposition", f'attachment; filename="{filename}"')
-                                ics_part.add_header("Content-Class", "urn:content-classes:calendarmessage")
-                                alt.attach(ics_part)
-                            else:
-                                maintype, subtype = mime_type.split("/", 1)
-                                part = MIMEBase(maintype, subtype)
-                                part.set_payload(file_bytes)
-                                encoders.encode_base64(part)
-                                part.add_header("Content-Disposition", f'attachment; filename="{filename}"')
-                                msg.attach(part)
-                        else:
-                            raise ValueError(f"Unsupported attachment type: {type(attachment)}")
-
-                server.sendmail(from_addr, email, msg.as_string())
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to send email: {e}")
+    messages = [build_message(subject, body, from_addr, email, attachments, html) for email in recipients]
+    failures = get_mail_transport().send_many(from_addr, messages)
+    if failures:
+        refused = ", ".join(msg["To"] for msg, _ in failures)
+        raise MailDeliveryError(f"Failed to send email to {refused}: {failures[0][1]}")